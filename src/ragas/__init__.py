@@ -1,6 +1,7 @@
-from ragas.cache import CacheInterface, DiskCacheBackend, cacher
+from ragas.cache import CacheInterface, DiskCacheBackend, TieredCacheBackend, cacher
+from ragas.checkpoint import EvaluationCheckpoint
 from ragas.dataset_schema import EvaluationDataset, MultiTurnSample, SingleTurnSample
-from ragas.evaluation import evaluate
+from ragas.evaluation import aevaluate, aevaluate_iter, evaluate
 from ragas.run_config import RunConfig
 
 try:
@@ -11,6 +12,8 @@ except ImportError:
 
 __all__ = [
     "evaluate",
+    "aevaluate",
+    "aevaluate_iter",
     "RunConfig",
     "__version__",
     "SingleTurnSample",
@@ -19,4 +22,6 @@ __all__ = [
     "cacher",
     "CacheInterface",
     "DiskCacheBackend",
+    "TieredCacheBackend",
+    "EvaluationCheckpoint",
 ]
@@ -1,17 +1,41 @@
+import asyncio
+import copy
+import dataclasses
+import datetime
+import decimal
+import enum
 import functools
 import hashlib
 import inspect
-import json
 import logging
+import pickle
+import threading
+import time
+import types
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePath
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 from pydantic import BaseModel, GetCoreSchemaHandler
 from pydantic_core import CoreSchema, core_schema
 
 logger = logging.getLogger(__name__)
 
 
+class _CacheMiss:
+    """Sentinel type returned by the get-or-miss lookups when a key is absent."""
+
+    def __repr__(self):
+        return "CACHE_MISS"
+
+
+CACHE_MISS = _CacheMiss()
+
+
 class CacheInterface(ABC):
     """Abstract base class defining the interface for cache implementations.
 
@@ -53,6 +77,48 @@ class CacheInterface(ABC):
         """
         pass
 
+    def get_or_miss(self, key: str) -> Any:
+        """Retrieve a value from the cache, or `CACHE_MISS` if the key is absent.
+
+        Backends should override this with a single lookup; the default falls back
+        to `has_key` followed by `get`.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The cached value, or `CACHE_MISS` if the key is not in the cache.
+        """
+        if self.has_key(key):
+            return self.get(key)
+        return CACHE_MISS
+
+    async def aget_or_miss(self, key: str) -> Any:
+        """Asynchronously retrieve a value from the cache, or `CACHE_MISS`.
+
+        Backends doing blocking I/O should override this so that the event loop
+        is not blocked; the default calls `get_or_miss` directly.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The cached value, or `CACHE_MISS` if the key is not in the cache.
+        """
+        return self.get_or_miss(key)
+
+    async def aset(self, key: str, value) -> None:
+        """Asynchronously store a value in the cache with the given key.
+
+        Backends doing blocking I/O should override this so that the event loop
+        is not blocked; the default calls `set` directly.
+
+        Args:
+            key: The key to store the value under.
+            value: The value to cache.
+        """
+        self.set(key, value)
+
     @classmethod
     def __get_pydantic_core_schema__(
         cls, source_type: Any, handler: GetCoreSchemaHandler
@@ -70,13 +136,26 @@ class DiskCacheBackend(CacheInterface):
     """A cache implementation that stores data on disk using the diskcache library.
 
     This cache backend persists data to disk, allowing it to survive between program runs.
-    It implements the CacheInterface for use with Ragas caching functionality.
+    It implements the CacheInterface for use with Ragas caching functionality. The async
+    methods run the SQLite I/O in a small thread pool so that they do not block the event loop.
 
     Args:
         cache_dir (str, optional): Directory where cache files will be stored. Defaults to ".cache".
+        io_workers (int, optional): Number of threads used for async disk I/O. Defaults to 4.
+        size_limit (int, optional): Maximum size of the cache directory in bytes. The least
+            recently used entries are evicted once it is exceeded. Defaults to diskcache's
+            own limit of 1GB.
+        ttl (float, optional): Seconds after which stored entries expire. Defaults to None,
+            meaning entries never expire.
     """
 
-    def __init__(self, cache_dir: str = ".cache"):
+    def __init__(
+        self,
+        cache_dir: str = ".cache",
+        io_workers: int = 4,
+        size_limit: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
         try:
             from diskcache import Cache
         except ImportError:
@@ -84,7 +163,21 @@ class DiskCacheBackend(CacheInterface):
                 "For using the diskcache backend, please install it with `pip install diskcache`."
             )
 
-        self.cache = Cache(cache_dir)
+        settings: Dict[str, Any] = {}
+        if size_limit is not None:
+            settings["size_limit"] = size_limit
+            settings["eviction_policy"] = "least-recently-used"
+        self.cache = Cache(cache_dir, **settings)
+        self.ttl = ttl
+        self.io_workers = io_workers
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(
+                max_workers=self.io_workers, thread_name_prefix="ragas-cache"
+            )
+        return self._io_executor
 
     def get(self, key: str) -> Any:
         """Retrieve a value from the disk cache by key.
@@ -104,7 +197,7 @@ class DiskCacheBackend(CacheInterface):
             key: The key to store the value under.
             value: The value to cache.
         """
-        self.cache.set(key, value)
+        self.cache.set(key, value, expire=self.ttl)
 
     def has_key(self, key: str) -> bool:
         """Check if a key exists in the disk cache.
@@ -117,8 +210,43 @@ class DiskCacheBackend(CacheInterface):
         """
         return key in self.cache
 
+    def get_or_miss(self, key: str) -> Any:
+        """Retrieve a value from the disk cache with a single lookup.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The cached value, or `CACHE_MISS` if the key is not in the cache.
+        """
+        return self.cache.get(key, default=CACHE_MISS)
+
+    async def aget_or_miss(self, key: str) -> Any:
+        """Retrieve a value from the disk cache without blocking the event loop.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The cached value, or `CACHE_MISS` if the key is not in the cache.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), self.get_or_miss, key)
+
+    async def aset(self, key: str, value) -> None:
+        """Store a value in the disk cache without blocking the event loop.
+
+        Args:
+            key: The key to store the value under.
+            value: The value to cache.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor(), self.set, key, value)
+
     def __del__(self):
         """Cleanup method to properly close the cache when the object is destroyed."""
+        if getattr(self, "_io_executor", None) is not None:
+            self._io_executor.shutdown(wait=False)  # type: ignore
         if hasattr(self, "cache"):
             self.cache.close()
 
@@ -131,48 +259,523 @@ class DiskCacheBackend(CacheInterface):
         return f"DiskCacheBackend(cache_dir={self.cache.directory})"
 
 
-def _make_hashable(o):
-    if isinstance(o, (tuple, list)):
-        return tuple(_make_hashable(e) for e in o)
-    elif isinstance(o, dict):
-        return tuple(sorted((k, _make_hashable(v)) for k, v in o.items()))
-    elif isinstance(o, set):
-        return tuple(sorted(_make_hashable(e) for e in o))
-    elif isinstance(o, BaseModel):
-        return _make_hashable(o.model_dump())
-    else:
-        return o
+class TieredCacheBackend(CacheInterface):
+    """A two tier cache with a bounded in-memory LRU in front of a disk cache.
+
+    Hits in the memory tier are served without touching the disk. The memory tier
+    keeps values pickled, so like the disk tier every lookup returns a fresh copy that
+    callers may modify. Misses fall through to a `DiskCacheBackend`, and values found
+    there are promoted to the memory tier together with their expiry time. Writes go
+    to both tiers. The memory tier is bounded both by number of entries and by the
+    pickled size of the stored values, and the disk tier by its `size_limit`. Entries
+    of both tiers expire after `ttl`.
+
+    Args:
+        cache_dir (str, optional): Directory of the disk tier. Defaults to ".cache".
+        max_memory_items (int, optional): Maximum number of entries kept in memory.
+            Defaults to 1024.
+        max_memory_bytes (int, optional): Maximum total pickled size of the entries kept
+            in memory. Defaults to 64MB.
+        disk_size_limit (int, optional): Maximum size of the disk tier in bytes. Defaults
+            to diskcache's own limit of 1GB.
+        ttl (float, optional): Seconds after which entries expire. Defaults to None,
+            meaning entries never expire.
+        io_workers (int, optional): Number of threads used for async disk I/O. Defaults to 4.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = ".cache",
+        max_memory_items: int = 1024,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        disk_size_limit: Optional[int] = None,
+        ttl: Optional[float] = None,
+        io_workers: int = 4,
+    ):
+        self.disk = DiskCacheBackend(
+            cache_dir=cache_dir,
+            io_workers=io_workers,
+            size_limit=disk_size_limit,
+            ttl=ttl,
+        )
+        self.ttl = ttl
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        # key -> (pickled value, expiry as a unix timestamp or None), least recently
+        # used first. Timestamps are wall clock time like the disk tier's.
+        self._memory: OrderedDict[str, Tuple[bytes, Optional[float]]] = OrderedDict()
+        self._memory_bytes = 0
+        # the memory tier is also touched from the disk tier's I/O threads
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _memory_entry(self, key: str) -> Optional[bytes]:
+        # must be called with the lock held
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._memory[key]
+            self._memory_bytes -= len(payload)
+            return None
+        return payload
+
+    def _memory_get(self, key: str) -> Any:
+        with self._lock:
+            payload = self._memory_entry(key)
+            if payload is None:
+                return CACHE_MISS
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+        return pickle.loads(payload)
+
+    def _memory_set(self, key: str, value, expires_at: Optional[float]) -> None:
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # values that cannot be pickled are only kept on disk if at all
+            return
+        if len(payload) > self.max_memory_bytes:
+            return
+
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous[0])
+            self._memory[key] = (payload, expires_at)
+            self._memory_bytes += len(payload)
+            while (
+                len(self._memory) > self.max_memory_items
+                or self._memory_bytes > self.max_memory_bytes
+            ):
+                _, (evicted, _) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self.evictions += 1
+
+    def _expiry(self) -> Optional[float]:
+        return None if self.ttl is None else time.time() + self.ttl
+
+    def _disk_get(self, key: str) -> Tuple[Any, Optional[float]]:
+        # the value and its expiry time, so that promoted entries expire with the
+        # disk entry
+        return self.disk.cache.get(key, default=CACHE_MISS, expire_time=True)
+
+    def _promote(self, key: str, lookup: Tuple[Any, Optional[float]]) -> Any:
+        value, expires_at = lookup
+        if value is CACHE_MISS:
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.disk_hits += 1
+            self._memory_set(key, value, expires_at)
+        return value
+
+    def get(self, key: str) -> Any:
+        """Retrieve a value from the cache by key.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The cached value associated with the key, or None if not found.
+        """
+        value = self.get_or_miss(key)
+        return None if value is CACHE_MISS else value
+
+    def set(self, key: str, value) -> None:
+        """Store a value in both cache tiers with the given key.
+
+        Args:
+            key: The key to store the value under.
+            value: The value to cache.
+        """
+        self._memory_set(key, value, self._expiry())
+        self.disk.set(key, value)
+
+    def has_key(self, key: str) -> bool:
+        """Check if a key exists in either cache tier.
+
+        Args:
+            key: The key to check for.
+
+        Returns:
+            True if the key exists in the cache, False otherwise.
+        """
+        with self._lock:
+            if self._memory_entry(key) is not None:
+                return True
+        return self.disk.has_key(key)
+
+    def get_or_miss(self, key: str) -> Any:
+        """Retrieve a value from the memory tier, falling back to the disk tier.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The cached value, or `CACHE_MISS` if the key is not in the cache.
+        """
+        value = self._memory_get(key)
+        if value is not CACHE_MISS:
+            return value
+        return self._promote(key, self._disk_get(key))
+
+    async def aget_or_miss(self, key: str) -> Any:
+        """Retrieve a value, only leaving the event loop when the disk tier is needed.
+
+        Args:
+            key: The key to look up in the cache.
+
+        Returns:
+            The cached value, or `CACHE_MISS` if the key is not in the cache.
+        """
+        value = self._memory_get(key)
+        if value is not CACHE_MISS:
+            return value
+        loop = asyncio.get_running_loop()
+        lookup = await loop.run_in_executor(self.disk._executor(), self._disk_get, key)
+        return self._promote(key, lookup)
+
+    async def aset(self, key: str, value) -> None:
+        """Store a value in both cache tiers without blocking the event loop.
+
+        Args:
+            key: The key to store the value under.
+            value: The value to cache.
+        """
+        self._memory_set(key, value, self._expiry())
+        await self.disk.aset(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and eviction counters of the cache.
+
+        Returns:
+            A dictionary with the number of memory hits, disk hits, misses, memory tier
+            evictions and the current number of entries and bytes in the memory tier.
+        """
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+            }
+
+    def __repr__(self):
+        """Return string representation of the cache object.
+
+        Returns:
+            String showing the memory limits and the disk tier.
+        """
+        return (
+            f"TieredCacheBackend(max_memory_items={self.max_memory_items}, "
+            f"max_memory_bytes={self.max_memory_bytes}, disk={self.disk!r})"
+        )
 
 
 EXCLUDE_KEYS = ["callbacks"]
 
+# bump whenever the canonical encoding below changes so that old entries are not
+# confused with new ones
+CACHE_KEY_VERSION = 2
 
-def _generate_cache_key(func, args, kwargs):
-    if inspect.ismethod(func):
-        args = args[1:]
+# values whose string form identifies them in every process
+_PLAIN_VALUE_TYPES = (
+    uuid.UUID,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    decimal.Decimal,
+    complex,
+    PurePath,
+)
 
-    filtered_kwargs = {k: v for k, v in kwargs.items() if k not in EXCLUDE_KEYS}
 
-    key_data = {
-        "function": func.__qualname__,
-        "args": _make_hashable(args),
-        "kwargs": _make_hashable(filtered_kwargs),
-    }
+class CacheKeyError(TypeError):
+    """Raised when an argument has no encoding that is stable across processes."""
+
+
+def _write_tagged(tag: bytes, data: bytes, write: Callable[[bytes], Any]):
+    write(b"%s%d:" % (tag, len(data)))
+    write(data)
+
+
+def _canonical_bytes(o, _active: Optional[set] = None) -> bytes:
+    chunks: List[bytes] = []
+    _write_canonical(o, chunks.append, _active)
+    return b"".join(chunks)
+
+
+def _object_attributes(o) -> Optional[Dict[str, Any]]:
+    """The instance attributes of `o`, or None if it has none to encode."""
+    attributes = dict(getattr(o, "__dict__", {}))
+    for cls in type(o).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__") and hasattr(o, name):
+                attributes[name] = getattr(o, name)
+    if not attributes and not hasattr(o, "__dict__"):
+        return None
+    return attributes
+
+
+def _write_canonical(o, write: Callable[[bytes], Any], _active: Optional[set] = None):
+    """Write an unambiguous, process independent encoding of `o`.
+
+    Every value is prefixed with a type tag and its length, so different structures
+    never produce the same byte stream. Mappings and sets are written in sorted order.
+    Other objects are written as their class and attributes.
+
+    Raises:
+        CacheKeyError: If `o` contains an object without attributes that is not a
+            known value type (e.g. a lock or a native handle), or a reference cycle.
+    """
+    if o is None:
+        write(b"N")
+    elif isinstance(o, bool):
+        write(b"T" if o else b"F")
+    elif isinstance(o, int):
+        _write_tagged(b"i", str(o).encode("ascii"), write)
+    elif isinstance(o, float):
+        _write_tagged(b"f", repr(o).encode("ascii"), write)
+    elif isinstance(o, str):
+        _write_tagged(b"s", o.encode("utf-8"), write)
+    elif isinstance(o, (bytes, bytearray)):
+        _write_tagged(b"b", bytes(o), write)
+    elif isinstance(o, (list, tuple)):
+        write(b"l%d:" % len(o))
+        for e in o:
+            _write_canonical(e, write, _active)
+    elif isinstance(o, dict):
+        write(b"d%d:" % len(o))
+        if all(isinstance(k, str) for k in o):
+            for k in sorted(o):
+                _write_tagged(b"s", k.encode("utf-8"), write)
+                _write_canonical(o[k], write, _active)
+        else:
+            items = sorted(
+                (_canonical_bytes(k, _active), _canonical_bytes(v, _active))
+                for k, v in o.items()
+            )
+            for k, v in items:
+                write(k)
+                write(v)
+    elif isinstance(o, (set, frozenset)):
+        write(b"S%d:" % len(o))
+        for e in sorted(_canonical_bytes(e, _active) for e in o):
+            write(e)
+    elif isinstance(o, BaseModel):
+        _write_tagged(b"m", type(o).__qualname__.encode("utf-8"), write)
+        _write_canonical(dict(o), write, _active)
+    elif isinstance(o, np.ndarray):
+        _write_tagged(b"a", f"{o.dtype.str}{o.shape}".encode("ascii"), write)
+        _write_tagged(b"", np.ascontiguousarray(o).tobytes(), write)
+    elif dataclasses.is_dataclass(o) and not isinstance(o, type):
+        _write_tagged(b"c", type(o).__qualname__.encode("utf-8"), write)
+        _write_canonical(
+            {f.name: getattr(o, f.name) for f in dataclasses.fields(o)},
+            write,
+            _active,
+        )
+    elif isinstance(o, np.generic):
+        _write_canonical(np.asarray(o), write, _active)
+    elif isinstance(o, enum.Enum):
+        _write_tagged(b"e", type(o).__qualname__.encode("utf-8"), write)
+        _write_canonical(o.value, write, _active)
+    elif isinstance(o, _PLAIN_VALUE_TYPES):
+        _write_tagged(b"v", type(o).__qualname__.encode("utf-8"), write)
+        _write_tagged(b"s", str(o).encode("utf-8"), write)
+    elif isinstance(o, types.MethodType):
+        _write_tagged(b"M", o.__func__.__qualname__.encode("utf-8"), write)
+        _write_canonical(o.__self__, write, _active)
+    elif isinstance(o, (type, types.FunctionType, types.BuiltinFunctionType)):
+        name = f"{o.__module__}.{o.__qualname__}"
+        _write_tagged(b"q", name.encode("utf-8"), write)
+    else:
+        attributes = _object_attributes(o)
+        if attributes is None:
+            raise CacheKeyError(
+                f"cannot build a cache key from a {type(o).__qualname__} object"
+            )
+        if _active is None:
+            _active = set()
+        if id(o) in _active:
+            raise CacheKeyError(
+                f"cannot build a cache key from a {type(o).__qualname__} object "
+                "that refers to itself"
+            )
+        _active.add(id(o))
+        try:
+            name = f"{type(o).__module__}.{type(o).__qualname__}"
+            _write_tagged(b"o", name.encode("utf-8"), write)
+            _write_canonical(attributes, write, _active)
+        finally:
+            _active.discard(id(o))
+
 
-    key_string = json.dumps(key_data, sort_keys=True, default=str)
-    cache_key = hashlib.sha256(key_string.encode("utf-8")).hexdigest()
-    return cache_key
+def _generate_cache_key(func, args, kwargs, signature=None, namespace=None):
+    """Build the cache key of a call to `func`.
+
+    The arguments are bound to the signature of `func`, so passing an argument
+    positionally or by keyword, or leaving it at its default, gives the same key.
+    Their canonical encoding is streamed straight into the hasher, after the
+    optional namespace that separates e.g. the calls made to different models.
+    """
+    if signature is None:
+        signature = inspect.signature(func)
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError:
+        # let the call itself raise, but still produce a key for it
+        arguments = {
+            "args": args,
+            "kwargs": {k: v for k, v in kwargs.items() if k not in EXCLUDE_KEYS},
+        }
+    else:
+        bound.apply_defaults()
+        arguments = {}
+        for name, value in bound.arguments.items():
+            if signature.parameters[name].kind is inspect.Parameter.VAR_KEYWORD:
+                value = {k: v for k, v in value.items() if k not in EXCLUDE_KEYS}
+            # plain functions defined on a class receive the instance as first argument
+            elif name in EXCLUDE_KEYS or name in ("self", "cls"):
+                continue
+            arguments[name] = value
+
+    hasher = hashlib.sha256()
+    hasher.update(b"ragas-cache-key:v%d\0" % CACHE_KEY_VERSION)
+    _write_canonical(namespace, hasher.update)
+    _write_tagged(b"s", func.__qualname__.encode("utf-8"), hasher.update)
+    _write_canonical(arguments, hasher.update)
+    return hasher.hexdigest()
+
+
+# attributes of model clients that do not change what the model returns
+FINGERPRINT_EXCLUDE_KEYS = {
+    "batch_size",
+    "cache",
+    "callbacks",
+    "check_embedding_ctx_length",
+    "chunk_size",
+    "custom_get_token_ids",
+    "default_headers",
+    "default_query",
+    "disable_streaming",
+    "embed_batch_size",
+    "headers",
+    "max_retries",
+    "metadata",
+    "num_workers",
+    "rate_limiter",
+    "request_timeout",
+    "retry_max_seconds",
+    "retry_min_seconds",
+    "show_progress_bar",
+    "stream",
+    "streaming",
+    "tags",
+    "tiktoken_enabled",
+    "timeout",
+    "verbose",
+}
+
+
+def _is_plain(o) -> bool:
+    if o is None or isinstance(o, (bool, int, float, str)):
+        return True
+    if isinstance(o, (list, tuple)):
+        return all(_is_plain(e) for e in o)
+    if isinstance(o, dict):
+        return all(isinstance(k, str) and _is_plain(v) for k, v in o.items())
+    return False
+
+
+def fingerprint_model(model: Any) -> str:
+    """Fingerprint a model client by its class and its configuration.
+
+    The configuration is made of the public attributes of `model` that are plain
+    values, such as the model name, endpoint and generation parameters. Clients,
+    credentials and settings that do not change the output (retries, timeouts,
+    batch sizes, ...) are left out, so the fingerprint is stable across processes.
 
+    Args:
+        model: The model client, e.g. a langchain chat model or embeddings object.
 
-def cacher(cache_backend: Optional[CacheInterface] = None):
+    Returns:
+        A string of the form "<class>:<hash of the configuration>".
+    """
+    params = {
+        k: v
+        for k, v in getattr(model, "__dict__", {}).items()
+        if not k.startswith("_")
+        and k not in FINGERPRINT_EXCLUDE_KEYS
+        and "api_key" not in k
+        and _is_plain(v)
+    }
+    model_class = f"{type(model).__module__}.{type(model).__qualname__}"
+    return f"{model_class}:{hashlib.sha256(_canonical_bytes(params)).hexdigest()[:16]}"
+
+
+# temperatures up to this value are treated as greedy decoding, which is what
+# BaseRagasLLM.get_temperature uses for single completions
+DETERMINISTIC_TEMPERATURE = 1e-6
+
+
+def _is_sampling_call(bound: inspect.BoundArguments) -> bool:
+    """Whether the call asks for diverse samples, so identical calls must not be merged."""
+    n = bound.arguments.get("n")
+    temperature = bound.arguments.get("temperature")
+    if isinstance(n, int) and n > 1:
+        return True
+    return (
+        isinstance(temperature, (int, float))
+        and temperature > DETERMINISTIC_TEMPERATURE
+    )
+
+
+def _snapshot(value: Any) -> Callable[[], Any]:
+    """Return a function that returns a fresh copy of `value` on every call."""
+    try:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        frozen = copy.deepcopy(value)
+        return functools.partial(copy.deepcopy, frozen)
+    return functools.partial(pickle.loads, payload)
+
+
+def cacher(
+    cache_backend: Optional[CacheInterface] = None,
+    coalesce: bool = True,
+    namespace: Optional[Callable[[], str]] = None,
+):
     """Decorator that adds caching functionality to a function.
 
     This decorator can be applied to both synchronous and asynchronous functions to cache their results.
     If no cache backend is provided, the original function is returned unchanged.
 
+    For async functions, concurrent calls with the same cache key are coalesced: the first
+    caller runs the function and the others await its result instead of issuing the same
+    request again. Each of them gets its own copy of the result. Calls that ask for diverse
+    samples (`n > 1` or a non-zero `temperature`) are never coalesced. Calls with an
+    argument that has no stable encoding (see `CacheKeyError`) are run without the cache
+    and a warning is logged.
+
     Args:
         cache_backend (Optional[CacheInterface]): The cache backend to use for storing results.
             If None, caching is disabled.
+        coalesce (bool, optional): Whether to coalesce identical in-flight async calls.
+            Defaults to True.
+        namespace (Optional[Callable[[], str]]): Called on every call to get a namespace
+            that is part of the cache key, such as the fingerprint of the model the
+            function calls. This lets functions of differently configured models share
+            one cache backend. Defaults to None.
 
     Returns:
         Callable: A decorated function that implements caching behavior.
@@ -186,26 +789,99 @@ def cacher(cache_backend: Optional[CacheInterface] = None):
         backend: CacheInterface = cache_backend
 
         is_async = inspect.iscoroutinefunction(func)
-
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            cache_key = _generate_cache_key(func, args, kwargs)
-
-            if backend.has_key(cache_key):
+        signature = inspect.signature(func)
+        warned = False
+
+        def cache_key_or_none(args, kwargs) -> Optional[str]:
+            nonlocal warned
+            try:
+                return _generate_cache_key(
+                    func, args, kwargs, signature, namespace() if namespace else None
+                )
+            except CacheKeyError as e:
+                if not warned:
+                    logger.warning("Not caching calls to %s: %s", func.__qualname__, e)
+                    warned = True
+                return None
+
+        # cache key -> future of the call currently computing it, resolved with a
+        # function returning copies of the result for the callers that joined it
+        in_flight: Dict[str, asyncio.Future] = {}
+        # cache key -> number of callers that joined the call
+        joined: Dict[str, int] = {}
+
+        def should_coalesce(args, kwargs) -> bool:
+            if not coalesce:
+                return False
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                return False
+            bound.apply_defaults()
+            return not _is_sampling_call(bound)
+
+        async def compute(cache_key, args, kwargs):
+            cached = await backend.aget_or_miss(cache_key)
+            if cached is not CACHE_MISS:
                 logger.debug(f"Cache hit for {cache_key}")
-                return backend.get(cache_key)
+                return cached
 
             result = await func(*args, **kwargs)
-            backend.set(cache_key, result)
+            await backend.aset(cache_key, result)
             return result
 
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            cache_key = cache_key_or_none(args, kwargs)
+            if cache_key is None:
+                return await func(*args, **kwargs)
+            if not should_coalesce(args, kwargs):
+                return await compute(cache_key, args, kwargs)
+
+            loop = asyncio.get_running_loop()
+            pending = in_flight.get(cache_key)
+            if pending is not None and pending.get_loop() is loop:
+                logger.debug(f"Joining in-flight call for {cache_key}")
+                joined[cache_key] = joined.get(cache_key, 0) + 1
+                try:
+                    return (await asyncio.shield(pending))()
+                except asyncio.CancelledError:
+                    if not pending.cancelled():
+                        raise
+                # the call we joined was cancelled, so run it ourselves
+                return await async_wrapper(*args, **kwargs)
+
+            future = loop.create_future()
+            in_flight[cache_key] = future
+            try:
+                result = await compute(cache_key, args, kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                # mark the exception as retrieved in case nobody joined the call
+                future.exception()
+                raise
+            else:
+                # copy the result before our caller can modify it
+                future.set_result(_snapshot(result) if joined.get(cache_key) else None)
+                return result
+            finally:
+                if in_flight.get(cache_key) is future:
+                    del in_flight[cache_key]
+                    joined.pop(cache_key, None)
+
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            cache_key = _generate_cache_key(func, args, kwargs)
+            cache_key = cache_key_or_none(args, kwargs)
+            if cache_key is None:
+                return func(*args, **kwargs)
 
-            if backend.has_key(cache_key):
+            cached = backend.get_or_miss(cache_key)
+            if cached is not CACHE_MISS:
                 logger.debug(f"Cache hit for {cache_key}")
-                return backend.get(cache_key)
+                return cached
 
             result = func(*args, **kwargs)
             backend.set(cache_key, result)
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import logging
+import os
+import typing as t
+
+if t.TYPE_CHECKING:
+    from ragas.dataset_schema import EvaluationDataset
+
+logger = logging.getLogger(__name__)
+
+
+def dataset_fingerprint(dataset: "EvaluationDataset") -> str:
+    """Compute a stable fingerprint of the samples in an evaluation dataset.
+
+    Args:
+        dataset: The dataset to fingerprint.
+
+    Returns:
+        A hex digest that changes whenever any sample or the sample order changes.
+    """
+    hasher = hashlib.sha256()
+    for sample in dataset:
+        hasher.update(sample.model_dump_json().encode("utf-8"))
+        hasher.update(b"\n")
+    return hasher.hexdigest()
+
+
+class EvaluationCheckpoint:
+    """An append-only JSONL store of finished (row, metric) scores for `evaluate`.
+
+    Every score is written as soon as its job finishes, keyed by the row index,
+    the metric name and the dataset fingerprint. When an evaluation is restarted
+    with the same checkpoint, jobs whose score is already stored for the same
+    dataset are skipped. Jobs that raised are not recorded, so they are retried.
+
+    Args:
+        path (str): Path of the JSONL file. It is created if it does not exist.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file: t.Optional[t.TextIO] = None
+
+    def load(self, fingerprint: str) -> t.Dict[t.Tuple[int, str], t.Any]:
+        """Load the stored scores for a dataset.
+
+        Args:
+            fingerprint: The fingerprint of the dataset being evaluated.
+
+        Returns:
+            A mapping of (row index, metric name) to the stored score.
+        """
+        scores: t.Dict[t.Tuple[int, str], t.Any] = {}
+        if not os.path.exists(self.path):
+            return scores
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # a partially written last line from an interrupted run
+                    logger.debug("Skipping malformed checkpoint line in %s", self.path)
+                    continue
+                if record.get("fingerprint") != fingerprint:
+                    continue
+                scores[(record["row_index"], record["metric"])] = record["value"]
+        return scores
+
+    def record(self, fingerprint: str, row_index: int, metric: str, value: t.Any):
+        """Append a finished score to the checkpoint file.
+
+        Args:
+            fingerprint: The fingerprint of the dataset being evaluated.
+            row_index: The index of the row in the dataset.
+            metric: The name of the metric.
+            value: The score, which must be JSON serializable.
+        """
+        try:
+            line = json.dumps(
+                {
+                    "fingerprint": fingerprint,
+                    "row_index": row_index,
+                    "metric": metric,
+                    "value": value,
+                }
+            )
+        except TypeError:
+            logger.warning(
+                "Score of %s for row %s is not JSON serializable, not checkpointing it",
+                metric,
+                row_index,
+            )
+            return
+
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(line + "\n")
+        self._file.flush()
+
+    def close(self):
+        """Close the underlying checkpoint file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __del__(self):
+        self.close()
+
+    def __repr__(self):
+        return f"EvaluationCheckpoint(path={self.path})"
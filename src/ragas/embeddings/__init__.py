@@ -6,6 +6,7 @@ from ragas.embeddings.base import (
     embedding_factory,
 )
 from ragas.embeddings.haystack_wrapper import HaystackEmbeddingsWrapper
+from ragas.embeddings.onnx_embeddings import OnnxEmbeddings
 
 __all__ = [
     "BaseRagasEmbeddings",
@@ -13,5 +14,6 @@ __all__ = [
     "HuggingfaceEmbeddings",
     "LangchainEmbeddingsWrapper",
     "LlamaIndexEmbeddingsWrapper",
+    "OnnxEmbeddings",
     "embedding_factory",
 ]
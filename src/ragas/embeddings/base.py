@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import typing as t
 from abc import ABC, abstractmethod
 from dataclasses import field
@@ -11,17 +12,106 @@ from langchain_openai.embeddings import OpenAIEmbeddings
 from pydantic.dataclasses import dataclass
 from pydantic_core import CoreSchema, core_schema
 
-from ragas.cache import CacheInterface, cacher
-from ragas.run_config import RunConfig, add_async_retry, add_retry
+from ragas.cache import CacheInterface, cacher, fingerprint_model
+from ragas.rate_limiter import estimate_tokens
+from ragas.run_config import RunConfig, add_async_retry
 
 if t.TYPE_CHECKING:
     from llama_index.core.base.embeddings.base import BaseEmbedding
     from pydantic import GetCoreSchemaHandler
 
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_MODEL_NAME = "BAAI/bge-small-en-v1.5"
 
 
+def as_float32_array(embeddings: t.Sequence[t.Sequence[float]]) -> np.ndarray:
+    """
+    Convert a list of embeddings into a contiguous float32 array of shape
+    (len(embeddings), dimension).
+    """
+    array = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if array.ndim == 1:
+        # no embeddings at all
+        array = array.reshape(len(array), 0)
+    return array
+
+
+class EmbeddingBatcher:
+    """
+    Collects concurrent single text embedding requests into batches.
+
+    Requests are queued until either `max_batch_size` texts are waiting or
+    `max_wait` seconds have passed since the first one, and are then embedded with
+    a single call of `embed`. Every caller gets back the embedding of its own text,
+    or the exception raised for the batch. Must be used from a single event loop.
+
+    Parameters
+    ----------
+    embed : Callable[[List[str]], Awaitable[np.ndarray]]
+        Function embedding a batch of texts into an array with one row per text.
+    max_batch_size : int
+        Maximum number of texts sent in one batch.
+    max_wait : float
+        Time (in seconds) to wait for more texts before sending a batch.
+    """
+
+    def __init__(
+        self,
+        embed: t.Callable[[t.List[str]], t.Awaitable[np.ndarray]],
+        max_batch_size: int,
+        max_wait: float,
+    ):
+        self._embed = embed
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.loop = asyncio.get_running_loop()
+        self._pending: t.List[t.Tuple[str, asyncio.Future]] = []
+        self._flush_handle: t.Optional[asyncio.TimerHandle] = None
+        # keep references to running batches so that they are not garbage collected
+        self._batches: t.Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Queue a text and wait for its embedding."""
+        future = self.loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = self.loop.create_task(self._run(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: t.List[t.Tuple[str, asyncio.Future]]):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            embeddings = await self._embed(texts)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_text = dict(zip(texts, embeddings))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+
+
 class BaseRagasEmbeddings(Embeddings, ABC):
     """
     Abstract base class for Ragas embeddings.
@@ -41,21 +131,75 @@ class BaseRagasEmbeddings(Embeddings, ABC):
         super().__init__()
         self.cache = cache
         if self.cache is not None:
-            self.embed_query = cacher(cache_backend=self.cache)(self.embed_query)
-            self.embed_documents = cacher(cache_backend=self.cache)(
-                self.embed_documents
-            )
-            self.aembed_query = cacher(cache_backend=self.cache)(self.aembed_query)
-            self.aembed_documents = cacher(cache_backend=self.cache)(
-                self.aembed_documents
-            )
+            cache = cacher(cache_backend=self.cache, namespace=self.model_fingerprint)
+            self.embed_query = cache(self.embed_query)
+            self.embed_documents = cache(self.embed_documents)
+            self.aembed_query = cache(self.aembed_query)
+            self.aembed_documents = cache(self.aembed_documents)
 
     async def embed_text(self, text: str, is_async=True) -> t.List[float]:
         """
         Embed a single text string.
+
+        If `run_config.embedding_batch_size` is larger than 1, concurrent calls are
+        collected into batches that are embedded with a single `aembed_documents` call.
         """
-        embs = await self.embed_texts([text], is_async=is_async)
-        return embs[0]
+        return (await self._embed_text_row(text, is_async=is_async)).tolist()
+
+    async def embed_text_array(self, text: str, is_async=True) -> np.ndarray:
+        """
+        Embed a single text string into a float32 array.
+        """
+        return np.asarray(
+            await self._embed_text_row(text, is_async=is_async), dtype=np.float32
+        )
+
+    async def embed_query_array(self, text: str, is_async=True) -> np.ndarray:
+        """
+        Embed a search query into a float32 array. Unlike `embed_text_array`, this
+        goes through `aembed_query`, which embeds the text differently from a
+        document for asymmetric models.
+        """
+        if is_async:
+            aembed_query = self.aembed_query
+        else:
+            loop = asyncio.get_event_loop()
+
+            async def aembed_query(text: str) -> t.List[float]:
+                return await loop.run_in_executor(None, self.embed_query, text)
+
+        if self.run_config.rate_limiter is not None:
+            aembed_query = self.run_config.rate_limiter.wrap(
+                aembed_query, tokens=estimate_tokens(text)
+            )
+        aembed_query_with_retry = add_async_retry(aembed_query, self.run_config)
+        return np.asarray(await aembed_query_with_retry(text), dtype=np.float32)
+
+    async def _embed_text_row(self, text: str, is_async=True) -> np.ndarray:
+        precomputed = getattr(self, "_precomputed", None)
+        if precomputed and text in precomputed:
+            return precomputed[text]
+        if is_async and self.run_config.embedding_batch_size > 1:
+            return await self._embedding_batcher().embed(text)
+        return (await self._embed_texts_array([text], is_async=is_async))[0]
+
+    def _embedding_batcher(self) -> EmbeddingBatcher:
+        # the batcher holds futures, which are bound to the running loop
+        batcher = getattr(self, "_batcher", None)
+        loop = asyncio.get_running_loop()
+        if (
+            batcher is None
+            or batcher.loop is not loop
+            or batcher.max_batch_size != self.run_config.embedding_batch_size
+            or batcher.max_wait != self.run_config.embedding_batch_wait
+        ):
+            batcher = EmbeddingBatcher(
+                self._embed_texts_array,
+                max_batch_size=self.run_config.embedding_batch_size,
+                max_wait=self.run_config.embedding_batch_wait,
+            )
+            self._batcher = batcher
+        return batcher
 
     async def embed_texts(
         self, texts: t.List[str], is_async: bool = True
@@ -63,17 +207,129 @@ class BaseRagasEmbeddings(Embeddings, ABC):
         """
         Embed multiple texts.
         """
+        if not getattr(self, "_precomputed", None):
+            return await self._embed_texts(texts, is_async=is_async)
+        return (await self._embed_texts_rows(texts, is_async=is_async)).tolist()
+
+    async def embed_texts_array(
+        self, texts: t.List[str], is_async: bool = True
+    ) -> np.ndarray:
+        """
+        Embed multiple texts into a contiguous float32 array of shape
+        (len(texts), dimension). This is what ragas uses internally, the list
+        returning methods return the embeddings as computed, without the float32
+        conversion.
+        """
+        return as_float32_array(await self._embed_texts_rows(texts, is_async=is_async))
+
+    async def _embed_texts_rows(
+        self, texts: t.List[str], is_async: bool = True
+    ) -> np.ndarray:
+        precomputed = getattr(self, "_precomputed", None)
+        if not precomputed:
+            return await self._embed_texts_array(texts, is_async=is_async)
+
+        missing = list(dict.fromkeys(text for text in texts if text not in precomputed))
+        embedded = {}
+        if missing:
+            vectors = await self._embed_texts_array(missing, is_async=is_async)
+            embedded = dict(zip(missing, vectors))
+        return np.stack(
+            [
+                precomputed[text] if text in precomputed else embedded[text]
+                for text in texts
+            ]
+        )
+
+    async def _embed_texts(
+        self, texts: t.List[str], is_async: bool = True
+    ) -> t.List[t.List[float]]:
         if is_async:
-            aembed_documents_with_retry = add_async_retry(
-                self.aembed_documents, self.run_config
-            )
-            return await aembed_documents_with_retry(texts)
+            aembed_documents = self.aembed_documents
         else:
             loop = asyncio.get_event_loop()
-            embed_documents_with_retry = add_retry(
-                self.embed_documents, self.run_config
+
+            async def aembed_documents(texts: t.List[str]) -> t.List[t.List[float]]:
+                return await loop.run_in_executor(None, self.embed_documents, texts)
+
+        if self.run_config.rate_limiter is not None:
+            aembed_documents = self.run_config.rate_limiter.wrap(
+                aembed_documents, tokens=estimate_tokens(*texts)
             )
-            return await loop.run_in_executor(None, embed_documents_with_retry, texts)
+        aembed_documents_with_retry = add_async_retry(aembed_documents, self.run_config)
+        return await aembed_documents_with_retry(texts)
+
+    async def _embed_texts_array(
+        self, texts: t.List[str], is_async: bool = True
+    ) -> np.ndarray:
+        # the embeddings as computed by the backend, so that converting the rows back
+        # to lists is lossless: float64 for the list returning backends, backends
+        # that compute arrays natively override this to skip the lists
+        array = np.asarray(
+            await self._embed_texts(texts, is_async=is_async), dtype=np.float64
+        )
+        if array.ndim == 1:
+            # no embeddings at all
+            array = array.reshape(len(array), 0)
+        return array
+
+    async def precompute(self, texts: t.Iterable[str], batch_size: int = 256):
+        """
+        Embed `texts` in batches of `batch_size` and keep their embeddings, so that
+        later `embed_text`/`embed_texts` calls for them are answered without another
+        request. Batches that fail are skipped, their texts are embedded on demand.
+
+        Every call should be paired with a `release_precomputed` call once its
+        embeddings are no longer needed. The stored embeddings are dropped when all
+        calls are released, so that concurrent users of the same embeddings (e.g.
+        two evaluation runs) do not drop each other's. `clear_precomputed` drops
+        them right away.
+        """
+        from ragas.executor import as_completed_stream
+
+        self._precompute_users = getattr(self, "_precompute_users", 0) + 1
+        precomputed: t.Dict[str, np.ndarray] = getattr(self, "_precomputed", {})
+        self._precomputed = precomputed
+        todo = [text for text in dict.fromkeys(texts) if text not in precomputed]
+
+        async def embed_batch(batch: t.List[str]):
+            try:
+                return batch, await self._embed_texts_array(batch)
+            except Exception as e:
+                logger.warning(
+                    "Precomputing %d embeddings failed, they will be computed on "
+                    "demand: %s",
+                    len(batch),
+                    e,
+                )
+                return batch, None
+
+        batches = (
+            embed_batch(todo[i : i + batch_size])
+            for i in range(0, len(todo), batch_size)
+        )
+        async for batch, embeddings in as_completed_stream(
+            batches, self.run_config.max_workers
+        ):
+            if embeddings is not None:
+                precomputed.update(zip(batch, embeddings))
+
+    def release_precomputed(self):
+        """
+        Release a `precompute` call, the stored embeddings are dropped once every
+        call has been released.
+        """
+        self._precompute_users = max(getattr(self, "_precompute_users", 0) - 1, 0)
+        if self._precompute_users == 0:
+            self._precomputed = {}
+
+    def clear_precomputed(self):
+        """
+        Drop the embeddings stored by `precompute`, whether or not its calls have
+        been released.
+        """
+        self._precompute_users = 0
+        self._precomputed = {}
 
     @abstractmethod
     async def aembed_query(self, text: str) -> t.List[float]: ...
@@ -87,6 +343,14 @@ class BaseRagasEmbeddings(Embeddings, ABC):
         """
         self.run_config = run_config
 
+    def model_fingerprint(self) -> str:
+        """
+        Return a fingerprint of the underlying embedding model and its configuration.
+        Cached embeddings are namespaced by it, so wrappers of different models can
+        share one cache backend.
+        """
+        return fingerprint_model(self)
+
     @classmethod
     def __get_pydantic_core_schema__(
         cls, source_type: t.Any, handler: GetCoreSchemaHandler
@@ -116,6 +380,9 @@ class LangchainEmbeddingsWrapper(BaseRagasEmbeddings):
             run_config = RunConfig()
         self.set_run_config(run_config)
 
+    def model_fingerprint(self) -> str:
+        return fingerprint_model(self.embeddings)
+
     def embed_query(self, text: str) -> t.List[float]:
         """
         Embed a single query text.
@@ -252,7 +519,9 @@ class HuggingfaceEmbeddings(BaseRagasEmbeddings):
             self.encode_kwargs["convert_to_tensor"] = True
 
         if self.cache is not None:
-            self.predict = cacher(cache_backend=self.cache)(self.predict)
+            self.predict = cacher(
+                cache_backend=self.cache, namespace=self.model_fingerprint
+            )(self.predict)
 
     def embed_query(self, text: str) -> t.List[float]:
         """
@@ -277,6 +546,33 @@ class HuggingfaceEmbeddings(BaseRagasEmbeddings):
         assert isinstance(embeddings, Tensor)
         return embeddings.tolist()
 
+    def encode(self, texts: t.List[str]) -> np.ndarray:
+        """
+        Embed multiple documents into a float32 array.
+        """
+        from sentence_transformers.SentenceTransformer import SentenceTransformer
+
+        assert isinstance(
+            self.model, SentenceTransformer
+        ), "Model is not of the type Bi-encoder"
+        encode_kwargs = {
+            "normalize_embeddings": True,
+            **self.encode_kwargs,
+            "convert_to_tensor": False,
+            "convert_to_numpy": True,
+        }
+        embeddings = self.model.encode(texts, **encode_kwargs)
+        return as_float32_array(embeddings)
+
+    async def _embed_texts_array(
+        self, texts: t.List[str], is_async: bool = True
+    ) -> np.ndarray:
+        if self.cache is not None:
+            # the cache stores the results of embed_documents
+            return await super()._embed_texts_array(texts, is_async=is_async)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.encode, texts)
+
     def predict(self, texts: t.List[t.List[str]]) -> t.List[t.List[float]]:
         """
         Make predictions using a cross-encoder model.
@@ -336,6 +632,9 @@ class LlamaIndexEmbeddingsWrapper(BaseRagasEmbeddings):
             run_config = RunConfig()
         self.set_run_config(run_config)
 
+    def model_fingerprint(self) -> str:
+        return fingerprint_model(self.embeddings)
+
     def embed_query(self, text: str) -> t.List[float]:
         return self.embeddings.get_query_embedding(text)
 
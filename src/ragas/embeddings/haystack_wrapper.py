@@ -3,7 +3,7 @@ import typing as t
 
 import numpy as np
 
-from ragas.cache import CacheInterface
+from ragas.cache import CacheInterface, fingerprint_model
 from ragas.embeddings.base import BaseRagasEmbeddings
 from ragas.run_config import RunConfig
 
@@ -75,6 +75,9 @@ class HaystackEmbeddingsWrapper(BaseRagasEmbeddings):
             run_config = RunConfig()
         self.set_run_config(run_config)
 
+    def model_fingerprint(self) -> str:
+        return fingerprint_model(self.embedder)
+
     def embed_query(self, text: str) -> t.List[float]:
         result = self.embedder.run(text=text)
         embedding = result["embedding"]
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ragas.cache import CacheInterface
+from ragas.embeddings.base import DEFAULT_MODEL_NAME, BaseRagasEmbeddings
+from ragas.run_config import RunConfig
+
+
+class OnnxEmbeddings(BaseRagasEmbeddings):
+    """
+    Local embeddings computed on CPU with an ONNX export of a sentence embedding
+    model, without torch or any network calls once the model is downloaded.
+
+    Texts are sorted by length and split into batches so that little padding is
+    needed, and the batches are run concurrently in a thread pool (onnxruntime
+    releases the GIL). Embeddings are pooled, L2 normalised and returned as float32
+    arrays by `encode`.
+
+    Parameters
+    ----------
+    model_name : str, optional
+        Hugging Face Hub repository to download the model from, by default
+        DEFAULT_MODEL_NAME ("BAAI/bge-small-en-v1.5").
+    model_path : str, optional
+        Local directory containing the ONNX file and `tokenizer.json`. If given,
+        nothing is downloaded.
+    file_name : str, optional
+        Path of the ONNX file inside the repository or `model_path`, by default
+        "onnx/model.onnx". Point it to a quantized export, e.g.
+        "onnx/model_quantized.onnx", for faster inference.
+    pooling : str, optional
+        How token embeddings are pooled, "cls" (used by the BGE models) or "mean",
+        by default "cls".
+    batch_size : int, optional
+        Maximum number of texts run through the model at once, by default 32.
+    max_length : int, optional
+        Texts are truncated to this many tokens, by default 512.
+    num_workers : int, optional
+        Number of batches run concurrently, by default 2.
+    intra_op_num_threads : int, optional
+        Threads used by onnxruntime within one batch, by default the number of CPU
+        cores divided by `num_workers`.
+    run_config : RunConfig, optional
+        A configuration object to manage embedding execution settings, by default None.
+    cache : CacheInterface, optional
+        A cache instance for storing and retrieving embedding results, by default None.
+
+    Notes
+    -----
+    This class requires the `onnxruntime`, `tokenizers` and `huggingface_hub`
+    packages to be installed.
+
+    Examples
+    --------
+    >>> embeddings = OnnxEmbeddings(file_name="onnx/model_quantized.onnx")
+    >>> vectors = embeddings.encode(["Paris is the capital of France."])
+    >>> vectors.dtype, vectors.shape
+    (dtype('float32'), (1, 384))
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        model_path: t.Optional[str] = None,
+        file_name: str = "onnx/model.onnx",
+        pooling: t.Literal["cls", "mean"] = "cls",
+        batch_size: int = 32,
+        max_length: int = 512,
+        num_workers: int = 2,
+        intra_op_num_threads: t.Optional[int] = None,
+        run_config: t.Optional[RunConfig] = None,
+        cache: t.Optional[CacheInterface] = None,
+    ):
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as exc:
+            raise ImportError(
+                "onnxruntime or tokenizers is not installed. Please install them "
+                "with `pip install onnxruntime tokenizers`."
+            ) from exc
+        if pooling not in ("cls", "mean"):
+            raise ValueError(f"pooling must be 'cls' or 'mean', got '{pooling}'")
+
+        super().__init__(cache=cache)
+        self.model_name = model_name
+        self.file_name = file_name
+        self.pooling = pooling
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.num_workers = num_workers
+
+        if model_path is None:
+            try:
+                from huggingface_hub import hf_hub_download
+            except ImportError as exc:
+                raise ImportError(
+                    "huggingface_hub is needed to download the model. Please "
+                    "install it with `pip install huggingface_hub` or pass "
+                    "`model_path`."
+                ) from exc
+            onnx_file = hf_hub_download(model_name, file_name)
+            tokenizer_file = hf_hub_download(model_name, "tokenizer.json")
+        else:
+            onnx_file = os.path.join(model_path, file_name)
+            tokenizer_file = os.path.join(model_path, "tokenizer.json")
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_file)
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = intra_op_num_threads or max(
+            1, (os.cpu_count() or 1) // num_workers
+        )
+        self.session = onnxruntime.InferenceSession(
+            onnx_file, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self._executor = ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="ragas-onnx"
+        )
+
+        if run_config is None:
+            run_config = RunConfig()
+        self.set_run_config(run_config)
+
+    def _encode_batch(self, texts: t.List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        hidden = self.session.run(None, inputs)[0].astype(np.float32, copy=False)
+        if self.pooling == "cls":
+            pooled = hidden[:, 0]
+        else:
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.maximum(norms, 1e-12)
+
+    def _batches(self, texts: t.List[str]) -> t.List[np.ndarray]:
+        # batching texts of similar length keeps the padding small
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        return [
+            order[i : i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+
+    def encode(self, texts: t.List[str]) -> np.ndarray:
+        """
+        Embed texts into a float32 array of shape (len(texts), dimension).
+        """
+        batches = self._batches(texts)
+        results = self._executor.map(
+            lambda batch: self._encode_batch([texts[i] for i in batch]), batches
+        )
+        return self._merge(len(texts), batches, list(results))
+
+    async def aencode(self, texts: t.List[str]) -> np.ndarray:
+        """
+        Embed texts into a float32 array without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        batches = self._batches(texts)
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    self._executor, self._encode_batch, [texts[i] for i in batch]
+                )
+                for batch in batches
+            ]
+        )
+        return self._merge(len(texts), batches, list(results))
+
+    @staticmethod
+    def _merge(
+        n: int, batches: t.List[np.ndarray], results: t.List[np.ndarray]
+    ) -> np.ndarray:
+        if not results:
+            return np.empty((0, 0), dtype=np.float32)
+        out = np.empty((n, results[0].shape[1]), dtype=np.float32)
+        for batch, embeddings in zip(batches, results):
+            out[batch] = embeddings
+        return out
+
+    def embed_query(self, text: str) -> t.List[float]:
+        return self.encode([text])[0].tolist()
+
+    def embed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        return self.encode(texts).tolist()
+
+    async def aembed_query(self, text: str) -> t.List[float]:
+        return (await self.aencode([text]))[0].tolist()
+
+    async def aembed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        return (await self.aencode(texts)).tolist()
+
+    async def _embed_texts_array(
+        self, texts: t.List[str], is_async: bool = True
+    ) -> np.ndarray:
+        if self.cache is not None:
+            # the cache stores the results of embed_documents/aembed_documents
+            return await super()._embed_texts_array(texts, is_async=is_async)
+        return await self.aencode(texts)
+
+    def __del__(self):
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=False)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(model_name={self.model_name}, file_name={self.file_name})"
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import typing as t
+from dataclasses import dataclass, field
 from uuid import UUID
 
+import numpy as np
 from datasets import Dataset
-from langchain_core.callbacks import BaseCallbackHandler, BaseCallbackManager
+from langchain_core.callbacks import (
+    BaseCallbackHandler,
+    BaseCallbackManager,
+    CallbackManagerForChainGroup,
+    CallbackManagerForChainRun,
+)
 from langchain_core.embeddings import Embeddings as LangchainEmbeddings
 from langchain_core.language_models import BaseLanguageModel as LangchainLLM
 from tqdm.auto import tqdm
 
 from ragas._analytics import track_was_completed
 from ragas.callbacks import ChainType, RagasTracer, new_group
+from ragas.checkpoint import EvaluationCheckpoint, dataset_fingerprint
 from ragas.dataset_schema import (
     EvaluationDataset,
     EvaluationResult,
@@ -24,6 +32,7 @@ from ragas.embeddings.base import (
 )
 from ragas.exceptions import ExceptionInRunner
 from ragas.executor import Executor
+from ragas.executor import run as run_coroutine
 from ragas.integrations.helicone import helicone_config
 from ragas.llms import llm_factory
 from ragas.llms.base import BaseRagasLLM, LangchainLLMWrapper
@@ -67,6 +76,8 @@ def evaluate(
     column_map: t.Optional[t.Dict[str, str]] = None,
     show_progress: bool = True,
     batch_size: t.Optional[int] = None,
+    checkpoint: t.Optional[EvaluationCheckpoint] = None,
+    precompute_embeddings: bool = False,
     _run_id: t.Optional[UUID] = None,
     _pbar: t.Optional[tqdm] = None,
 ) -> EvaluationResult:
@@ -108,7 +119,17 @@ def evaluate(
     show_progress : bool, optional
         Whether to show the progress bar during evaluation. If set to False, the progress bar will be disabled. The default is True.
     batch_size : int, optional
-        How large the batches should be. If set to None (default), no batching is done.
+        How large the batches should be. If set, at most `batch_size` jobs are in
+        flight at once and a slot is refilled as soon as a job finishes. If set to
+        None (default), no batching is done.
+    checkpoint : EvaluationCheckpoint, optional
+        Checkpoint store to which every finished score is appended as soon as its
+        job completes. If the evaluation is restarted with the same checkpoint and
+        dataset, the scores already stored are reused and their jobs are skipped.
+    precompute_embeddings : bool, optional
+        Whether to embed the texts that the embedding based metrics need for the
+        whole dataset up front, in large batches of unique texts, and serve the
+        metrics from those embeddings during the run. Default is False.
 
     Returns
     -------
@@ -141,6 +162,396 @@ def evaluate(
     'answer_relevancy': 0.874}
     ```
     """
+    run = _init_evaluation(
+        dataset=dataset,
+        metrics=metrics,
+        llm=llm,
+        embeddings=embeddings,
+        experiment_name=experiment_name,
+        callbacks=callbacks,
+        run_config=run_config,
+        token_usage_parser=token_usage_parser,
+        raise_exceptions=raise_exceptions,
+        column_map=column_map,
+        show_progress=show_progress,
+        batch_size=batch_size,
+        checkpoint=checkpoint,
+        precompute_embeddings=precompute_embeddings,
+        _pbar=_pbar,
+    )
+    try:
+        if precompute_embeddings:
+            run_coroutine(run.aprecompute_embeddings())
+        # get the results
+        results = run.executor.results()
+        if results == [] and not run.restored_rows:
+            raise ExceptionInRunner()
+
+        # convert results to dataset_like
+        for job_index, value in enumerate(results):
+            run.complete_job(job_index, value)
+
+    # run evaluation task
+    except Exception as e:
+        run.on_error(e)
+        raise e
+    else:
+        # evalution run was successful
+        # now lets process the results
+        result = run.to_result(run_id=_run_id)
+    finally:
+        run.reset()
+
+    return result
+
+
+async def aevaluate(
+    dataset: t.Union[Dataset, EvaluationDataset],
+    metrics: t.Optional[t.Sequence[Metric]] = None,
+    llm: t.Optional[BaseRagasLLM | LangchainLLM] = None,
+    embeddings: t.Optional[BaseRagasEmbeddings | LangchainEmbeddings] = None,
+    experiment_name: t.Optional[str] = None,
+    callbacks: Callbacks = None,
+    run_config: t.Optional[RunConfig] = None,
+    token_usage_parser: t.Optional[TokenUsageParser] = None,
+    raise_exceptions: bool = False,
+    column_map: t.Optional[t.Dict[str, str]] = None,
+    show_progress: bool = True,
+    batch_size: t.Optional[int] = None,
+    checkpoint: t.Optional[EvaluationCheckpoint] = None,
+    precompute_embeddings: bool = False,
+    _run_id: t.Optional[UUID] = None,
+    _pbar: t.Optional[tqdm] = None,
+) -> EvaluationResult:
+    """
+    Async version of `evaluate` that schedules the jobs on the caller's running
+    event loop, e.g. inside an async web service, instead of starting a new one.
+
+    Takes the same parameters and returns the same `EvaluationResult` as
+    `evaluate`. Cancelling the returned coroutine cancels all in-flight jobs.
+
+    Examples
+    --------
+    ```
+    from ragas import aevaluate
+
+    >>> result = await aevaluate(dataset)
+    >>> print(result)
+    {'context_precision': 0.817,
+    'faithfulness': 0.892,
+    'answer_relevancy': 0.874}
+    ```
+    """
+    run = _init_evaluation(
+        dataset=dataset,
+        metrics=metrics,
+        llm=llm,
+        embeddings=embeddings,
+        experiment_name=experiment_name,
+        callbacks=callbacks,
+        run_config=run_config,
+        token_usage_parser=token_usage_parser,
+        raise_exceptions=raise_exceptions,
+        column_map=column_map,
+        show_progress=show_progress,
+        batch_size=batch_size,
+        checkpoint=checkpoint,
+        precompute_embeddings=precompute_embeddings,
+        _pbar=_pbar,
+    )
+    try:
+        async for _ in run.astream_rows():
+            pass
+    except Exception as e:
+        run.on_error(e)
+        raise e
+    else:
+        result = run.to_result(run_id=_run_id)
+    finally:
+        run.reset()
+
+    return result
+
+
+async def aevaluate_iter(
+    dataset: t.Union[Dataset, EvaluationDataset],
+    metrics: t.Optional[t.Sequence[Metric]] = None,
+    llm: t.Optional[BaseRagasLLM | LangchainLLM] = None,
+    embeddings: t.Optional[BaseRagasEmbeddings | LangchainEmbeddings] = None,
+    experiment_name: t.Optional[str] = None,
+    callbacks: Callbacks = None,
+    run_config: t.Optional[RunConfig] = None,
+    token_usage_parser: t.Optional[TokenUsageParser] = None,
+    raise_exceptions: bool = False,
+    column_map: t.Optional[t.Dict[str, str]] = None,
+    show_progress: bool = True,
+    batch_size: t.Optional[int] = None,
+    checkpoint: t.Optional[EvaluationCheckpoint] = None,
+    precompute_embeddings: bool = False,
+    _run_id: t.Optional[UUID] = None,
+    _pbar: t.Optional[tqdm] = None,
+) -> t.AsyncIterator[t.Tuple[int, t.Dict[str, t.Any]]]:
+    """
+    Evaluate the dataset like `evaluate`, but yield the scores of each row as soon
+    as all of its metrics have finished.
+
+    Takes the same parameters as `evaluate`. Rows are yielded as
+    `(row_index, scores)` tuples in completion order, where `scores` maps each
+    metric name to its score for that row.
+
+    Examples
+    --------
+    ```
+    from ragas import aevaluate_iter
+
+    >>> async for row_index, scores in aevaluate_iter(dataset, metrics=[faithfulness]):
+    ...     print(row_index, scores)
+    3 {'faithfulness': 0.5}
+    0 {'faithfulness': 1.0}
+    ```
+    """
+    run = _init_evaluation(
+        dataset=dataset,
+        metrics=metrics,
+        llm=llm,
+        embeddings=embeddings,
+        experiment_name=experiment_name,
+        callbacks=callbacks,
+        run_config=run_config,
+        token_usage_parser=token_usage_parser,
+        raise_exceptions=raise_exceptions,
+        column_map=column_map,
+        show_progress=show_progress,
+        batch_size=batch_size,
+        checkpoint=checkpoint,
+        precompute_embeddings=precompute_embeddings,
+        _pbar=_pbar,
+    )
+    rows = run.astream_rows()
+    try:
+        async for row in rows:
+            yield row
+        # close the evaluation chain with the assembled scores
+        run.to_result(run_id=_run_id)
+    except Exception as e:
+        run.on_error(e)
+        raise e
+    finally:
+        # cancels the jobs still running if the caller stopped early
+        await rows.aclose()
+        run.reset()
+
+
+@dataclass
+class _EvaluationRun:
+    """
+    State of a single evaluation run: the executor holding one job per
+    (row, metric), the row chains used for tracing and the bookkeeping needed to
+    assemble the scores and restore the metrics afterwards.
+    """
+
+    dataset: EvaluationDataset
+    metrics: t.Sequence[Metric]
+    executor: Executor
+    tracer: RagasTracer
+    ragas_callbacks: t.Dict[str, BaseCallbackHandler]
+    binary_metrics: t.List[str]
+    evaluation_rm: CallbackManagerForChainRun
+    evaluation_group_cm: CallbackManagerForChainGroup
+    row_run_managers: t.List[
+        t.Tuple[CallbackManagerForChainRun, CallbackManagerForChainGroup]
+    ] = field(default_factory=list)
+    # job index -> (row index, score key)
+    job_keys: t.List[t.Tuple[int, str]] = field(default_factory=list)
+    scores: t.List[t.Dict[str, t.Any]] = field(default_factory=list)
+    pending_jobs: t.List[int] = field(default_factory=list)
+    llm_changed: t.List[int] = field(default_factory=list)
+    embeddings_changed: t.List[int] = field(default_factory=list)
+    answer_correctness_is_set: int = -1
+    checkpoint: t.Optional[EvaluationCheckpoint] = None
+    fingerprint: str = ""
+    # (row index, score key) -> score restored from the checkpoint
+    restored: t.Dict[t.Tuple[int, str], t.Any] = field(default_factory=dict)
+    # rows whose scores were all restored from the checkpoint
+    restored_rows: t.List[int] = field(default_factory=list)
+    # id of the embeddings -> (embeddings, unique texts to embed up front)
+    texts_to_embed: t.Dict[int, t.Tuple[BaseRagasEmbeddings, t.Dict[str, None]]] = (
+        field(default_factory=dict)
+    )
+    # embeddings whose precomputed vectors this run holds
+    precomputed: t.List[BaseRagasEmbeddings] = field(default_factory=list)
+
+    def submit(
+        self,
+        row_index: int,
+        key: str,
+        callable: t.Callable,
+        *args,
+        name: t.Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Submit the job computing `key` for row `row_index` to the executor, unless
+        its score was restored from the checkpoint.
+        """
+        if (row_index, key) in self.restored:
+            self.scores[row_index][key] = self.restored[(row_index, key)]
+            return
+
+        if self.checkpoint is not None:
+            callable = self._checkpointed(callable, row_index, key)
+        self.job_keys.append((row_index, key))
+        self.scores[row_index][key] = np.nan
+        self.pending_jobs[row_index] += 1
+        self.executor.submit(callable, *args, name=name, **kwargs)
+
+    def _checkpointed(
+        self, callable: t.Callable, row_index: int, key: str
+    ) -> t.Callable:
+        checkpoint = t.cast(EvaluationCheckpoint, self.checkpoint)
+
+        async def checkpointed_callable(*args, **kwargs):
+            value = await callable(*args, **kwargs)
+            checkpoint.record(self.fingerprint, row_index, key, value)
+            return value
+
+        return checkpointed_callable
+
+    def collect_texts_to_embed(
+        self,
+        row_index: int,
+        sample: t.Union[SingleTurnSample, MultiTurnSample],
+        metrics: t.Sequence[Metric],
+    ) -> None:
+        """Collect the texts that the metrics scoring a row will embed."""
+        for metric in metrics:
+            if (
+                not isinstance(metric, MetricWithEmbeddings)
+                or metric.embeddings is None
+            ):
+                continue
+            if (row_index, _score_key(metric)) in self.restored:
+                continue
+            texts = metric.texts_to_embed(sample)
+            if texts:
+                _, unique_texts = self.texts_to_embed.setdefault(
+                    id(metric.embeddings), (metric.embeddings, {})
+                )
+                unique_texts.update(dict.fromkeys(texts))
+
+    async def aprecompute_embeddings(self) -> None:
+        """Embed the collected texts in bulk before the metrics are scored."""
+        for embeddings, texts in self.texts_to_embed.values():
+            # other runs may share the embeddings, so the vectors are released
+            # instead of cleared once this run is done
+            self.precomputed.append(embeddings)
+            await embeddings.precompute(texts)
+
+    def end_row(self, row_index: int) -> None:
+        """Close the chain of a row whose scores are all available."""
+        row_rm, row_group_cm = self.row_run_managers[row_index]
+        if not row_group_cm.ended:
+            row_rm.on_chain_end(self.scores[row_index])
+
+    def complete_job(self, job_index: int, value: t.Any) -> t.Optional[int]:
+        """
+        Record the result of a job. If it was the last pending job of its row,
+        the row chain is closed and the row index is returned.
+        """
+        row_index, key = self.job_keys[job_index]
+        self.scores[row_index][key] = value
+        self.pending_jobs[row_index] -= 1
+        if self.pending_jobs[row_index] > 0:
+            return None
+
+        self.end_row(row_index)
+        return row_index
+
+    async def astream_rows(
+        self,
+    ) -> t.AsyncIterator[t.Tuple[int, t.Dict[str, t.Any]]]:
+        """Run the jobs and yield `(row_index, scores)` as each row completes."""
+        if not self.executor.jobs and not self.restored_rows:
+            raise ExceptionInRunner()
+        await self.aprecompute_embeddings()
+        for row_index in self.restored_rows:
+            yield row_index, self.scores[row_index]
+        results = self.executor.astream()
+        try:
+            async for job_index, value in results:
+                row_index = self.complete_job(job_index, value)
+                if row_index is not None:
+                    yield row_index, self.scores[row_index]
+        finally:
+            await results.aclose()
+
+    def to_result(self, run_id: t.Optional[UUID] = None) -> EvaluationResult:
+        """Assemble the `EvaluationResult` and close the evaluation chain."""
+        cost_cb = self.ragas_callbacks.get("cost_cb")
+        result = EvaluationResult(
+            scores=self.scores,
+            dataset=self.dataset,
+            binary_columns=self.binary_metrics,
+            cost_cb=t.cast(
+                t.Union["CostCallbackHandler", None],
+                cost_cb,
+            ),
+            ragas_traces=self.tracer.traces,
+            run_id=run_id,
+        )
+        if not self.evaluation_group_cm.ended:
+            self.evaluation_rm.on_chain_end({"scores": result.scores})
+        return result
+
+    def on_error(self, e: BaseException) -> None:
+        if not self.evaluation_group_cm.ended:
+            self.evaluation_rm.on_chain_error(e)
+
+    def reset(self) -> None:
+        # reset llms and embeddings if changed
+        for i in self.llm_changed:
+            t.cast(MetricWithLLM, self.metrics[i]).llm = None
+        for i in self.embeddings_changed:
+            t.cast(MetricWithEmbeddings, self.metrics[i]).embeddings = None
+        if self.answer_correctness_is_set != -1:
+            t.cast(
+                AnswerCorrectness, self.metrics[self.answer_correctness_is_set]
+            ).answer_similarity = None
+
+        for embeddings in self.precomputed:
+            embeddings.release_precomputed()
+        self.precomputed.clear()
+
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+
+        # flush the analytics batcher
+        from ragas._analytics import _analytics_batcher
+
+        _analytics_batcher.flush()
+
+
+def _init_evaluation(
+    dataset: t.Union[Dataset, EvaluationDataset],
+    metrics: t.Optional[t.Sequence[Metric]],
+    llm: t.Optional[BaseRagasLLM | LangchainLLM],
+    embeddings: t.Optional[BaseRagasEmbeddings | LangchainEmbeddings],
+    experiment_name: t.Optional[str],
+    callbacks: Callbacks,
+    run_config: t.Optional[RunConfig],
+    token_usage_parser: t.Optional[TokenUsageParser],
+    raise_exceptions: bool,
+    column_map: t.Optional[t.Dict[str, str]],
+    show_progress: bool,
+    batch_size: t.Optional[int],
+    checkpoint: t.Optional[EvaluationCheckpoint],
+    precompute_embeddings: bool,
+    _pbar: t.Optional[tqdm],
+) -> _EvaluationRun:
+    """
+    Validate the inputs, initialise the metrics and submit one job per
+    (row, metric) to a new executor.
+    """
     column_map = column_map or {}
     callbacks = callbacks or []
     run_config = run_config or RunConfig()
@@ -243,7 +654,6 @@ def evaluate(
             callbacks.append(cb)
 
     # new evaluation chain
-    row_run_managers = []
     evaluation_rm, evaluation_group_cm = new_group(
         name=experiment_name or RAGAS_EVALUATION_CHAIN_NAME,
         inputs={},
@@ -251,6 +661,24 @@ def evaluate(
         metadata={"type": ChainType.EVALUATION},
     )
 
+    run = _EvaluationRun(
+        dataset=dataset,
+        metrics=metrics,
+        executor=executor,
+        tracer=tracer,
+        ragas_callbacks=ragas_callbacks,
+        binary_metrics=binary_metrics,
+        evaluation_rm=evaluation_rm,
+        evaluation_group_cm=evaluation_group_cm,
+        llm_changed=llm_changed,
+        embeddings_changed=embeddings_changed,
+        answer_correctness_is_set=answer_correctness_is_set,
+        checkpoint=checkpoint,
+    )
+    if checkpoint is not None:
+        run.fingerprint = dataset_fingerprint(dataset)
+        run.restored = checkpoint.load(run.fingerprint)
+
     sample_type = dataset.get_sample_type()
     for i, sample in enumerate(dataset):
         row = t.cast(t.Dict[str, t.Any], sample.model_dump())
@@ -260,93 +688,48 @@ def evaluate(
             callbacks=evaluation_group_cm,
             metadata={"type": ChainType.ROW, "row_index": i},
         )
-        row_run_managers.append((row_rm, row_group_cm))
+        run.row_run_managers.append((row_rm, row_group_cm))
+        run.scores.append({})
+        run.pending_jobs.append(0)
         if sample_type == SingleTurnSample:
-            _ = [
-                executor.submit(
+            row_metrics = [m for m in metrics if isinstance(m, SingleTurnMetric)]
+            for metric in row_metrics:
+                run.submit(
+                    i,
+                    _score_key(metric),
                     metric.single_turn_ascore,
                     sample,
                     row_group_cm,
                     name=f"{metric.name}-{i}",
                     timeout=run_config.timeout,
                 )
-                for metric in metrics
-                if isinstance(metric, SingleTurnMetric)
-            ]
         elif sample_type == MultiTurnSample:
-            _ = [
-                executor.submit(
+            row_metrics = [m for m in metrics if isinstance(m, MultiTurnMetric)]
+            for metric in row_metrics:
+                run.submit(
+                    i,
+                    _score_key(metric),
                     metric.multi_turn_ascore,
                     sample,
                     row_group_cm,
                     name=f"{metric.name}-{i}",
                     timeout=run_config.timeout,
                 )
-                for metric in metrics
-                if isinstance(metric, MultiTurnMetric)
-            ]
         else:
             raise ValueError(f"Unsupported sample type {sample_type}")
 
-    scores: t.List[t.Dict[str, t.Any]] = []
-    try:
-        # get the results
-        results = executor.results()
-        if results == []:
-            raise ExceptionInRunner()
+        if precompute_embeddings:
+            run.collect_texts_to_embed(i, sample, row_metrics)
 
-        # convert results to dataset_like
-        for i, _ in enumerate(dataset):
-            s = {}
-            for j, m in enumerate(metrics):
-                if isinstance(m, ModeMetric):  # type: ignore
-                    key = f"{m.name}(mode={m.mode})"
-                else:
-                    key = m.name
-                s[key] = results[len(metrics) * i + j]
-            scores.append(s)
-            # close the row chain
-            row_rm, row_group_cm = row_run_managers[i]
-            if not row_group_cm.ended:
-                row_rm.on_chain_end(s)
+        if run.pending_jobs[i] == 0:
+            # every score of this row was restored from the checkpoint
+            run.restored_rows.append(i)
+            run.end_row(i)
 
-    # run evaluation task
-    except Exception as e:
-        if not evaluation_group_cm.ended:
-            evaluation_rm.on_chain_error(e)
+    return run
 
-        raise e
-    else:
-        # evalution run was successful
-        # now lets process the results
-        cost_cb = ragas_callbacks["cost_cb"] if "cost_cb" in ragas_callbacks else None
-        result = EvaluationResult(
-            scores=scores,
-            dataset=dataset,
-            binary_columns=binary_metrics,
-            cost_cb=t.cast(
-                t.Union["CostCallbackHandler", None],
-                cost_cb,
-            ),
-            ragas_traces=tracer.traces,
-            run_id=_run_id,
-        )
-        if not evaluation_group_cm.ended:
-            evaluation_rm.on_chain_end({"scores": result.scores})
-    finally:
-        # reset llms and embeddings if changed
-        for i in llm_changed:
-            t.cast(MetricWithLLM, metrics[i]).llm = None
-        for i in embeddings_changed:
-            t.cast(MetricWithEmbeddings, metrics[i]).embeddings = None
-        if answer_correctness_is_set != -1:
-            t.cast(
-                AnswerCorrectness, metrics[answer_correctness_is_set]
-            ).answer_similarity = None
 
-        # flush the analytics batcher
-        from ragas._analytics import _analytics_batcher
-
-        _analytics_batcher.flush()
-
-    return result
+def _score_key(metric: Metric) -> str:
+    if isinstance(metric, ModeMetric):  # type: ignore
+        return f"{metric.name}(mode={metric.mode})"
+    return metric.name
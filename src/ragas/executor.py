@@ -3,20 +3,20 @@ from __future__ import annotations
 import asyncio
 import logging
 import typing as t
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 
-import nest_asyncio
 import numpy as np
 from tqdm.auto import tqdm
 
 from ragas.run_config import RunConfig
-from ragas.utils import batched
-
-nest_asyncio.apply()
 
 logger = logging.getLogger(__name__)
 
 
+T = t.TypeVar("T")
+
+
 def is_event_loop_running() -> bool:
     """
     Check if an event loop is currently running.
@@ -29,6 +29,29 @@ def is_event_loop_running() -> bool:
         return loop.is_running()
 
 
+def run(coroutine: t.Coroutine[t.Any, t.Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    If an event loop is already running (e.g. in Jupyter), nest_asyncio is applied
+    first so that the coroutine can be run re-entrantly. Async callers should await
+    the coroutine directly instead, which leaves the running loop untouched.
+    """
+    if is_event_loop_running():
+        # an event loop is running so call nested_asyncio to fix this
+        try:
+            import nest_asyncio
+        except ImportError as e:
+            raise ImportError(
+                "It seems like your running this in a jupyter-like environment. "
+                "Please install nest_asyncio with `pip install nest_asyncio` to make it work."
+            ) from e
+        else:
+            nest_asyncio.apply()
+
+    return asyncio.run(coroutine)
+
+
 async def as_completed(
     coroutines: t.List[t.Coroutine], max_workers: int
 ) -> t.Iterator[asyncio.Future]:
@@ -51,6 +74,46 @@ async def as_completed(
     return asyncio.as_completed(tasks)
 
 
+async def as_completed_stream(
+    coroutines: t.Iterable[t.Awaitable], max_workers: int
+) -> t.AsyncIterator[t.Any]:
+    """
+    Run coroutines pulled lazily from an iterable in a bounded worker pool.
+
+    At most `max_workers` coroutines are in flight at any time (unbounded if
+    `max_workers` is -1), and the next one is only pulled from the iterable once
+    a slot frees up, so passing a generator keeps peak memory independent of the
+    number of jobs. Results are yielded in completion order. Closing the generator
+    cancels the coroutines still in flight and waits for them to finish.
+    """
+    iterator = iter(coroutines)
+    pending: t.Set[asyncio.Future] = set()
+
+    def fill():
+        while max_workers <= 0 or len(pending) < max_workers:
+            try:
+                coro = next(iterator)
+            except StopIteration:
+                return
+            pending.add(asyncio.ensure_future(coro))
+
+    try:
+        fill()
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            # refill the freed slots before handing results back to the caller
+            fill()
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
 @dataclass
 class Executor:
     """
@@ -69,11 +132,11 @@ class Executor:
     raise_exceptions : bool
         Whether to raise exceptions or log them
     batch_size : int
-        Whether to batch (large) lists of tasks
+        Number of jobs kept in flight at once (capped by `run_config.max_workers`).
+        A finished job's slot is refilled immediately, and progress is reported
+        per group of `batch_size` completed jobs
     run_config : RunConfig
         Configuration for the run
-    _nest_asyncio_applied : bool
-        Whether nest_asyncio has been applied
     """
 
     desc: str = "Evaluating"
@@ -83,7 +146,6 @@ class Executor:
     raise_exceptions: bool = False
     batch_size: t.Optional[int] = None
     run_config: t.Optional[RunConfig] = field(default=None, repr=False)
-    _nest_asyncio_applied: bool = field(default=False, repr=False)
     pbar: t.Optional[tqdm] = None
 
     def wrap_callable_with_index(
@@ -125,31 +187,49 @@ class Executor:
         callable_with_index = self.wrap_callable_with_index(callable, len(self.jobs))
         self.jobs.append((callable_with_index, args, kwargs, name))
 
-    async def _process_jobs(self) -> t.List[t.Any]:
-        """Execute jobs with optional progress tracking."""
+    def _job_coroutines(self, jobs: t.Iterable[t.Tuple]) -> t.Iterator[t.Coroutine]:
+        """Lazily create the coroutine for each job as the worker pool asks for it."""
+        return (afunc(*args, **kwargs) for afunc, args, kwargs, _ in jobs)
+
+    async def astream(self) -> t.AsyncIterator[t.Tuple[int, t.Any]]:
+        """
+        Execute all submitted jobs and yield `(job_index, result)` tuples in
+        completion order.
+
+        Jobs are pulled lazily into a worker pool bounded by
+        `RunConfig.max_workers`, so no more than that many coroutines exist at
+        once. Use `results()` to get all results ordered by submission instead.
+        """
         max_workers = (self.run_config or RunConfig()).max_workers
-        results = []
 
         if not self.batch_size:
             # Use external progress bar if provided, otherwise create one
             if self.pbar is None:
-                with tqdm(
+                pbar_cm = tqdm(
                     total=len(self.jobs),
                     desc=self.desc,
                     disable=not self.show_progress,
-                ) as internal_pbar:
-                    await self._process_coroutines(
-                        self.jobs, internal_pbar, results, max_workers
-                    )
-            else:
-                await self._process_coroutines(
-                    self.jobs, self.pbar, results, max_workers
                 )
-
-            return results
-
-        # With batching, show nested progress bars
-        batches = batched(self.jobs, self.batch_size)  # generator of job tuples
+            else:
+                pbar_cm = nullcontext(self.pbar)
+
+            stream = as_completed_stream(self._job_coroutines(self.jobs), max_workers)
+            with pbar_cm as pbar:
+                try:
+                    async for result in stream:
+                        pbar.update(1)
+                        yield result
+                finally:
+                    await stream.aclose()
+            return
+
+        # With batching, keep a sliding window of `batch_size` jobs in flight and
+        # refill a slot as soon as one completes instead of waiting for the
+        # slowest job of each batch. Batches are still reported as groups of
+        # `batch_size` completed jobs in the nested progress bar.
+        window = (
+            self.batch_size if max_workers <= 0 else min(self.batch_size, max_workers)
+        )
         n_batches = (len(self.jobs) + self.batch_size - 1) // self.batch_size
 
         with (
@@ -168,62 +248,62 @@ class Executor:
                 leave=False,
             ) as batch_pbar,
         ):
-            for i, batch in enumerate(batches, 1):
-                batch_pbar.reset(total=len(batch))
-                batch_pbar.set_description(f"Batch {i}/{n_batches}")
-
-                # Create coroutines per batch
-                coroutines = [
-                    afunc(*args, **kwargs) for afunc, args, kwargs, _ in batch
-                ]
-                for future in await as_completed(coroutines, max_workers):
-                    result = await future
-                    results.append(result)
+            n_completed = 0
+            stream = as_completed_stream(self._job_coroutines(self.jobs), window)
+            try:
+                async for result in stream:
+                    n_completed += 1
                     overall_pbar.update(1)
                     batch_pbar.update(1)
+                    if n_completed % self.batch_size == 0 and n_completed < len(
+                        self.jobs
+                    ):
+                        batch_pbar.reset(
+                            total=min(self.batch_size, len(self.jobs) - n_completed)
+                        )
+                        batch_pbar.set_description(
+                            f"Batch {n_completed // self.batch_size + 1}/{n_batches}"
+                        )
+                    yield result
+            finally:
+                await stream.aclose()
 
-        return results
-
-    async def _process_coroutines(self, jobs, pbar, results, max_workers):
-        """Helper function to process coroutines and update the progress bar."""
-        coroutines = [afunc(*args, **kwargs) for afunc, args, kwargs, _ in jobs]
-        for future in await as_completed(coroutines, max_workers):
-            result = await future
-            results.append(result)
-            pbar.update(1)
+    async def _process_jobs(self) -> t.List[t.Any]:
+        """Execute jobs with optional progress tracking."""
+        return [result async for result in self.astream()]
 
     def results(self) -> t.List[t.Any]:
         """
         Execute all submitted jobs and return their results. The results are returned in the order of job submission.
         """
-        if is_event_loop_running():
-            # an event loop is running so call nested_asyncio to fix this
-            try:
-                import nest_asyncio
-            except ImportError as e:
-                raise ImportError(
-                    "It seems like your running this in a jupyter-like environment. "
-                    "Please install nest_asyncio with `pip install nest_asyncio` to make it work."
-                ) from e
-            else:
-                if not self._nest_asyncio_applied:
-                    nest_asyncio.apply()
-                    self._nest_asyncio_applied = True
+        results = run(self._process_jobs())
+        return self.order_results(results)
+
+    async def aresults(self) -> t.List[t.Any]:
+        """
+        Execute all submitted jobs on the running event loop and return their
+        results in the order of job submission.
+        """
+        results = await self._process_jobs()
+        return self.order_results(results)
 
-        results = asyncio.run(self._process_jobs())
-        sorted_results = sorted(results, key=lambda x: x[0])
-        return [r[1] for r in sorted_results]
+    def order_results(self, results: t.Iterable[t.Tuple[int, t.Any]]) -> t.List[t.Any]:
+        """
+        Re-order `(job_index, result)` tuples, as yielded by `astream()`, into a
+        list ordered by job submission.
+        """
+        ordered: t.List[t.Any] = [np.nan] * len(self.jobs)
+        for index, result in results:
+            ordered[index] = result
+        return ordered
 
 
-def run_async_batch(
+def _batch_executor(
     desc: str,
     func: t.Callable,
     kwargs_list: t.List[t.Dict],
     batch_size: t.Optional[int] = None,
-):
-    """
-    Provide functionality to run the same async function with different arguments in parallel.
-    """
+) -> Executor:
     run_config = RunConfig()
     executor = Executor(
         desc=desc,
@@ -236,4 +316,28 @@ def run_async_batch(
     for kwargs in kwargs_list:
         executor.submit(func, **kwargs)
 
-    return executor.results()
+    return executor
+
+
+def run_async_batch(
+    desc: str,
+    func: t.Callable,
+    kwargs_list: t.List[t.Dict],
+    batch_size: t.Optional[int] = None,
+):
+    """
+    Provide functionality to run the same async function with different arguments in parallel.
+    """
+    return _batch_executor(desc, func, kwargs_list, batch_size).results()
+
+
+async def arun_async_batch(
+    desc: str,
+    func: t.Callable,
+    kwargs_list: t.List[t.Dict],
+    batch_size: t.Optional[int] = None,
+):
+    """
+    Async version of `run_async_batch` that runs on the caller's event loop.
+    """
+    return await _batch_executor(desc, func, kwargs_list, batch_size).aresults()
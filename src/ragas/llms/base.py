@@ -13,9 +13,10 @@ from langchain_openai.chat_models import AzureChatOpenAI, ChatOpenAI
 from langchain_openai.llms import AzureOpenAI, OpenAI
 from langchain_openai.llms.base import BaseOpenAI
 
-from ragas.cache import CacheInterface, cacher
+from ragas.cache import CacheInterface, cacher, fingerprint_model
 from ragas.exceptions import LLMDidNotFinishException
 from ragas.integrations.helicone import helicone_config
+from ragas.rate_limiter import estimate_tokens
 from ragas.run_config import RunConfig, add_async_retry
 
 if t.TYPE_CHECKING:
@@ -54,12 +55,21 @@ class BaseRagasLLM(ABC):
     def __post_init__(self):
         # If a cache_backend is provided, wrap the implementation methods at construction time.
         if self.cache is not None:
-            self.generate_text = cacher(cache_backend=self.cache)(self.generate_text)
-            self.agenerate_text = cacher(cache_backend=self.cache)(self.agenerate_text)
+            cache = cacher(cache_backend=self.cache, namespace=self.model_fingerprint)
+            self.generate_text = cache(self.generate_text)
+            self.agenerate_text = cache(self.agenerate_text)
 
     def set_run_config(self, run_config: RunConfig):
         self.run_config = run_config
 
+    def model_fingerprint(self) -> str:
+        """
+        Return a fingerprint of the underlying model and its generation parameters.
+        Cached responses are namespaced by it, so wrappers of different models can
+        share one cache backend.
+        """
+        return fingerprint_model(self)
+
     def get_temperature(self, n: int) -> float:
         """Return the temperature to use for completion based on n."""
         return 0.3 if n > 1 else 1e-8
@@ -103,9 +113,12 @@ class BaseRagasLLM(ABC):
         if temperature is None:
             temperature = self.get_temperature(n)
 
-        agenerate_text_with_retry = add_async_retry(
-            self.agenerate_text, self.run_config
-        )
+        agenerate_text = self.agenerate_text
+        if self.run_config.rate_limiter is not None:
+            agenerate_text = self.run_config.rate_limiter.wrap(
+                agenerate_text, tokens=estimate_tokens(prompt.to_string())
+            )
+        agenerate_text_with_retry = add_async_retry(agenerate_text, self.run_config)
         result = await agenerate_text_with_retry(
             prompt=prompt,
             n=n,
@@ -142,6 +155,9 @@ class LangchainLLMWrapper(BaseRagasLLM):
         self.set_run_config(run_config)
         self.is_finished_parser = is_finished_parser
 
+    def model_fingerprint(self) -> str:
+        return fingerprint_model(self.langchain_llm)
+
     def is_finished(self, response: LLMResult) -> bool:
         """
         Parse the response to check if the LLM finished by checking the finish_reason
@@ -342,6 +358,9 @@ class LlamaIndexLLMWrapper(BaseRagasLLM):
                 "stop": stop,
             }
 
+    def model_fingerprint(self) -> str:
+        return fingerprint_model(self.llm)
+
     def is_finished(self, response: LLMResult) -> bool:
         return True
 
@@ -4,7 +4,7 @@ from langchain_core.callbacks import Callbacks
 from langchain_core.outputs import Generation, LLMResult
 from langchain_core.prompt_values import PromptValue
 
-from ragas.cache import CacheInterface
+from ragas.cache import CacheInterface, fingerprint_model
 from ragas.llms import BaseRagasLLM
 from ragas.run_config import RunConfig
 
@@ -75,6 +75,9 @@ class HaystackLLMWrapper(BaseRagasLLM):
             run_config = RunConfig()
         self.set_run_config(run_config)
 
+    def model_fingerprint(self) -> str:
+        return fingerprint_model(self.generator)
+
     def is_finished(self, response: LLMResult) -> bool:
         return True
 
@@ -190,6 +190,11 @@ class AnswerCorrectness(MetricWithLLM, MetricWithEmbeddings, SingleTurnMetric):
         if self.answer_similarity is None and self.weights[1] != 0:
             self.answer_similarity = AnswerSimilarity(embeddings=self.embeddings)
 
+    def texts_to_embed(self, sample: SingleTurnSample) -> t.List[str]:
+        if self.answer_similarity is None:
+            return []
+        return self.answer_similarity.texts_to_embed(sample)
+
     def _compute_statement_presence(
         self, prediction: ClassificationWithReason
     ) -> float:
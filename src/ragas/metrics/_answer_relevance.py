@@ -102,6 +102,30 @@ class ResponseRelevancy(MetricWithLLM, MetricWithEmbeddings, SingleTurnMetric):
         gen_question_vec = np.asarray(
             self.embeddings.embed_documents(generated_questions)
         ).reshape(len(generated_questions), -1)
+        return self._cosine_similarity(question_vec, gen_question_vec)
+
+    async def acalculate_similarity(
+        self, question: str, generated_questions: list[str]
+    ):
+        """
+        Async version of `calculate_similarity`, the question is embedded as a query
+        and the generated questions as documents.
+        """
+        assert (
+            self.embeddings is not None
+        ), f"Error: '{self.name}' requires embeddings to be set."
+        question_vec = (await self.embeddings.embed_query_array(question)).reshape(
+            1, -1
+        )
+        gen_question_vec = (
+            await self.embeddings.embed_texts_array(generated_questions)
+        ).reshape(len(generated_questions), -1)
+        return self._cosine_similarity(question_vec, gen_question_vec)
+
+    @staticmethod
+    def _cosine_similarity(
+        question_vec: np.ndarray, gen_question_vec: np.ndarray
+    ) -> np.ndarray:
         norm = np.linalg.norm(gen_question_vec, axis=1) * np.linalg.norm(
             question_vec, axis=1
         )
@@ -112,7 +136,7 @@ class ResponseRelevancy(MetricWithLLM, MetricWithEmbeddings, SingleTurnMetric):
             / norm
         )
 
-    def _calculate_score(
+    async def _calculate_score(
         self, answers: t.Sequence[ResponseRelevanceOutput], row: t.Dict
     ) -> float:
         question = row["user_input"]
@@ -124,7 +148,7 @@ class ResponseRelevancy(MetricWithLLM, MetricWithEmbeddings, SingleTurnMetric):
             )
             score = np.nan
         else:
-            cosine_sim = self.calculate_similarity(question, gen_questions)
+            cosine_sim = await self.acalculate_similarity(question, gen_questions)
             score = cosine_sim.mean() * int(not committal)
 
         return score
@@ -149,7 +173,7 @@ class ResponseRelevancy(MetricWithLLM, MetricWithEmbeddings, SingleTurnMetric):
         ]
         responses = await asyncio.gather(*tasks)
 
-        return self._calculate_score(responses, row)
+        return await self._calculate_score(responses, row)
 
 
 class AnswerRelevancy(ResponseRelevancy):
@@ -58,6 +58,12 @@ class SemanticSimilarity(MetricWithEmbeddings, SingleTurnMetric):
                 **self.embeddings.encode_kwargs,
             }
 
+    def texts_to_embed(self, sample: SingleTurnSample) -> t.List[str]:
+        if self.is_cross_encoder:
+            return []
+        # empty strings are embedded as a single space, see _ascore
+        return [sample.reference or " ", sample.response or " "]
+
     async def _single_turn_ascore(
         self, sample: SingleTurnSample, callbacks: Callbacks
     ) -> float:
@@ -81,8 +87,8 @@ class SemanticSimilarity(MetricWithEmbeddings, SingleTurnMetric):
                 "async score [ascore()] not implemented for HuggingFace embeddings"
             )
         else:
-            embedding_1 = np.array(await self.embeddings.embed_text(ground_truth))
-            embedding_2 = np.array(await self.embeddings.embed_text(answer))
+            embedding_1 = await self.embeddings.embed_text_array(ground_truth)
+            embedding_2 = await self.embeddings.embed_text_array(answer)
             # Normalization factors of the above embeddings
             norms_1 = np.linalg.norm(embedding_1, keepdims=True)
             norms_2 = np.linalg.norm(embedding_2, keepdims=True)
@@ -14,7 +14,7 @@ from tqdm import tqdm
 from ragas._analytics import EvaluationEvent, _analytics_batcher
 from ragas.callbacks import ChainType, new_group
 from ragas.dataset_schema import MetricAnnotation, MultiTurnSample, SingleTurnSample
-from ragas.executor import is_event_loop_running
+from ragas.executor import run
 from ragas.losses import BinaryMetricLoss, MSELoss
 from ragas.prompt import FewShotPydanticPrompt, PromptMixin
 from ragas.run_config import RunConfig
@@ -144,17 +144,7 @@ class Metric(ABC):
             metadata={"type": ChainType.METRIC},
         )
         try:
-            if is_event_loop_running():
-                try:
-                    import nest_asyncio
-
-                    nest_asyncio.apply()
-                except ImportError:
-                    raise ImportError(
-                        "It seems like your running this in a jupyter-like environment. Please install nest_asyncio with `pip install nest_asyncio` to make it work."
-                    )
-            loop = asyncio.get_event_loop()
-            score = loop.run_until_complete(self._ascore(row=row, callbacks=group_cm))
+            score = run(self._ascore(row=row, callbacks=group_cm))
         except Exception as e:
             if not group_cm.ended:
                 rm.on_chain_error(e)
@@ -437,6 +427,16 @@ class MetricWithEmbeddings(Metric):
             )
         self.embeddings.set_run_config(run_config)
 
+    def texts_to_embed(
+        self, sample: t.Union[SingleTurnSample, MultiTurnSample]
+    ) -> t.List[str]:
+        """
+        Return the texts of `sample` this metric embeds while scoring it, so that
+        `evaluate` can embed them for the whole dataset in one bulk pass. Metrics that
+        do not know them upfront return an empty list.
+        """
+        return []
+
 
 class SingleTurnMetric(Metric):
     """
@@ -478,19 +478,7 @@ class SingleTurnMetric(Metric):
             metadata={"type": ChainType.METRIC},
         )
         try:
-            if is_event_loop_running():
-                try:
-                    import nest_asyncio
-
-                    nest_asyncio.apply()
-                except ImportError:
-                    raise ImportError(
-                        "It seems like your running this in a jupyter-like environment. Please install nest_asyncio with `pip install nest_asyncio` to make it work."
-                    )
-            loop = asyncio.get_event_loop()
-            score = loop.run_until_complete(
-                self._single_turn_ascore(sample=sample, callbacks=group_cm)
-            )
+            score = run(self._single_turn_ascore(sample=sample, callbacks=group_cm))
         except Exception as e:
             if not group_cm.ended:
                 rm.on_chain_error(e)
@@ -606,19 +594,7 @@ class MultiTurnMetric(Metric):
             metadata={"type": ChainType.METRIC},
         )
         try:
-            if is_event_loop_running():
-                try:
-                    import nest_asyncio
-
-                    nest_asyncio.apply()
-                except ImportError:
-                    raise ImportError(
-                        "It seems like your running this in a jupyter-like environment. Please install nest_asyncio with `pip install nest_asyncio` to make it work."
-                    )
-            loop = asyncio.get_event_loop()
-            score = loop.run_until_complete(
-                self._multi_turn_ascore(sample=sample, callbacks=group_cm)
-            )
+            score = run(self._multi_turn_ascore(sample=sample, callbacks=group_cm))
         except Exception as e:
             if not group_cm.ended:
                 rm.on_chain_error(e)
@@ -32,6 +32,11 @@ class ExampleStore(ABC):
     def add_example(self, input: BaseModel, output: BaseModel):
         pass
 
+    async def aget_examples(
+        self, data: BaseModel, top_k: int = 5
+    ) -> t.Sequence[t.Tuple[BaseModel, BaseModel]]:
+        return self.get_examples(data, top_k)
+
 
 @dataclass
 class InMemoryExampleStore(ExampleStore):
@@ -53,6 +58,20 @@ class InMemoryExampleStore(ExampleStore):
         self, data: BaseModel, top_k: int = 5, threshold: float = 0.7
     ) -> t.Sequence[t.Tuple[BaseModel, BaseModel]]:
         data_embedding = self.embeddings.embed_query(data.model_dump_json())
+        return self._nearest_examples(data_embedding, top_k, threshold)
+
+    async def aget_examples(
+        self, data: BaseModel, top_k: int = 5, threshold: float = 0.7
+    ) -> t.Sequence[t.Tuple[BaseModel, BaseModel]]:
+        data_embedding = await self.embeddings.embed_text_array(data.model_dump_json())
+        return self._nearest_examples(data_embedding, top_k, threshold)
+
+    def _nearest_examples(
+        self,
+        data_embedding: t.Union[t.List[float], np.ndarray],
+        top_k: int,
+        threshold: float,
+    ) -> t.List[t.Tuple[BaseModel, BaseModel]]:
         return [
             self._examples_list[i]
             for i in self.get_nearest_examples(
@@ -62,14 +81,14 @@ class InMemoryExampleStore(ExampleStore):
 
     @staticmethod
     def get_nearest_examples(
-        query_embedding: t.List[float],
-        embeddings: t.List[t.List[float]],
+        query_embedding: t.Union[t.List[float], np.ndarray],
+        embeddings: t.Union[t.List[t.List[float]], np.ndarray],
         top_k: int = 3,
         threshold: float = 0.7,
     ) -> t.List[int]:
         # Convert to numpy arrays for efficient computation
-        query = np.array(query_embedding)
-        embed_matrix = np.array(embeddings)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        embed_matrix = np.asarray(embeddings, dtype=np.float32)
 
         # Calculate cosine similarity
         similarities = np.dot(embed_matrix, query) / (
@@ -116,7 +135,9 @@ class FewShotPydanticPrompt(PydanticPrompt, t.Generic[InputModel, OutputModel]):
         retries_left: int = 3,
     ) -> t.List[OutputModel]:
         # Ensure get_examples returns a sequence of tuples (InputModel, OutputModel)
-        self.examples = self.example_store.get_examples(data, self.top_k_for_examples)  # type: ignore
+        self.examples = await self.example_store.aget_examples(  # type: ignore
+            data, self.top_k_for_examples
+        )
         return await super().generate_multiple(
             llm, data, n, temperature, stop, callbacks, retries_left
         )
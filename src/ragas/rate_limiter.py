@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import math
+import time
+import typing as t
+from contextlib import asynccontextmanager
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import CoreSchema, core_schema
+
+logger = logging.getLogger(__name__)
+
+# rough number of characters per token, used to estimate the size of a request
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Cheaply estimate the number of tokens in the given texts from their length."""
+    return sum(len(text) for text in texts) // CHARS_PER_TOKEN + 1
+
+
+def is_rate_limit_error(e: BaseException) -> bool:
+    """Return whether the exception signals that the provider is rate limiting us."""
+    if type(e).__name__ == "RateLimitError":
+        return True
+    status_code = getattr(e, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(e, "response", None), "status_code", None)
+    return status_code == 429
+
+
+class _TokenBucket:
+    """A bucket refilled continuously at `per_minute / 60` units per second."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(
+            self.capacity, self.available + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available."""
+        self._refill()
+        # requests larger than the bucket only wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount: float):
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Rate limiter shared by all LLM and embedding calls that use the same `RunConfig`.
+
+    Requests wait for a slot in two token buckets, one for requests per minute and
+    one for (estimated) tokens per minute, so bursts are spread out instead of
+    hitting the provider limits. On top of that the number of concurrent requests
+    is adapted AIMD-style: it is halved whenever a rate limit error is observed
+    and grows back by one slot per round of successful requests.
+
+    Parameters
+    ----------
+    requests_per_minute : float, optional
+        Maximum number of requests started per minute. No limit if None.
+    tokens_per_minute : float, optional
+        Maximum number of estimated tokens sent per minute. No limit if None.
+    max_concurrency : int, optional
+        Upper bound of concurrent requests, by default 16.
+    min_concurrency : int, optional
+        Lower bound the concurrency is never reduced below, by default 1.
+
+    Examples
+    --------
+    >>> from ragas import RunConfig
+    >>> from ragas.rate_limiter import RateLimiter
+    >>> run_config = RunConfig(
+    ...     rate_limiter=RateLimiter(requests_per_minute=500, tokens_per_minute=200_000)
+    ... )
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: t.Optional[float] = None,
+        tokens_per_minute: t.Optional[float] = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+    ):
+        if max_concurrency < min_concurrency or min_concurrency < 1:
+            raise ValueError(
+                "Expected 1 <= min_concurrency <= max_concurrency, "
+                f"got {min_concurrency} and {max_concurrency}"
+            )
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self._request_bucket = (
+            _TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self._token_bucket = (
+            _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+        # asyncio primitives are bound to the loop they are first used on, so they
+        # are (re)created lazily for the loop that is currently running
+        self._loop: t.Optional[asyncio.AbstractEventLoop] = None
+        self._bucket_lock: t.Optional[asyncio.Lock] = None
+        self._slot_available: t.Optional[asyncio.Condition] = None
+
+    def _primitives(self) -> t.Tuple[asyncio.Lock, asyncio.Condition]:
+        loop = asyncio.get_running_loop()
+        if (
+            self._loop is not loop
+            or self._bucket_lock is None
+            or self._slot_available is None
+        ):
+            self._loop = loop
+            self._bucket_lock = asyncio.Lock()
+            self._slot_available = asyncio.Condition()
+            self.in_flight = 0
+        return self._bucket_lock, self._slot_available
+
+    async def acquire(self, tokens: int = 0):
+        """Wait for a concurrency slot and for room in the rate limit buckets."""
+        bucket_lock, slot_available = self._primitives()
+        async with slot_available:
+            await slot_available.wait_for(
+                lambda: self.in_flight < math.floor(self.concurrency)
+            )
+            self.in_flight += 1
+
+        try:
+            async with bucket_lock:
+                while True:
+                    wait = 0.0
+                    if self._request_bucket is not None:
+                        wait = max(wait, self._request_bucket.wait_time(1))
+                    if self._token_bucket is not None:
+                        wait = max(wait, self._token_bucket.wait_time(tokens))
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+                if self._request_bucket is not None:
+                    self._request_bucket.consume(1)
+                if self._token_bucket is not None:
+                    self._token_bucket.consume(tokens)
+        except BaseException:
+            await self.release()
+            raise
+
+    async def release(self):
+        """Give back the concurrency slot taken by `acquire`."""
+        _, slot_available = self._primitives()
+        async with slot_available:
+            self.in_flight -= 1
+            slot_available.notify_all()
+
+    def on_success(self):
+        # additive increase: one extra slot per round of successful requests
+        self.concurrency = min(
+            float(self.max_concurrency), self.concurrency + 1 / self.concurrency
+        )
+
+    def on_rate_limit(self):
+        # multiplicative decrease
+        self.concurrency = max(float(self.min_concurrency), self.concurrency / 2)
+        logger.debug(
+            "Rate limit hit, reducing concurrency to %d", math.floor(self.concurrency)
+        )
+
+    @asynccontextmanager
+    async def limit(self, tokens: int = 0):
+        """Hold a rate limited slot for the duration of one request."""
+        await self.acquire(tokens)
+        try:
+            yield
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.on_rate_limit()
+            raise
+        else:
+            self.on_success()
+        finally:
+            await self.release()
+
+    def wrap(self, fn: t.Callable[..., t.Awaitable], tokens: int = 0) -> t.Callable:
+        """Wrap an async function so that every call goes through the limiter."""
+
+        @functools.wraps(fn)
+        async def rate_limited(*args, **kwargs):
+            async with self.limit(tokens):
+                return await fn(*args, **kwargs)
+
+        return rate_limited
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: t.Any, handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        """
+        Define how Pydantic generates a schema for RateLimiter.
+        """
+        return core_schema.no_info_after_validator_function(
+            cls, core_schema.is_instance_schema(cls)  # The validator function
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(concurrency={math.floor(self.concurrency)}, "
+            f"max_concurrency={self.max_concurrency})"
+        )
@@ -14,6 +14,8 @@ from tenacity import (
 )
 from tenacity.after import after_nothing
 
+from ragas.rate_limiter import RateLimiter
+
 
 @dataclass
 class RunConfig:
@@ -36,6 +38,15 @@ class RunConfig:
         Whether to log retry attempts using tenacity, by default False.
     seed : int, optional
         Random seed for reproducibility, by default 42.
+    rate_limiter : RateLimiter, optional
+        Rate limiter shared by all LLM and embedding calls using this config, by
+        default None (no rate limiting beyond `max_workers`).
+    embedding_batch_size : int, optional
+        Maximum number of concurrent single text embedding requests that are sent
+        together as one `aembed_documents` call, by default 1 (no batching).
+    embedding_batch_wait : float, optional
+        Time (in seconds) to wait for more requests before sending a partially
+        filled embedding batch, by default 0.005.
 
     Attributes
     ----------
@@ -58,6 +69,9 @@ class RunConfig:
     ] = (Exception,)
     log_tenacity: bool = False
     seed: int = 42
+    rate_limiter: t.Optional[RateLimiter] = None
+    embedding_batch_size: int = 1
+    embedding_batch_wait: float = 0.005
 
     def __post_init__(self):
         self.rng = np.random.default_rng(seed=self.seed)
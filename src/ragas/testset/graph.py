@@ -1,4 +1,6 @@
+import hashlib
 import json
+import types
 import typing as t
 import uuid
 from copy import deepcopy
@@ -6,6 +8,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+import numpy as np
 from pydantic import BaseModel, Field, field_serializer
 
 
@@ -13,9 +16,61 @@ class UUIDEncoder(json.JSONEncoder):
     def default(self, o):
         if isinstance(o, uuid.UUID):
             return str(o)
+        if isinstance(o, (np.ndarray, np.generic)):
+            return o.tolist()
         return super().default(o)
 
 
+# layout of the binary format written by `KnowledgeGraph.save(format="binary")`
+BINARY_FORMAT_VERSION = 1
+_NODES_FILE = "nodes.arrow"
+_RELATIONSHIPS_FILE = "relationships.arrow"
+_METADATA_FILE = "metadata.json"
+_EMBEDDINGS_DIR = "embeddings"
+
+
+def _is_vector(value: t.Any, allow_int: bool = False) -> bool:
+    # vectors of floats such as embeddings, integer lists are ordinary metadata
+    # unless they are known to be embeddings
+    kinds = "iuf" if allow_int else "f"
+    if isinstance(value, np.ndarray):
+        return value.ndim == 1 and value.size > 0 and value.dtype.kind in kinds
+    number_types = (int, float) if allow_int else float
+    return (
+        isinstance(value, (list, tuple))
+        and len(value) > 0
+        and all(isinstance(x, number_types) and not isinstance(x, bool) for x in value)
+    )
+
+
+def _import_pyarrow() -> t.Any:
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for the binary knowledge graph format. "
+            "Please install it using `pip install pyarrow`"
+        ) from e
+    return pa
+
+
+def _embedding_properties(nodes: t.Sequence["Node"]) -> t.List[str]:
+    """
+    Properties holding a float vector of the same length on every node, or a
+    numeric vector if the property name ends with "embedding".
+    """
+    dimensions: t.Dict[str, t.Optional[int]] = {}
+    for node in nodes:
+        for key, value in node.properties.items():
+            if key in dimensions and dimensions[key] is None:
+                continue
+            is_vector = _is_vector(value, allow_int=key.endswith("embedding"))
+            dimension = len(value) if is_vector else None
+            if dimensions.setdefault(key, dimension) != dimension:
+                dimensions[key] = None
+    return [key for key, dimension in dimensions.items() if dimension is not None]
+
+
 class NodeType(str, Enum):
     """
     Enumeration of node types in the knowledge graph.
@@ -40,12 +95,17 @@ class Node(BaseModel):
         Dictionary of properties associated with the node.
     type : NodeType
         Type of the node.
+    transform_fingerprints : dict
+        Fingerprint of the inputs every transformation last processed the node
+        with, keyed by the fingerprint of the transformation. Used to skip
+        unchanged nodes when transformations are applied again.
 
     """
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4)
     properties: dict = Field(default_factory=dict)
     type: NodeType = NodeType.UNKNOWN
+    transform_fingerprints: t.Dict[str, str] = Field(default_factory=dict)
 
     def __repr__(self) -> str:
         return f"Node(id: {str(self.id)[:6]}, type: {self.type}, properties: {list(self.properties.keys())})"
@@ -76,6 +136,29 @@ class Node(BaseModel):
         """
         return self.properties.get(key.lower(), None)
 
+    def content_hash(self, keys: t.Sequence[str]) -> str:
+        """
+        Hash of the node type and the values of the given properties.
+
+        Numeric vectors such as embeddings are hashed as float32, so the hash does
+        not depend on whether they are stored as lists or arrays.
+        """
+        digest = hashlib.sha256(self.type.value.encode())
+        for key in keys:
+            value = self.get_property(key)
+            digest.update(b"\0k" + key.lower().encode())
+            if _is_vector(value):
+                digest.update(b"\0v" + np.asarray(value, dtype=np.float32).tobytes())
+            else:
+                try:
+                    encoded = json.dumps(
+                        value, cls=UUIDEncoder, sort_keys=True, ensure_ascii=False
+                    )
+                except TypeError:
+                    encoded = repr(value)
+                digest.update(b"\0j" + encoded.encode())
+        return digest.hexdigest()[:16]
+
     def __hash__(self) -> int:
         return hash(self.id)
 
@@ -138,21 +221,552 @@ class Relationship(BaseModel):
         return node.id
 
 
+def _condition_key(condition: t.Callable) -> t.Optional[t.Hashable]:
+    """
+    A key identifying what a relationship condition computes, or None if it cannot
+    be derived.
+
+    Plain functions are identified by their code, defaults and closure so that a
+    lambda recreated on every call (e.g. inside a method) gets the same key.
+    """
+    try:
+        if isinstance(condition, types.FunctionType):
+            key: t.Hashable = (
+                condition.__code__,
+                condition.__defaults__,
+                tuple(cell.cell_contents for cell in condition.__closure__ or ()),
+            )
+        else:
+            key = condition
+        hash(key)
+    except (TypeError, ValueError):
+        # unhashable closure values or an empty closure cell
+        return None
+    return key
+
+
+class RelationshipBatch(t.Sequence[Relationship]):
+    """
+    Relationships of one type stored column-wise.
+
+    The source and target nodes are stored as integer positions into `nodes` and
+    every property as one array (or list, for non numeric values) with a value
+    per relationship. `Relationship` objects are only created when the batch is
+    indexed or iterated, with ids derived from the batch. A created relationship is
+    kept and returned by later accesses, so edits of its properties are not lost.
+    Filtering the batch by node (e.g. when a node is removed) uses the source,
+    target and type columns, so these should not be changed on the relationships.
+
+    Parameters
+    ----------
+    nodes : Sequence[Node]
+        The nodes the source and target positions refer to.
+    source : array-like of int
+        Position of the source node of every relationship.
+    target : array-like of int
+        Position of the target node of every relationship.
+    type : str
+        The type of the relationships.
+    properties : dict, optional
+        Property name to a sequence holding the value for every relationship.
+    bidirectional : bool, optional
+        Whether the relationships are bidirectional, by default False.
+    """
+
+    # the low bits of the relationship ids hold the position in the batch
+    _POSITION_BITS = 40
+
+    def __init__(
+        self,
+        nodes: t.Sequence[Node],
+        source: t.Union[np.ndarray, t.Sequence[int]],
+        target: t.Union[np.ndarray, t.Sequence[int]],
+        type: str,
+        properties: t.Optional[t.Dict[str, t.Sequence[t.Any]]] = None,
+        bidirectional: bool = False,
+    ):
+        self.nodes = nodes
+        self.source = np.asarray(source, dtype=np.int64).reshape(-1)
+        self.target = np.asarray(target, dtype=np.int64).reshape(-1)
+        self.type = type
+        self.bidirectional = bidirectional
+        self.properties: t.Dict[str, t.Union[np.ndarray, t.List[t.Any]]] = {}
+        for key, values in (properties or {}).items():
+            array = np.asarray(values) if isinstance(values, np.ndarray) else None
+            if array is None and all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+            ):
+                array = np.asarray(values)
+            self.properties[key] = (
+                array
+                if array is not None and array.dtype.kind in "biuf"
+                else list(values)
+            )
+        if len(self.target) != len(self.source) or any(
+            len(values) != len(self.source) for values in self.properties.values()
+        ):
+            raise ValueError(
+                "All columns of a RelationshipBatch must have one value per relationship"
+            )
+        self._id_base = uuid.uuid4().int & ~((1 << self._POSITION_BITS) - 1)
+        self._positions: t.Optional[np.ndarray] = None
+        # row -> the relationship created for it
+        self._created: t.Dict[int, Relationship] = {}
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def _relationship(
+        self, i: int, position: int, properties: t.Dict[str, t.Any]
+    ) -> Relationship:
+        relationship = Relationship.model_construct(
+            id=uuid.UUID(int=self._id_base | position),
+            type=self.type,
+            source=self.nodes[self.source[i]],
+            target=self.nodes[self.target[i]],
+            bidirectional=self.bidirectional,
+            properties=properties,
+        )
+        self._created[i] = relationship
+        return relationship
+
+    def _position(self, i: int) -> int:
+        return i if self._positions is None else int(self._positions[i])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("RelationshipBatch index out of range")
+        if i in self._created:
+            return self._created[i]
+        properties = {
+            key: values[i].item() if isinstance(values, np.ndarray) else values[i]
+            for key, values in self.properties.items()
+        }
+        return self._relationship(i, self._position(i), properties)
+
+    def __iter__(self) -> t.Iterator[Relationship]:
+        columns = {
+            key: values.tolist() if isinstance(values, np.ndarray) else values
+            for key, values in self.properties.items()
+        }
+        for i in range(len(self)):
+            relationship = self._created.get(i)
+            if relationship is None:
+                relationship = self._relationship(
+                    i,
+                    self._position(i),
+                    {key: values[i] for key, values in columns.items()},
+                )
+            yield relationship
+
+    def select(self, mask: np.ndarray) -> "RelationshipBatch":
+        """The relationships where `mask` is True, keeping their ids."""
+        selected = RelationshipBatch.__new__(RelationshipBatch)
+        selected.nodes = self.nodes
+        selected.source = self.source[mask]
+        selected.target = self.target[mask]
+        selected.type = self.type
+        selected.bidirectional = self.bidirectional
+        selected.properties = {
+            key: (
+                values[mask]
+                if isinstance(values, np.ndarray)
+                else [v for v, keep in zip(values, mask) if keep]
+            )
+            for key, values in self.properties.items()
+        }
+        selected._id_base = self._id_base
+        positions = np.arange(len(self)) if self._positions is None else self._positions
+        selected._positions = positions[mask]
+        selected._created = {}
+        if self._created:
+            rows = np.cumsum(mask) - 1
+            selected._created = {
+                int(rows[i]): relationship
+                for i, relationship in self._created.items()
+                if mask[i]
+            }
+        return selected
+
+    def __repr__(self) -> str:
+        return f"RelationshipBatch(type: {self.type}, relationships: {len(self)})"
+
+
+class RelationshipStore(t.MutableSequence[Relationship]):
+    """
+    A list of relationships that can hold `RelationshipBatch` objects without
+    creating a `Relationship` for every one of their rows.
+
+    Single relationships are appended to plain lists, batches passed to `extend`
+    are kept as they are. Indexing and iteration create the relationships of a
+    batch on the fly. `version` is incremented on every modification.
+    """
+
+    def __init__(self, relationships: t.Iterable[Relationship] = ()):
+        self._chunks: t.List[t.Union[t.List[Relationship], RelationshipBatch]] = []
+        self._length = 0
+        self.version = 0
+        self.extend(relationships)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> t.Iterator[Relationship]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def _locate(self, i: int) -> t.Tuple[int, int]:
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("RelationshipStore index out of range")
+        for chunk_index, chunk in enumerate(self._chunks):
+            if i < len(chunk):
+                return chunk_index, i
+            i -= len(chunk)
+        raise IndexError("RelationshipStore index out of range")
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self)[i]
+        chunk_index, position = self._locate(i)
+        return self._chunks[chunk_index][position]
+
+    def _as_list(self) -> t.List[Relationship]:
+        # edits other than appends turn the store into a single plain list
+        if len(self._chunks) != 1 or not isinstance(self._chunks[0], list):
+            self._chunks = [list(self)]
+        return self._chunks[0]
+
+    def __setitem__(self, i, value):
+        self._as_list()[i] = value
+        self._length = len(self._chunks[0])
+        self.version += 1
+
+    def __delitem__(self, i):
+        del self._as_list()[i]
+        self._length = len(self._chunks[0])
+        self.version += 1
+
+    def insert(self, i: int, value: Relationship):
+        self._as_list().insert(i, value)
+        self._length += 1
+        self.version += 1
+
+    def append(self, value: Relationship):
+        if not self._chunks or not isinstance(self._chunks[-1], list):
+            self._chunks.append([])
+        self._chunks[-1].append(value)
+        self._length += 1
+        self.version += 1
+
+    def extend(self, values: t.Iterable[Relationship]):
+        if isinstance(values, RelationshipBatch):
+            if len(values):
+                self._chunks.append(values)
+                self._length += len(values)
+                self.version += 1
+        elif isinstance(values, RelationshipStore):
+            for chunk in list(values._chunks):
+                self.extend(chunk)
+        else:
+            for value in values:
+                self.append(value)
+
+    def batches(self) -> t.List[t.Union[t.List[Relationship], RelationshipBatch]]:
+        """The plain lists and batches the relationships are stored in."""
+        return list(self._chunks)
+
+    def where_nodes(self, keep: t.Callable[[Node], bool]) -> "RelationshipStore":
+        """
+        A new store with the relationships whose source and target both satisfy
+        `keep`. Batches are filtered column-wise, calling `keep` once per node.
+        """
+        store = RelationshipStore()
+        for chunk in self._chunks:
+            if isinstance(chunk, RelationshipBatch):
+                kept = np.fromiter(
+                    (keep(node) for node in chunk.nodes),
+                    dtype=bool,
+                    count=len(chunk.nodes),
+                )
+                mask = kept[chunk.source] & kept[chunk.target]
+                store.extend(chunk if mask.all() else chunk.select(mask))
+            else:
+                store.extend(
+                    rel for rel in chunk if keep(rel.source) and keep(rel.target)
+                )
+        return store
+
+    def without(
+        self, rel_type: str, touching: t.Callable[[Node], bool]
+    ) -> "RelationshipStore":
+        """
+        A new store without the relationships of type `rel_type` whose source or
+        target satisfies `touching`.
+        """
+        store = RelationshipStore()
+        for chunk in self._chunks:
+            if isinstance(chunk, RelationshipBatch):
+                if chunk.type != rel_type:
+                    store.extend(chunk)
+                    continue
+                touched = np.fromiter(
+                    (touching(node) for node in chunk.nodes),
+                    dtype=bool,
+                    count=len(chunk.nodes),
+                )
+                mask = ~(touched[chunk.source] | touched[chunk.target])
+                store.extend(chunk if mask.all() else chunk.select(mask))
+            else:
+                store.extend(
+                    rel
+                    for rel in chunk
+                    if rel.type != rel_type
+                    or not (touching(rel.source) or touching(rel.target))
+                )
+        return store
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (RelationshipStore, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RelationshipStore({list(self)!r})"
+
+
+class NodeList(t.List[Node]):
+    """
+    The list of nodes of a `KnowledgeGraph`. It behaves like a plain list, and
+    `version` is incremented on every modification so that the graph can tell when
+    its index is outdated.
+    """
+
+    def __init__(self, nodes: t.Iterable[Node] = ()):
+        super().__init__(nodes)
+        self.version = 0
+
+
+def _counting_modifications(name: str) -> t.Callable:
+    method = getattr(list, name)
+
+    def modify(self: NodeList, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    modify.__name__ = name
+    return modify
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "remove",
+    "pop",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(NodeList, _name, _counting_modifications(_name))
+
+
+class _GraphIndex:
+    """
+    Id map and adjacency lists of a knowledge graph.
+
+    Relationships are indexed by the id of their source (outgoing) and target
+    (incoming) node and by their type. The adjacency lists are only built when
+    they are first needed, as that creates every relationship of the batches in
+    the graph. `signature` identifies the node and relationship lists, and their
+    versions, the index was built for. `clusters` memoizes the results of
+    `find_indirect_clusters` and is cleared on every change.
+    """
+
+    def __init__(
+        self,
+        nodes: t.List[Node],
+        relationships: t.Sequence[Relationship],
+        signature: t.Tuple[int, ...],
+    ):
+        self.signature = signature
+        self.nodes: t.Dict[uuid.UUID, Node] = {node.id: node for node in nodes}
+        self.relationships = relationships
+        self.clusters: t.Dict[t.Hashable, t.List[t.FrozenSet[Node]]] = {}
+        self._outgoing: t.Optional[
+            t.Dict[uuid.UUID, t.Dict[str, t.List[Relationship]]]
+        ] = None
+        self._incoming: t.Optional[
+            t.Dict[uuid.UUID, t.Dict[str, t.List[Relationship]]]
+        ] = None
+
+    def _build_adjacency(self):
+        self._outgoing, self._incoming = {}, {}
+        for relationship in self.relationships:
+            self._index_relationship(relationship)
+
+    @property
+    def outgoing(self) -> t.Dict[uuid.UUID, t.Dict[str, t.List[Relationship]]]:
+        if self._outgoing is None:
+            self._build_adjacency()
+        assert self._outgoing is not None
+        return self._outgoing
+
+    @property
+    def incoming(self) -> t.Dict[uuid.UUID, t.Dict[str, t.List[Relationship]]]:
+        if self._incoming is None:
+            self._build_adjacency()
+        assert self._incoming is not None
+        return self._incoming
+
+    def _index_relationship(self, relationship: Relationship):
+        assert self._outgoing is not None and self._incoming is not None
+        self._outgoing.setdefault(relationship.source.id, {}).setdefault(
+            relationship.type, []
+        ).append(relationship)
+        self._incoming.setdefault(relationship.target.id, {}).setdefault(
+            relationship.type, []
+        ).append(relationship)
+
+    def add_node(self, node: Node):
+        self.nodes[node.id] = node
+        self.clusters.clear()
+
+    def add_relationship(self, relationship: Relationship):
+        self.clusters.clear()
+        if self._outgoing is not None:
+            self._index_relationship(relationship)
+
+    def remove_node(self, node: Node):
+        """Drop the node and, if they are built, its adjacency lists."""
+        self.clusters.clear()
+        self.nodes.pop(node.id, None)
+        if self._outgoing is None or self._incoming is None:
+            return
+        removed = {
+            relationship.id
+            for adjacency in (self._outgoing, self._incoming)
+            for relationships in adjacency.pop(node.id, {}).values()
+            for relationship in relationships
+        }
+        for adjacency in (self._outgoing, self._incoming):
+            for by_type in adjacency.values():
+                for rel_type, relationships in by_type.items():
+                    if any(rel.id in removed for rel in relationships):
+                        by_type[rel_type] = [
+                            rel for rel in relationships if rel.id not in removed
+                        ]
+
+    @staticmethod
+    def select(
+        adjacency: t.Dict[str, t.List[Relationship]], rel_type: t.Optional[str]
+    ) -> t.List[Relationship]:
+        if rel_type is not None:
+            return list(adjacency.get(rel_type, []))
+        return [rel for relationships in adjacency.values() for rel in relationships]
+
+
 @dataclass
 class KnowledgeGraph:
     """
     Represents a knowledge graph containing nodes and relationships.
 
+    Lookups by node id and the relationships of a node are served from an index
+    that is kept up to date by `add` and `remove_node`, and rebuilt after any
+    other modification of `nodes` or `relationships`. To track these
+    modifications, lists assigned to `nodes` are copied into a `NodeList` and
+    relationships into a `RelationshipStore`. Changing the `id` of a node, or the
+    source or target of a relationship, after it was added to the graph is not
+    detected.
+
+    Relationships are kept in a `RelationshipStore`, so relationship builders can
+    add a whole `RelationshipBatch` with `kg.relationships.extend(batch)` without
+    creating a `Relationship` object per edge.
+
     Attributes
     ----------
-    nodes : List[Node]
+    nodes : NodeList
         List of nodes in the knowledge graph.
-    relationships : List[Relationship]
-        List of relationships in the knowledge graph.
+    relationships : MutableSequence[Relationship]
+        The relationships in the knowledge graph.
     """
 
-    nodes: t.List[Node] = field(default_factory=list)
-    relationships: t.List[Relationship] = field(default_factory=list)
+    nodes: t.List[Node] = field(default_factory=NodeList)
+    relationships: t.MutableSequence[Relationship] = field(
+        default_factory=RelationshipStore
+    )
+    _index: t.Optional[_GraphIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: t.Any):
+        if name == "nodes" and not isinstance(value, NodeList):
+            value = NodeList(value)
+        elif name == "relationships" and not isinstance(value, RelationshipStore):
+            value = RelationshipStore(value)
+        super().__setattr__(name, value)
+
+    def _signature(self) -> t.Tuple[int, ...]:
+        nodes = t.cast(NodeList, self.nodes)
+        relationships = t.cast(RelationshipStore, self.relationships)
+        return (id(nodes), nodes.version, id(relationships), relationships.version)
+
+    def _current_index(self) -> t.Optional[_GraphIndex]:
+        if self._index is not None and self._index.signature == self._signature():
+            return self._index
+        return None
+
+    def _graph_index(self) -> _GraphIndex:
+        index = self._current_index()
+        if index is None:
+            index = _GraphIndex(self.nodes, self.relationships, self._signature())
+            self._index = index
+        return index
+
+    def get_node_by_id(self, node_id: t.Union[uuid.UUID, str]) -> t.Optional[Node]:
+        """
+        Returns the node with the given id, or None if it is not in the graph.
+        """
+        if isinstance(node_id, str):
+            node_id = uuid.UUID(node_id)
+        return self._graph_index().nodes.get(node_id)
+
+    def has_node(self, node: Node) -> bool:
+        """
+        Returns whether the node is part of the knowledge graph.
+        """
+        return node.id in self._graph_index().nodes
+
+    def get_out_relationships(
+        self, node: Node, rel_type: t.Optional[str] = None
+    ) -> t.List[Relationship]:
+        """
+        Returns the relationships whose source is the given node, optionally only
+        the ones of type `rel_type`.
+        """
+        return _GraphIndex.select(
+            self._graph_index().outgoing.get(node.id, {}), rel_type
+        )
+
+    def get_in_relationships(
+        self, node: Node, rel_type: t.Optional[str] = None
+    ) -> t.List[Relationship]:
+        """
+        Returns the relationships whose target is the given node, optionally only
+        the ones of type `rel_type`.
+        """
+        return _GraphIndex.select(
+            self._graph_index().incoming.get(node.id, {}), rel_type
+        )
 
     def add(self, item: t.Union[Node, Relationship]):
         """
@@ -171,18 +785,39 @@ class KnowledgeGraph:
             raise ValueError(f"Invalid item type: {type(item)}")
 
     def _add_node(self, node: Node):
+        index = self._current_index()
         self.nodes.append(node)
+        if index is not None:
+            index.add_node(node)
+            index.signature = self._signature()
 
     def _add_relationship(self, relationship: Relationship):
+        index = self._current_index()
         self.relationships.append(relationship)
+        if index is not None:
+            index.add_relationship(relationship)
+            index.signature = self._signature()
 
-    def save(self, path: t.Union[str, Path]):
-        """Saves the knowledge graph to a JSON file.
+    def save(
+        self,
+        path: t.Union[str, Path],
+        format: t.Literal["json", "binary"] = "json",
+    ):
+        """Saves the knowledge graph to a JSON file or a binary directory.
 
         Parameters
         ----------
         path : Union[str, Path]
-            Path where the JSON file should be saved.
+            Path where the JSON file (or the directory of the binary format) should
+            be saved.
+        format : str, optional
+            "json" (default) writes a single JSON file. "binary" writes a directory
+            with the node and relationship tables as Arrow IPC files and every
+            embedding property as a float32 `.npy` matrix, which is much smaller and
+            faster to load. Embedding properties are the ones holding a vector of
+            floats of the same length on every node that has them (or of any
+            numbers, if their name ends with "embedding"), all the other
+            properties are stored as JSON.
 
         Notes
         -----
@@ -192,6 +827,12 @@ class KnowledgeGraph:
         if isinstance(path, str):
             path = Path(path)
 
+        if format == "binary":
+            self._save_binary(path)
+            return
+        if format != "json":
+            raise ValueError(f"format must be 'json' or 'binary', got '{format}'")
+
         data = {
             "nodes": [node.model_dump() for node in self.nodes],
             "relationships": [rel.model_dump() for rel in self.relationships],
@@ -199,14 +840,105 @@ class KnowledgeGraph:
         with open(path, "w", encoding="utf-8") as f:
             json.dump(data, f, cls=UUIDEncoder, indent=2, ensure_ascii=False)
 
+    def _save_binary(self, path: Path):
+        pa = _import_pyarrow()
+
+        path.mkdir(parents=True, exist_ok=True)
+        (path / _EMBEDDINGS_DIR).mkdir(exist_ok=True)
+
+        embedding_properties = _embedding_properties(self.nodes)
+        node_columns: t.Dict[str, t.Any] = {
+            "id": pa.array([node.id.bytes for node in self.nodes], pa.binary(16)),
+            "type": pa.array(
+                [node.type.value for node in self.nodes]
+            ).dictionary_encode(),
+            "properties": pa.array(
+                [
+                    json.dumps(
+                        {
+                            key: value
+                            for key, value in node.properties.items()
+                            if key not in embedding_properties
+                        },
+                        cls=UUIDEncoder,
+                        ensure_ascii=False,
+                    )
+                    for node in self.nodes
+                ],
+                pa.large_string(),
+            ),
+        }
+        node_columns["transform_fingerprints"] = pa.array(
+            [json.dumps(node.transform_fingerprints) for node in self.nodes],
+            pa.large_string(),
+        )
+        embedding_files = {}
+        for i, key in enumerate(embedding_properties):
+            rows = np.full(len(self.nodes), -1, dtype=np.int64)
+            vectors = []
+            for position, node in enumerate(self.nodes):
+                if key in node.properties:
+                    rows[position] = len(vectors)
+                    vectors.append(node.properties[key])
+            file_name = f"{_EMBEDDINGS_DIR}/{i}.npy"
+            np.save(path / file_name, np.asarray(vectors, dtype=np.float32))
+            node_columns[f"row:{key}"] = pa.array(rows)
+            embedding_files[key] = file_name
+        self._write_arrow(path / _NODES_FILE, pa.table(node_columns))
+
+        positions = {node.id: position for position, node in enumerate(self.nodes)}
+        relationships = list(self.relationships)
+        relationship_columns = {
+            "id": pa.array([rel.id.bytes for rel in relationships], pa.binary(16)),
+            "type": pa.array(
+                [rel.type for rel in relationships], pa.string()
+            ).dictionary_encode(),
+            "source": pa.array(
+                [positions[rel.source.id] for rel in relationships], pa.int64()
+            ),
+            "target": pa.array(
+                [positions[rel.target.id] for rel in relationships], pa.int64()
+            ),
+            "bidirectional": pa.array(
+                [rel.bidirectional for rel in relationships], pa.bool_()
+            ),
+            "properties": pa.array(
+                [
+                    json.dumps(rel.properties, cls=UUIDEncoder, ensure_ascii=False)
+                    for rel in relationships
+                ],
+                pa.large_string(),
+            ),
+        }
+        self._write_arrow(path / _RELATIONSHIPS_FILE, pa.table(relationship_columns))
+
+        metadata = {"version": BINARY_FORMAT_VERSION, "embeddings": embedding_files}
+        with open(path / _METADATA_FILE, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+
+    @staticmethod
+    def _write_arrow(path: Path, table: t.Any):
+        pa = _import_pyarrow()
+
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
     @classmethod
-    def load(cls, path: t.Union[str, Path]) -> "KnowledgeGraph":
+    def load(cls, path: t.Union[str, Path], mmap: bool = True) -> "KnowledgeGraph":
         """Loads a knowledge graph from a path.
 
         Parameters
         ----------
         path : Union[str, Path]
-            Path to the JSON file containing the knowledge graph.
+            Path to the JSON file containing the knowledge graph, or to a directory
+            written with `save(path, format="binary")`.
+        mmap : bool, optional
+            For the binary format, whether the embedding matrices are memory mapped
+            instead of read into memory, by default True. The embedding properties
+            of the nodes are then read-only rows of the mapped matrices. Only the
+            embeddings are loaded lazily: the `Node` and `Relationship` objects and
+            their other properties are all created when the graph is loaded.
 
         Returns
         -------
@@ -221,6 +953,9 @@ class KnowledgeGraph:
         if isinstance(path, str):
             path = Path(path)
 
+        if path.is_dir():
+            return cls._load_binary(path, mmap=mmap)
+
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
@@ -244,6 +979,83 @@ class KnowledgeGraph:
         kg.relationships.extend(relationships)
         return kg
 
+    @classmethod
+    def _load_binary(cls, path: Path, mmap: bool = True) -> "KnowledgeGraph":
+        pa = _import_pyarrow()
+
+        with open(path / _METADATA_FILE, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        if metadata.get("version") != BINARY_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported knowledge graph format version {metadata.get('version')}"
+            )
+
+        def read_table(file_name: str) -> t.Any:
+            with pa.memory_map(str(path / file_name), "r") as source:
+                return pa.ipc.open_file(source).read_all()
+
+        # the tables were written from validated models, so the nodes and
+        # relationships are constructed without validating them again
+        node_table = read_table(_NODES_FILE)
+        embeddings = {
+            key: (
+                np.load(path / file_name, mmap_mode="r" if mmap else None),
+                node_table.column(f"row:{key}").to_numpy(),
+            )
+            for key, file_name in metadata["embeddings"].items()
+        }
+        fingerprints = (
+            node_table.column("transform_fingerprints").to_pylist()
+            if "transform_fingerprints" in node_table.column_names
+            else ["{}"] * node_table.num_rows
+        )
+        nodes = []
+        for position, (node_id, node_type, properties, node_fingerprints) in enumerate(
+            zip(
+                node_table.column("id").to_pylist(),
+                node_table.column("type").to_pylist(),
+                node_table.column("properties").to_pylist(),
+                fingerprints,
+            )
+        ):
+            properties = json.loads(properties)
+            for key, (matrix, rows) in embeddings.items():
+                if rows[position] >= 0:
+                    properties[key] = matrix[rows[position]]
+            nodes.append(
+                Node.model_construct(
+                    id=uuid.UUID(bytes=node_id),
+                    type=NodeType(node_type),
+                    properties=properties,
+                    transform_fingerprints=json.loads(node_fingerprints),
+                )
+            )
+
+        relationship_table = read_table(_RELATIONSHIPS_FILE)
+        relationships = [
+            Relationship.model_construct(
+                id=uuid.UUID(bytes=rel_id),
+                type=rel_type,
+                source=nodes[source],
+                target=nodes[target],
+                bidirectional=bidirectional,
+                properties=json.loads(properties),
+            )
+            for rel_id, rel_type, source, target, bidirectional, properties in zip(
+                relationship_table.column("id").to_pylist(),
+                relationship_table.column("type").to_pylist(),
+                relationship_table.column("source").to_pylist(),
+                relationship_table.column("target").to_pylist(),
+                relationship_table.column("bidirectional").to_pylist(),
+                relationship_table.column("properties").to_pylist(),
+            )
+        ]
+
+        kg = cls()
+        kg.nodes.extend(nodes)
+        kg.relationships.extend(relationships)
+        return kg
+
     def __repr__(self) -> str:
         return f"KnowledgeGraph(nodes: {len(self.nodes)}, relationships: {len(self.relationships)})"
 
@@ -254,63 +1066,100 @@ class KnowledgeGraph:
         self,
         relationship_condition: t.Callable[[Relationship], bool] = lambda _: True,
         depth_limit: int = 3,
+        max_clusters_per_node: t.Optional[int] = 100,
     ) -> t.List[t.Set[Node]]:
         """
         Finds indirect clusters of nodes in the knowledge graph based on a relationship condition.
         Here if A -> B -> C -> D, then A, B, C, and D form a cluster. If there's also a path A -> B -> C -> E,
         it will form a separate cluster.
 
+        Every path of 2 to `depth_limit` nodes that follows relationships satisfying
+        the condition (from source to target, bidirectional ones both ways) forms a
+        cluster of the nodes on it. Duplicate clusters are removed.
+
+        Paths are extended level by level from every node. Paths that visit the same
+        nodes and end in the same node are extended only once, so the work grows with
+        the number of distinct clusters instead of the number of paths. On dense
+        graphs that number is still large, so every node starts at most
+        `max_clusters_per_node` clusters of each size. The result lists the first
+        cluster of every node, then the second one and so on, so that a prefix of it
+        covers the whole graph. Results are memoized until the graph changes; the
+        relationship condition is assumed to only depend on the relationship.
+
         Parameters
         ----------
         relationship_condition : Callable[[Relationship], bool], optional
             A function that takes a Relationship and returns a boolean, by default lambda _: True
+        depth_limit : int, optional
+            Maximum number of nodes on a path, by default 3.
+        max_clusters_per_node : int, optional
+            Maximum number of clusters of each size a node starts, by default 100.
+            None finds every cluster.
 
         Returns
         -------
         List[Set[Node]]
             A list of sets, where each set contains nodes that form a cluster.
         """
-        clusters = []
-        visited_paths = set()
-
-        relationships = [
-            rel for rel in self.relationships if relationship_condition(rel)
-        ]
-
-        def dfs(node: Node, cluster: t.Set[Node], depth: int, path: t.Tuple[Node, ...]):
-            if depth >= depth_limit or path in visited_paths:
-                return
-            visited_paths.add(path)
-            cluster.add(node)
-
-            for rel in relationships:
-                neighbor = None
-                if rel.source == node and rel.target not in cluster:
-                    neighbor = rel.target
-                elif (
-                    rel.bidirectional
-                    and rel.target == node
-                    and rel.source not in cluster
-                ):
-                    neighbor = rel.source
-
-                if neighbor is not None:
-                    dfs(neighbor, cluster.copy(), depth + 1, path + (neighbor,))
-
-            # Add completed path-based cluster
-            if len(cluster) > 1:
-                clusters.append(cluster)
-
+        index = self._graph_index()
+        condition_key = _condition_key(relationship_condition)
+        cache_key = (condition_key, depth_limit, max_clusters_per_node)
+        if condition_key is not None and cache_key in index.clusters:
+            return [set(cluster) for cluster in index.clusters[cache_key]]
+
+        neighbors: t.Dict[uuid.UUID, t.List[Node]] = {}
+
+        def get_neighbors(node: Node) -> t.List[Node]:
+            # nodes reachable from `node` through one matching relationship
+            if node.id not in neighbors:
+                neighbors[node.id] = [
+                    rel.target
+                    for rel in self.get_out_relationships(node)
+                    if relationship_condition(rel)
+                ] + [
+                    rel.source
+                    for rel in self.get_in_relationships(node)
+                    if rel.bidirectional and relationship_condition(rel)
+                ]
+            return neighbors[node.id]
+
+        node_clusters: t.List[t.List[t.FrozenSet[Node]]] = []
         for node in self.nodes:
-            initial_cluster = set()
-            dfs(node, initial_cluster, 0, (node,))
-
-        # Remove duplicates by converting clusters to frozensets
-        unique_clusters = [
-            set(cluster) for cluster in set(frozenset(c) for c in clusters)
-        ]
-
-        return unique_clusters
+            found: t.Dict[t.FrozenSet[Node], None] = {}
+            # the nodes on a path and the node it ends in
+            frontier: t.Dict[t.Tuple[t.FrozenSet[Node], Node], None] = {
+                (frozenset([node]), node): None
+            }
+            for _ in range(depth_limit - 1):
+                next_frontier: t.Dict[t.Tuple[t.FrozenSet[Node], Node], None] = {}
+                level: t.Dict[t.FrozenSet[Node], None] = {}
+                for path_nodes, last in frontier:
+                    for neighbor in get_neighbors(last):
+                        if neighbor in path_nodes:
+                            continue
+                        cluster = path_nodes | {neighbor}
+                        level.setdefault(cluster, None)
+                        next_frontier.setdefault((cluster, neighbor), None)
+                        if len(level) == max_clusters_per_node:
+                            break
+                    if len(level) == max_clusters_per_node:
+                        break
+                found.update(level)
+                frontier = next_frontier
+                if not frontier:
+                    break
+            node_clusters.append(list(found))
+
+        clusters: t.Dict[t.FrozenSet[Node], None] = {}
+        for rank in range(max(map(len, node_clusters), default=0)):
+            for found_clusters in node_clusters:
+                if rank < len(found_clusters):
+                    clusters.setdefault(found_clusters[rank], None)
+
+        unique_clusters = list(clusters)
+        if condition_key is not None:
+            index.clusters[cache_key] = unique_clusters
+        return [set(cluster) for cluster in unique_clusters]
 
     def remove_node(
         self, node: Node, inplace: bool = True
@@ -337,28 +1186,24 @@ class KnowledgeGraph:
         ValueError
             If the node is not present in the knowledge graph.
         """
-        if node not in self.nodes:
+        if not self.has_node(node):
             raise ValueError("Node is not present in the knowledge graph.")
 
-        if inplace:
-            # Modify the current instance
-            self.nodes.remove(node)
-            self.relationships = [
-                rel
-                for rel in self.relationships
-                if rel.source != node and rel.target != node
-            ]
-        else:
-            # Create a deep copy and modify it
+        if not inplace:
             new_graph = deepcopy(self)
-            new_graph.nodes.remove(node)
-            new_graph.relationships = [
-                rel
-                for rel in new_graph.relationships
-                if rel.source != node and rel.target != node
-            ]
+            new_graph.remove_node(node)
             return new_graph
 
+        index = self._graph_index()
+        index.remove_node(node)
+        self.nodes = [n for n in self.nodes if n.id != node.id]
+        relationships = self.relationships
+        if not isinstance(relationships, RelationshipStore):
+            relationships = RelationshipStore(relationships)
+        self.relationships = relationships.where_nodes(lambda n: n.id != node.id)
+        index.relationships = self.relationships
+        index.signature = self._signature()
+
     def find_two_nodes_single_rel(
         self, relationship_condition: t.Callable[[Relationship], bool] = lambda _: True
     ) -> t.List[t.Tuple[Node, Relationship, Node]]:
@@ -5,7 +5,7 @@ import numpy as np
 from langchain_core.callbacks import Callbacks
 from pydantic import BaseModel
 
-from ragas.executor import run_async_batch
+from ragas.executor import arun_async_batch, run_async_batch
 from ragas.llms.base import BaseRagasLLM
 from ragas.prompt import PydanticPrompt, StringIO
 from ragas.testset.graph import KnowledgeGraph, Node
@@ -90,6 +90,53 @@ def generate_personas_from_kg(
             The list of generated personas.
     """
 
+    kwargs_list = _persona_generation_kwargs(
+        kg, llm, num_personas, filter_fn, callbacks
+    )
+    # use run_async_batch to generate personas in parallel
+    persona_list = run_async_batch(
+        desc="Generating personas",
+        func=persona_generation_prompt.generate,
+        kwargs_list=kwargs_list,
+    )
+
+    return persona_list
+
+
+async def agenerate_personas_from_kg(
+    kg: KnowledgeGraph,
+    llm: BaseRagasLLM,
+    persona_generation_prompt: PersonaGenerationPrompt = PersonaGenerationPrompt(),
+    num_personas: int = 3,
+    filter_fn: t.Callable[[Node], bool] = default_filter,
+    callbacks: Callbacks = [],
+) -> t.List[Persona]:
+    """
+    Async version of `generate_personas_from_kg` that runs on the caller's event loop.
+    """
+    kwargs_list = _persona_generation_kwargs(
+        kg, llm, num_personas, filter_fn, callbacks
+    )
+    persona_list = await arun_async_batch(
+        desc="Generating personas",
+        func=persona_generation_prompt.generate,
+        kwargs_list=kwargs_list,
+    )
+
+    return persona_list
+
+
+def _persona_generation_kwargs(
+    kg: KnowledgeGraph,
+    llm: BaseRagasLLM,
+    num_personas: int,
+    filter_fn: t.Callable[[Node], bool],
+    callbacks: Callbacks,
+) -> t.List[t.Dict[str, t.Any]]:
+    """
+    Pick representative summaries from clusters of similar documents and build
+    the arguments for one persona generation call per summary.
+    """
     nodes = [node for node in kg.nodes if filter_fn(node)]
     if len(nodes) == 0:
         raise ValueError(
@@ -104,7 +151,7 @@ def generate_personas_from_kg(
     for node in nodes:
         embeddings.append(node.properties.get("summary_embedding"))
 
-    embeddings = np.array(embeddings)
+    embeddings = np.asarray(embeddings, dtype=np.float32)
     cosine_similarities = np.dot(embeddings, embeddings.T)
 
     groups = []
@@ -132,8 +179,7 @@ def generate_personas_from_kg(
             np.random.choice(top_summaries, num_personas - len(top_summaries))
         )
 
-    # use run_async_batch to generate personas in parallel
-    kwargs_list = [
+    return [
         {
             "llm": llm,
             "data": StringIO(text=summary),
@@ -142,10 +188,3 @@ def generate_personas_from_kg(
         }
         for summary in top_summaries[:num_personas]
     ]
-    persona_list = run_async_batch(
-        desc="Generating personas",
-        func=persona_generation_prompt.generate,
-        kwargs_list=kwargs_list,
-    )
-
-    return persona_list
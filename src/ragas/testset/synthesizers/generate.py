@@ -16,11 +16,11 @@ from ragas.embeddings.base import (
     LangchainEmbeddingsWrapper,
     LlamaIndexEmbeddingsWrapper,
 )
-from ragas.executor import Executor
+from ragas.executor import Executor, run
 from ragas.llms import BaseRagasLLM, LangchainLLMWrapper, LlamaIndexLLMWrapper
 from ragas.run_config import RunConfig
 from ragas.testset.graph import KnowledgeGraph, Node, NodeType
-from ragas.testset.persona import Persona, generate_personas_from_kg
+from ragas.testset.persona import Persona, agenerate_personas_from_kg
 from ragas.testset.synthesizers import default_query_distribution
 from ragas.testset.synthesizers.testset_schema import Testset, TestsetSample
 from ragas.testset.synthesizers.utils import calculate_split_values
@@ -324,6 +324,36 @@ class TestsetGenerator:
         4. Generate samples for each scenario.
         5. Compile the results into an EvaluationDataset.
         """
+        return run(
+            self.agenerate(
+                testset_size=testset_size,
+                query_distribution=query_distribution,
+                num_personas=num_personas,
+                run_config=run_config,
+                batch_size=batch_size,
+                callbacks=callbacks,
+                token_usage_parser=token_usage_parser,
+                with_debugging_logs=with_debugging_logs,
+                raise_exceptions=raise_exceptions,
+            )
+        )
+
+    async def agenerate(
+        self,
+        testset_size: int,
+        query_distribution: t.Optional[QueryDistribution] = None,
+        num_personas: int = 3,
+        run_config: t.Optional[RunConfig] = None,
+        batch_size: t.Optional[int] = None,
+        callbacks: t.Optional[Callbacks] = None,
+        token_usage_parser: t.Optional[TokenUsageParser] = None,
+        with_debugging_logs=False,
+        raise_exceptions: bool = True,
+    ) -> Testset:
+        """
+        Async version of `generate` that runs on the caller's event loop. Takes the
+        same parameters and returns the same `Testset`.
+        """
         if run_config is not None:
             self.llm.set_run_config(run_config)
 
@@ -366,7 +396,7 @@ class TestsetGenerator:
             patch_logger("ragas.experimental.testset.transforms", logging.DEBUG)
 
         if self.persona_list is None:
-            self.persona_list = generate_personas_from_kg(
+            self.persona_list = await agenerate_personas_from_kg(
                 llm=self.llm,
                 kg=self.knowledge_graph,
                 num_personas=num_personas,
@@ -407,7 +437,7 @@ class TestsetGenerator:
             )
 
         try:
-            scenario_sample_list: t.List[t.List[BaseScenario]] = exec.results()
+            scenario_sample_list: t.List[t.List[BaseScenario]] = await exec.aresults()
         except Exception as e:
             scenario_generation_rm.on_chain_error(e)
             raise e
@@ -445,7 +475,7 @@ class TestsetGenerator:
                 )
 
         try:
-            eval_samples = exec.results()
+            eval_samples = await exec.aresults()
         except Exception as e:
             sample_generation_rm.on_chain_error(e)
             raise e
@@ -1,14 +1,25 @@
+import hashlib
+import json
 import logging
 import typing as t
+import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
+import numpy as np
 import tiktoken
 from tiktoken.core import Encoding
 
+from ragas.cache import fingerprint_model
 from ragas.llms import BaseRagasLLM, llm_factory
-from ragas.prompt import PromptMixin
-from ragas.testset.graph import KnowledgeGraph, Node, Relationship
+from ragas.prompt import PromptMixin, PydanticPrompt
+from ragas.testset.graph import (
+    KnowledgeGraph,
+    Node,
+    Relationship,
+    RelationshipBatch,
+    RelationshipStore,
+)
 
 DEFAULT_TOKENIZER = tiktoken.get_encoding("o200k_base")
 
@@ -19,6 +30,26 @@ def default_filter(node: Node) -> bool:
     return True
 
 
+def _prompt_fingerprint(prompt: PydanticPrompt) -> str:
+    """
+    Fingerprint of what a prompt asks the LLM: its instruction, examples,
+    language and the JSON schemas of its input and output models.
+    """
+    content = {
+        "name": prompt.name,
+        "language": prompt.language,
+        "instruction": prompt.instruction,
+        "examples": [
+            [example.model_dump(mode="json") for example in pair]
+            for pair in prompt.examples
+        ],
+        "input_model": prompt.input_model.model_json_schema(),
+        "output_model": prompt.output_model.model_json_schema(),
+    }
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
 @dataclass
 class BaseGraphTransformation(ABC):
     """
@@ -54,6 +85,32 @@ class BaseGraphTransformation(ABC):
         """
         pass
 
+    def input_properties(self) -> t.List[str]:
+        """
+        The node properties the transformation reads. A node whose input
+        properties did not change since the transformation last processed it is
+        skipped when the transformation is applied again.
+        """
+        return ["page_content"]
+
+    def transform_fingerprint(self) -> str:
+        """
+        Fingerprint of the transformation, its configuration, the content of its
+        prompts and the LLM or embedding model it uses.
+        """
+        parts = [fingerprint_model(self)]
+        for model_attribute in ("llm", "embedding_model"):
+            model = getattr(self, model_attribute, None)
+            if model is not None and hasattr(model, "model_fingerprint"):
+                parts.append(model.model_fingerprint())
+        if isinstance(self, PromptMixin):
+            prompts = self._get_prompts()
+            parts.extend(
+                f"{key}={_prompt_fingerprint(prompts[key])}" for key in sorted(prompts)
+            )
+        digest = hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+        return f"{self.name}:{digest}"
+
     def filter(self, kg: KnowledgeGraph) -> KnowledgeGraph:
         """
         Filters the KnowledgeGraph and returns the filtered graph.
@@ -69,13 +126,12 @@ class BaseGraphTransformation(ABC):
             The filtered knowledge graph.
         """
 
+        relationships = kg.relationships
+        if not isinstance(relationships, RelationshipStore):
+            relationships = RelationshipStore(relationships)
         return KnowledgeGraph(
             nodes=[node for node in kg.nodes if self.filter_nodes(node)],
-            relationships=[
-                rel
-                for rel in kg.relationships
-                if rel.source in kg.nodes and rel.target in kg.nodes
-            ],
+            relationships=relationships.where_nodes(kg.has_node),
         )
 
     @abstractmethod
@@ -174,9 +230,29 @@ class Extractor(BaseGraphTransformation):
             A list of coroutines to be executed in parallel.
         """
 
+        transform_key = self.transform_fingerprint()
+        input_properties = self.input_properties()
+        output_property = getattr(self, "property_name", None)
+
         async def apply_extract(node: Node):
+            fingerprint = node.content_hash(input_properties)
+            recorded = node.transform_fingerprints.get(transform_key)
+            if recorded == fingerprint:
+                return
+            if (
+                recorded is None
+                and output_property is not None
+                and node.get_property(output_property) is not None
+            ):
+                # extracted before fingerprints were recorded, or set by the user
+                node.transform_fingerprints[transform_key] = fingerprint
+                return
+
             property_name, property_value = await self.extract(node)
-            if node.get_property(property_name) is None:
+            if recorded is not None:
+                # the inputs changed, so the previous value is stale
+                node.properties[property_name.lower()] = property_value
+            elif node.get_property(property_name) is None:
                 node.add_property(property_name, property_value)
             else:
                 logger.warning(
@@ -184,6 +260,7 @@ class Extractor(BaseGraphTransformation):
                     property_name,
                     node.id,
                 )
+            node.transform_fingerprints[transform_key] = fingerprint
 
         filtered = self.filter(kg)
         return [apply_extract(node) for node in filtered.nodes]
@@ -217,16 +294,16 @@ class Splitter(BaseGraphTransformation):
 
     Methods
     -------
-    transform(kg: KnowledgeGraph) -> t.Tuple[t.List[Node], t.List[Relationship]]
+    transform(kg: KnowledgeGraph) -> t.Tuple[t.List[Node], t.Sequence[Relationship]]
         Transforms the KnowledgeGraph by splitting its nodes into smaller chunks.
 
-    split(node: Node) -> t.Tuple[t.List[Node], t.List[Relationship]]
+    split(node: Node) -> t.Tuple[t.List[Node], t.Sequence[Relationship]]
         Abstract method to split a node into smaller chunks.
     """
 
     async def transform(
         self, kg: KnowledgeGraph
-    ) -> t.Tuple[t.List[Node], t.List[Relationship]]:
+    ) -> t.Tuple[t.List[Node], t.Sequence[Relationship]]:
         """
         Transforms the KnowledgeGraph by splitting its nodes into smaller chunks.
 
@@ -237,13 +314,13 @@ class Splitter(BaseGraphTransformation):
 
         Returns
         -------
-        t.Tuple[t.List[Node], t.List[Relationship]]
+        t.Tuple[t.List[Node], t.Sequence[Relationship]]
             A tuple containing a list of new nodes and a list of new relationships.
         """
         filtered = self.filter(kg)
 
         all_nodes = []
-        all_relationships = []
+        all_relationships = RelationshipStore()
         for node in filtered.nodes:
             nodes, relationships = await self.split(node)
             all_nodes.extend(nodes)
@@ -252,7 +329,9 @@ class Splitter(BaseGraphTransformation):
         return all_nodes, all_relationships
 
     @abstractmethod
-    async def split(self, node: Node) -> t.Tuple[t.List[Node], t.List[Relationship]]:
+    async def split(
+        self, node: Node
+    ) -> t.Tuple[t.List[Node], t.Sequence[Relationship]]:
         """
         Abstract method to split a node into smaller chunks.
 
@@ -263,7 +342,7 @@ class Splitter(BaseGraphTransformation):
 
         Returns
         -------
-        t.Tuple[t.List[Node], t.List[Relationship]]
+        t.Tuple[t.List[Node], t.Sequence[Relationship]]
             A tuple containing a list of new nodes and a list of new relationships.
         """
         pass
@@ -283,10 +362,28 @@ class Splitter(BaseGraphTransformation):
             A list of coroutines to be executed in parallel.
         """
 
+        transform_key = self.transform_fingerprint()
+        input_properties = self.input_properties()
+
         async def apply_split(node: Node):
+            fingerprint = node.content_hash(input_properties)
+            recorded = node.transform_fingerprints.get(transform_key)
+            if recorded == fingerprint:
+                return
+            children = [rel.target for rel in kg.get_out_relationships(node, "child")]
+            if recorded is None and children:
+                # split before fingerprints were recorded
+                node.transform_fingerprints[transform_key] = fingerprint
+                return
+            # the chunks of a node whose content changed are replaced
+            for child in children:
+                if kg.has_node(child):
+                    kg.remove_node(child)
+
             nodes, relationships = await self.split(node)
             kg.nodes.extend(nodes)
             kg.relationships.extend(relationships)
+            node.transform_fingerprints[transform_key] = fingerprint
 
         filtered = self.filter(kg)
         return [apply_split(node) for node in filtered.nodes]
@@ -298,12 +395,12 @@ class RelationshipBuilder(BaseGraphTransformation):
 
     Methods
     -------
-    transform(kg: KnowledgeGraph) -> t.List[Relationship]
+    transform(kg: KnowledgeGraph) -> t.Sequence[Relationship]
         Transforms the KnowledgeGraph by building relationships.
     """
 
     @abstractmethod
-    async def transform(self, kg: KnowledgeGraph) -> t.List[Relationship]:
+    async def transform(self, kg: KnowledgeGraph) -> t.Sequence[Relationship]:
         """
         Transforms the KnowledgeGraph by building relationships.
 
@@ -314,11 +411,64 @@ class RelationshipBuilder(BaseGraphTransformation):
 
         Returns
         -------
-        t.List[Relationship]
-            A list of new relationships.
+        t.Sequence[Relationship]
+            The new relationships, e.g. a list or a `RelationshipBatch`.
         """
         pass
 
+    def relationship_type(self) -> t.Optional[str]:
+        """
+        The type of the relationships the builder creates. Builders that return it
+        are updated incrementally: when they are applied again, only the
+        relationships involving new or changed nodes are rebuilt.
+        """
+        return None
+
+    def pairwise(self) -> bool:
+        """
+        Whether the relationship between two nodes only depends on these two nodes.
+        If not, all the relationships of the builder are rebuilt when a node
+        changes, instead of only the ones involving the changed nodes.
+        """
+        return True
+
+    async def transform_incremental(
+        self, kg: KnowledgeGraph, changed: t.Set[uuid.UUID]
+    ) -> t.Sequence[Relationship]:
+        """
+        Builds the relationships involving at least one of the `changed` nodes.
+
+        The default implementation builds all relationships and keeps the ones
+        touching a changed node; builders override it to skip the other pairs.
+
+        Parameters
+        ----------
+        kg : KnowledgeGraph
+            The (filtered) knowledge graph.
+        changed : Set[uuid.UUID]
+            Ids of the new or changed nodes.
+
+        Returns
+        -------
+        t.Sequence[Relationship]
+            The new relationships.
+        """
+        relationships = await self.transform(kg)
+        if isinstance(relationships, RelationshipBatch):
+            touched = np.fromiter(
+                (node.id in changed for node in relationships.nodes),
+                dtype=bool,
+                count=len(relationships.nodes),
+            )
+            return relationships.select(
+                touched[relationships.source] | touched[relationships.target]
+            )
+        return [
+            rel
+            for rel in relationships
+            if rel.source.id in changed or rel.target.id in changed
+        ]
+
     def generate_execution_plan(self, kg: KnowledgeGraph) -> t.List[t.Coroutine]:
         """
         Generates a list of coroutines to be executed in parallel by the Executor.
@@ -333,12 +483,49 @@ class RelationshipBuilder(BaseGraphTransformation):
         t.List[t.Coroutine]
             A list of coroutines to be executed in parallel.
         """
+        transform_key = self.transform_fingerprint()
+        input_properties = self.input_properties()
+        rel_type = self.relationship_type()
 
         async def apply_build_relationships(
             filtered_kg: KnowledgeGraph, original_kg: KnowledgeGraph
         ):
-            relationships = await self.transform(filtered_kg)
+            if rel_type is None:
+                relationships = await self.transform(filtered_kg)
+                original_kg.relationships.extend(relationships)
+                return
+
+            fingerprints = {
+                node.id: node.content_hash(input_properties)
+                for node in filtered_kg.nodes
+            }
+            if any(
+                transform_key in node.transform_fingerprints
+                for node in filtered_kg.nodes
+            ):
+                changed = {
+                    node.id
+                    for node in filtered_kg.nodes
+                    if node.transform_fingerprints.get(transform_key)
+                    != fingerprints[node.id]
+                }
+                if not changed:
+                    return
+                if not self.pairwise():
+                    changed = set(fingerprints)
+                original_kg.relationships = t.cast(
+                    RelationshipStore, original_kg.relationships
+                ).without(rel_type, lambda node: node.id in changed)
+                relationships = await self.transform_incremental(filtered_kg, changed)
+            else:
+                # relationships built before fingerprints were recorded are replaced
+                original_kg.relationships = t.cast(
+                    RelationshipStore, original_kg.relationships
+                ).without(rel_type, lambda node: node.id in fingerprints)
+                relationships = await self.transform(filtered_kg)
             original_kg.relationships.extend(relationships)
+            for node in filtered_kg.nodes:
+                node.transform_fingerprints[transform_key] = fingerprints[node.id]
 
         filtered_kg = self.filter(kg)
         return [apply_build_relationships(filtered_kg=filtered_kg, original_kg=kg)]
@@ -383,9 +570,17 @@ class NodeFilter(BaseGraphTransformation):
         Generates a list of coroutines to be executed
         """
 
+        transform_key = self.transform_fingerprint()
+        input_properties = self.input_properties()
+
         async def apply_filter(node: Node):
+            fingerprint = node.content_hash(input_properties)
+            if node.transform_fingerprints.get(transform_key) == fingerprint:
+                return
             if await self.custom_filter(node, kg):
                 kg.remove_node(node)
+            else:
+                node.transform_fingerprints[transform_key] = fingerprint
 
         filtered = self.filter(kg)
         return [apply_filter(node) for node in filtered.nodes]
@@ -91,6 +91,13 @@ def apply_transforms(
 ):
     """
     Apply a list of transformations to a knowledge graph in place.
+
+    Every transformation records on the nodes it processed a fingerprint of its
+    configuration and of the node properties it read. Applying the same
+    transformations again therefore only processes new or changed nodes, and
+    relationship builders only rebuild the relationships involving them, e.g.
+    load a saved graph, add the nodes of new documents and apply the
+    transformations once more.
     """
     # apply nest_asyncio to fix the event loop issue in jupyter
     apply_nest_asyncio()
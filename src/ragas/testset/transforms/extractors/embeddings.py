@@ -25,6 +25,9 @@ class EmbeddingExtractor(Extractor):
     embed_property_name: str = "page_content"
     embedding_model: BaseRagasEmbeddings = field(default_factory=embedding_factory)
 
+    def input_properties(self) -> t.List[str]:
+        return [self.embed_property_name]
+
     async def extract(self, node: Node) -> t.Tuple[str, t.Any]:
         """
         Extracts the embedding for a given node.
@@ -39,5 +42,5 @@ class EmbeddingExtractor(Extractor):
             raise ValueError(
                 f"node.property('{self.embed_property_name}') must be a string, found '{type(text)}'"
             )
-        embedding = self.embedding_model.embed_query(text)
+        embedding = await self.embedding_model.embed_text(text)
         return self.property_name, embedding
@@ -61,6 +61,9 @@ class CustomNodeFilter(LLMBasedNodeFilter):
     min_score: int = 2
     rubrics: t.Dict[str, str] = field(default_factory=lambda: DEFAULT_RUBRICS)
 
+    def input_properties(self) -> t.List[str]:
+        return ["page_content", "summary"]
+
     async def custom_filter(self, node: Node, kg: KnowledgeGraph) -> bool:
 
         if node.type.name == "CHUNK":
@@ -1,61 +1,326 @@
 import typing as t
+import uuid
 from dataclasses import dataclass
 
 import numpy as np
 
-from ragas.testset.graph import KnowledgeGraph, NodeType, Relationship
+from ragas.testset.graph import (
+    KnowledgeGraph,
+    NodeType,
+    Relationship,
+    RelationshipBatch,
+)
 from ragas.testset.transforms.base import RelationshipBuilder
 
 
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+def _iter_tiles(n: int, block_size: int) -> t.Iterator[t.Tuple[int, int, int, int]]:
+    # tiles of the upper triangle, including the ones on the diagonal
+    for row_start in range(0, n, block_size):
+        row_end = min(row_start + block_size, n)
+        for col_start in range(row_start, n, block_size):
+            yield row_start, row_end, col_start, min(col_start + block_size, n)
+
+
+def _pairs_above(
+    normalized: np.ndarray, threshold: float, block_size: int
+) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Every pair (i, j, similarity) with i < j and similarity >= threshold."""
+    rows, cols, scores = [], [], []
+    for row_start, row_end, col_start, col_end in _iter_tiles(
+        len(normalized), block_size
+    ):
+        tile = normalized[row_start:row_end] @ normalized[col_start:col_end].T
+        tile_rows, tile_cols = np.nonzero(tile >= threshold)
+        tile_scores = tile[tile_rows, tile_cols]
+        tile_rows += row_start
+        tile_cols += col_start
+        upper = tile_rows < tile_cols
+        rows.append(tile_rows[upper])
+        cols.append(tile_cols[upper])
+        scores.append(tile_scores[upper])
+    if not rows:
+        return _pair_arrays({})
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+
+
+def _pairs_touching(
+    normalized: np.ndarray, changed: np.ndarray, threshold: float, block_size: int
+) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The pairs of `_pairs_above` with at least one node in the `changed` mask."""
+    changed_rows = np.flatnonzero(changed)
+    rows, cols, scores = [], [], []
+    for start in range(0, len(changed_rows), block_size):
+        block = changed_rows[start : start + block_size]
+        tile = normalized[block] @ normalized.T
+        tile_rows, tile_cols = np.nonzero(tile >= threshold)
+        tile_scores = tile[tile_rows, tile_cols]
+        tile_rows = block[tile_rows]
+        # pairs of two changed nodes are found from both sides, keep one of them
+        keep = (tile_rows != tile_cols) & (
+            ~changed[tile_cols] | (tile_rows < tile_cols)
+        )
+        rows.append(np.minimum(tile_rows, tile_cols)[keep])
+        cols.append(np.maximum(tile_rows, tile_cols)[keep])
+        scores.append(tile_scores[keep])
+    if not rows:
+        return _pair_arrays({})
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+
+
+def _pair_arrays(
+    pairs: t.Dict[t.Tuple[int, int], float],
+) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sorted (rows, cols, scores) arrays of a pair -> similarity mapping."""
+    ordered = sorted(pairs.items())
+    return (
+        np.fromiter((i for (i, _), _ in ordered), dtype=np.int64, count=len(ordered)),
+        np.fromiter((j for (_, j), _ in ordered), dtype=np.int64, count=len(ordered)),
+        np.fromiter((s for _, s in ordered), dtype=np.float32, count=len(ordered)),
+    )
+
+
+def _top_k_pairs(
+    normalized: np.ndarray, threshold: float, top_k: int, block_size: int
+) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pairs above the threshold that are among the top k neighbours of either node."""
+    n = len(normalized)
+    k = min(top_k, max(n - 1, 0))
+    if k == 0:
+        return _pair_arrays({})
+    best_scores = np.full((n, k), -np.inf, dtype=np.float32)
+    best_indices = np.full((n, k), -1, dtype=np.int64)
+
+    def update(rows: slice, scores: np.ndarray, col_start: int):
+        candidates = np.concatenate([best_scores[rows], scores], axis=1)
+        candidate_indices = np.concatenate(
+            [
+                best_indices[rows],
+                np.broadcast_to(
+                    np.arange(col_start, col_start + scores.shape[1]), scores.shape
+                ),
+            ],
+            axis=1,
+        )
+        keep = np.argpartition(-candidates, k - 1, axis=1)[:, :k]
+        best_scores[rows] = np.take_along_axis(candidates, keep, axis=1)
+        best_indices[rows] = np.take_along_axis(candidate_indices, keep, axis=1)
+
+    for row_start, row_end, col_start, col_end in _iter_tiles(n, block_size):
+        tile = normalized[row_start:row_end] @ normalized[col_start:col_end].T
+        tile[tile < threshold] = -np.inf
+        if row_start == col_start:
+            np.fill_diagonal(tile, -np.inf)
+        update(slice(row_start, row_end), tile, col_start)
+        if row_start != col_start:
+            update(slice(col_start, col_end), tile.T, row_start)
+
+    pairs: t.Dict[t.Tuple[int, int], float] = {}
+    for i, (scores, indices) in enumerate(zip(best_scores, best_indices)):
+        for score, j in zip(scores.tolist(), indices.tolist()):
+            if j < 0 or score == -np.inf:
+                continue
+            pairs[(min(i, j), max(i, j))] = score
+    return _pair_arrays(pairs)
+
+
+def _ann_pairs(
+    normalized: np.ndarray,
+    threshold: float,
+    num_candidates: int,
+    ef_search: int,
+    ef_construction: int,
+    m: int,
+    top_k: t.Optional[int],
+    block_size: int,
+) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Candidate pairs from an HNSW index, reranked with the exact similarity.
+
+    Every node is queried for its `num_candidates` approximate nearest neighbours,
+    so a node can be related to at most that many nodes (plus the ones that find
+    it among their own candidates).
+    """
+    try:
+        import hnswlib
+    except ImportError as exc:
+        raise ImportError(
+            "hnswlib is required for the approximate nearest neighbour index. "
+            "Please install it with `pip install hnswlib`."
+        ) from exc
+
+    n, dim = normalized.shape
+    k = min(num_candidates + 1, n)
+    if k <= 1:
+        return _pair_arrays({})
+    index = hnswlib.Index(space="ip", dim=dim)
+    index.init_index(max_elements=n, ef_construction=ef_construction, M=m)
+    index.add_items(normalized, np.arange(n))
+    index.set_ef(max(ef_search, k))
+
+    pairs: t.Dict[t.Tuple[int, int], float] = {}
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        labels, _ = index.knn_query(normalized[start:end], k=k)
+        labels = labels.astype(np.int64)
+        # exact rerank of the candidates, the index distances are approximate
+        scores = np.einsum(
+            "ij,ikj->ik", normalized[start:end], normalized[labels], dtype=np.float32
+        )
+        rows = np.arange(start, end)[:, None]
+        scores[(labels == rows) | (scores < threshold)] = -np.inf
+        if top_k is not None and top_k < k:
+            keep = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+            scores = np.take_along_axis(scores, keep, axis=1)
+            labels = np.take_along_axis(labels, keep, axis=1)
+        row_indices, col_indices = np.nonzero(scores > -np.inf)
+        for i, j, score in zip(
+            (row_indices + start).tolist(),
+            labels[row_indices, col_indices].tolist(),
+            scores[row_indices, col_indices].tolist(),
+        ):
+            pairs[(min(i, j), max(i, j))] = score
+    return _pair_arrays(pairs)
+
+
 @dataclass
 class CosineSimilarityBuilder(RelationshipBuilder):
+    """
+    Builds relationships between nodes whose embeddings have a cosine similarity
+    of at least `threshold`.
+
+    The similarities are computed in float32 tiles of `block_size` x `block_size`
+    over the upper triangle only, so memory use stays bounded by the tile size
+    instead of growing with the square of the number of nodes.
+
+    Attributes
+    ----------
+    property_name : str
+        The node property holding the embedding.
+    new_property_name : str
+        The relationship property the similarity is stored in.
+    threshold : float
+        Minimum cosine similarity for two nodes to be related.
+    block_size : int
+        Number of rows and columns of a similarity tile.
+    top_k : int, optional
+        If set, every node is only related to its `top_k` most similar nodes above
+        the threshold (a pair is kept if it is in the top k of either node).
+    index : str
+        "exact" compares all pairs, "hnsw" retrieves candidate neighbours from an
+        approximate nearest neighbour index (requires `hnswlib`) and keeps the
+        ones whose exact similarity is above the threshold. The approximate index
+        scales to millions of nodes but may miss some pairs.
+    ann_num_candidates : int
+        Number of approximate neighbours retrieved per node with the "hnsw" index.
+    ann_ef_search : int
+        Size of the HNSW search queue, higher values trade speed for recall.
+    ann_ef_construction : int
+        Size of the HNSW queue used while building the index.
+    ann_m : int
+        Number of links per node in the HNSW graph.
+    """
+
     property_name: str = "embedding"
     new_property_name: str = "cosine_similarity"
     threshold: float = 0.9
+    block_size: int = 1024
+    top_k: t.Optional[int] = None
+    index: t.Literal["exact", "hnsw"] = "exact"
+    ann_num_candidates: int = 32
+    ann_ef_search: int = 64
+    ann_ef_construction: int = 200
+    ann_m: int = 16
+
+    def input_properties(self) -> t.List[str]:
+        return [self.property_name]
+
+    def relationship_type(self) -> t.Optional[str]:
+        return "cosine_similarity"
+
+    def pairwise(self) -> bool:
+        # the top k neighbours of a node change when similar nodes are added
+        return self.top_k is None
 
     def _find_similar_embedding_pairs(
         self, embeddings: np.ndarray, threshold: float
     ) -> t.List[t.Tuple[int, int, float]]:
-        # Normalize the embeddings
-        normalized = embeddings / np.linalg.norm(embeddings, axis=1)[:, np.newaxis]
-
-        # Calculate cosine similarity matrix
-        similarity_matrix = np.dot(normalized, normalized.T)
-        # Find pairs with similarity >= threshold
-        similar_pairs = np.argwhere(similarity_matrix >= threshold)
-
-        # Filter out self-comparisons and duplicate pairs
-        return [
-            (pair[0], pair[1], similarity_matrix[pair[0], pair[1]])
-            for pair in similar_pairs
-            if pair[0] < pair[1]
-        ]
+        rows, cols, scores = self._find_similar_embedding_arrays(embeddings, threshold)
+        return list(zip(rows.tolist(), cols.tolist(), scores.tolist()))
 
-    async def transform(self, kg: KnowledgeGraph) -> t.List[Relationship]:
-        if self.property_name is None:
-            self.property_name = "embedding"
+    def _find_similar_embedding_arrays(
+        self, embeddings: np.ndarray, threshold: float
+    ) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The (rows, cols, similarities) arrays of the similar pairs, rows < cols."""
+        normalized = _normalize(embeddings)
+        if self.index == "hnsw":
+            return _ann_pairs(
+                normalized,
+                threshold,
+                num_candidates=self.ann_num_candidates,
+                ef_search=self.ann_ef_search,
+                ef_construction=self.ann_ef_construction,
+                m=self.ann_m,
+                top_k=self.top_k,
+                block_size=self.block_size,
+            )
+        if self.index != "exact":
+            raise ValueError(f"index must be 'exact' or 'hnsw', got '{self.index}'")
+        if self.top_k is not None:
+            return _top_k_pairs(normalized, threshold, self.top_k, self.block_size)
+        return _pairs_above(normalized, threshold, self.block_size)
 
+    def _embeddings(self, kg: KnowledgeGraph) -> np.ndarray:
         embeddings = []
         for node in kg.nodes:
             embedding = node.get_property(self.property_name)
             if embedding is None:
                 raise ValueError(f"Node {node.id} has no {self.property_name}")
             embeddings.append(embedding)
+        return np.asarray(embeddings, dtype=np.float32)
 
-        similar_pairs = self._find_similar_embedding_pairs(
-            np.array(embeddings), self.threshold
+    def _batch(
+        self,
+        kg: KnowledgeGraph,
+        pairs: t.Tuple[np.ndarray, np.ndarray, np.ndarray],
+    ) -> RelationshipBatch:
+        rows, cols, similarities = pairs
+        return RelationshipBatch(
+            kg.nodes,
+            rows,
+            cols,
+            type=self.relationship_type(),
+            properties={self.new_property_name: similarities},
+            bidirectional=True,
         )
 
-        return [
-            Relationship(
-                source=kg.nodes[i],
-                target=kg.nodes[j],
-                type="cosine_similarity",
-                properties={self.new_property_name: similarity_float},
-                bidirectional=True,
-            )
-            for i, j, similarity_float in similar_pairs
-        ]
+    async def transform(self, kg: KnowledgeGraph) -> RelationshipBatch:
+        if self.property_name is None:
+            self.property_name = "embedding"
+
+        return self._batch(
+            kg,
+            self._find_similar_embedding_arrays(self._embeddings(kg), self.threshold),
+        )
+
+    async def transform_incremental(
+        self, kg: KnowledgeGraph, changed: t.Set[uuid.UUID]
+    ) -> t.Sequence[Relationship]:
+        if self.index != "exact" or self.top_k is not None:
+            return await super().transform_incremental(kg, changed)
+        changed_mask = np.fromiter(
+            (node.id in changed for node in kg.nodes), dtype=bool, count=len(kg.nodes)
+        )
+        normalized = _normalize(self._embeddings(kg))
+        return self._batch(
+            kg,
+            _pairs_touching(normalized, changed_mask, self.threshold, self.block_size),
+        )
 
 
 @dataclass
@@ -64,6 +329,9 @@ class SummaryCosineSimilarityBuilder(CosineSimilarityBuilder):
     new_property_name: str = "summary_cosine_similarity"
     threshold: float = 0.1
 
+    def relationship_type(self) -> t.Optional[str]:
+        return "summary_cosine_similarity"
+
     def filter(self, kg: KnowledgeGraph) -> KnowledgeGraph:
         """
         Filters the knowledge graph to only include nodes with a summary embedding.
@@ -77,7 +345,7 @@ class SummaryCosineSimilarityBuilder(CosineSimilarityBuilder):
                 nodes.append(node)
         return KnowledgeGraph(nodes=nodes)
 
-    async def transform(self, kg: KnowledgeGraph) -> t.List[Relationship]:
+    async def transform(self, kg: KnowledgeGraph) -> RelationshipBatch:
         embeddings = [
             node.get_property(self.property_name)
             for node in kg.nodes
@@ -85,16 +353,9 @@ class SummaryCosineSimilarityBuilder(CosineSimilarityBuilder):
         ]
         if not embeddings:
             raise ValueError(f"No nodes have a valid {self.property_name}")
-        similar_pairs = self._find_similar_embedding_pairs(
-            np.array(embeddings), self.threshold
+        return self._batch(
+            kg,
+            self._find_similar_embedding_arrays(
+                np.asarray(embeddings, dtype=np.float32), self.threshold
+            ),
         )
-        return [
-            Relationship(
-                source=kg.nodes[i],
-                target=kg.nodes[j],
-                type="summary_cosine_similarity",
-                properties={self.new_property_name: similarity_float},
-                bidirectional=True,
-            )
-            for i, j, similarity_float in similar_pairs
-        ]
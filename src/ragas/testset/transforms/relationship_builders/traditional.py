@@ -1,70 +1,252 @@
+import math
+import re
 import typing as t
-from collections import Counter
+import uuid
+import zlib
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 
+import numpy as np
+
 from ragas.metrics._string import DistanceMeasure
-from ragas.testset.graph import KnowledgeGraph, Node, Relationship
+from ragas.testset.graph import KnowledgeGraph, Node, Relationship, RelationshipBatch
 from ragas.testset.transforms.base import RelationshipBuilder
 
+_TOKEN = re.compile(r"\w+")
+
 
 @dataclass
 class JaccardSimilarityBuilder(RelationshipBuilder):
+    """
+    Builds relationships between nodes whose item sets (e.g. entities) have a
+    Jaccard similarity of at least `threshold`.
+
+    Each node's item set is computed once and an inverted index from item to nodes
+    is used to count the shared items, so only pairs sharing at least one item are
+    scored. For very large graphs `use_lsh` replaces the inverted index with
+    MinHash signatures and locality sensitive hashing, which only proposes pairs
+    that are likely to be similar; the candidates are still scored exactly.
+
+    Attributes
+    ----------
+    property_name : str
+        The node property holding the items.
+    key_name : str, optional
+        If set, the items are read from this key of the property.
+    new_property_name : str
+        The relationship property the similarity is stored in.
+    threshold : float
+        Minimum Jaccard similarity for two nodes to be related.
+    use_lsh : bool
+        Use MinHash/LSH instead of the inverted index to find candidate pairs.
+    num_perm : int
+        Number of hash functions in a MinHash signature.
+    lsh_bands : int
+        Number of LSH bands the signatures are split into, must divide `num_perm`.
+        More bands find more pairs with a low similarity at the cost of more
+        candidates.
+    """
+
     property_name: str = "entities"
     key_name: t.Optional[str] = None
     new_property_name: str = "jaccard_similarity"
     threshold: float = 0.5
+    use_lsh: bool = False
+    num_perm: int = 128
+    lsh_bands: int = 32
+
+    def input_properties(self) -> t.List[str]:
+        return [self.property_name]
+
+    def relationship_type(self) -> t.Optional[str]:
+        return "jaccard_similarity"
 
     def _jaccard_similarity(self, set1: t.Set[str], set2: t.Set[str]) -> float:
         intersection = len(set1.intersection(set2))
         union = len(set1.union(set2))
         return intersection / union if union > 0 else 0.0
 
-    async def transform(self, kg: KnowledgeGraph) -> t.List[Relationship]:
-        if self.property_name is None:
-            self.property_name
+    def _item_sets(self, nodes: t.List[Node]) -> t.List[t.Set[str]]:
+        item_sets = []
+        for node in nodes:
+            items = node.get_property(self.property_name)
+            if items is None:
+                raise ValueError(f"Node {node.id} has no {self.property_name}")
+            if self.key_name is not None:
+                items = items.get(self.key_name, [])
+            item_sets.append(set(items))
+        return item_sets
+
+    def _shared_item_counts(
+        self,
+        item_sets: t.List[t.Set[str]],
+        changed: t.Optional[t.List[bool]] = None,
+    ) -> t.Dict[t.Tuple[int, int], int]:
+        # number of shared items of every pair that shares at least one, only the
+        # pairs with a changed node if `changed` is given
+        inverted_index: t.Dict[str, t.List[int]] = defaultdict(list)
+        for i, items in enumerate(item_sets):
+            for item in items:
+                inverted_index[item].append(i)
+        counts: t.Dict[t.Tuple[int, int], int] = defaultdict(int)
+        for postings in inverted_index.values():
+            for a, i in enumerate(postings):
+                for j in postings[a + 1 :]:
+                    if changed is None or changed[i] or changed[j]:
+                        counts[(i, j)] += 1
+        return counts
+
+    def _lsh_candidates(
+        self, item_sets: t.List[t.Set[str]]
+    ) -> t.Set[t.Tuple[int, int]]:
+        if self.num_perm % self.lsh_bands != 0:
+            raise ValueError(
+                f"lsh_bands ({self.lsh_bands}) must divide num_perm ({self.num_perm})"
+            )
+        rows = self.num_perm // self.lsh_bands
+        prime = np.uint64((1 << 31) - 1)
+        rng = np.random.default_rng(0)
+        a = rng.integers(1, int(prime), size=self.num_perm, dtype=np.uint64)
+        b = rng.integers(0, int(prime), size=self.num_perm, dtype=np.uint64)
+
+        buckets: t.Dict[t.Tuple[int, bytes], t.List[int]] = defaultdict(list)
+        for i, items in enumerate(item_sets):
+            if not items:
+                continue
+            hashes = (
+                np.fromiter(
+                    (zlib.crc32(str(item).encode()) for item in items),
+                    dtype=np.uint64,
+                    count=len(items),
+                )
+                % prime
+            )
+            signature = ((np.outer(hashes, a) + b) % prime).min(axis=0)
+            for band in range(self.lsh_bands):
+                key = signature[band * rows : (band + 1) * rows].tobytes()
+                buckets[(band, key)].append(i)
+
+        candidates = set()
+        for bucket in buckets.values():
+            for a_index, i in enumerate(bucket):
+                for j in bucket[a_index + 1 :]:
+                    candidates.add((i, j))
+        return candidates
+
+    async def transform(self, kg: KnowledgeGraph) -> RelationshipBatch:
+        return self._similarity_batch(kg)
+
+    async def transform_incremental(
+        self, kg: KnowledgeGraph, changed: t.Set[uuid.UUID]
+    ) -> t.Sequence[Relationship]:
+        return self._similarity_batch(kg, [node.id in changed for node in kg.nodes])
+
+    def _similarity_batch(
+        self, kg: KnowledgeGraph, changed: t.Optional[t.List[bool]] = None
+    ) -> RelationshipBatch:
+        item_sets = self._item_sets(kg.nodes)
+
+        def touches_changed(pair: t.Tuple[int, int]) -> bool:
+            return changed is None or changed[pair[0]] or changed[pair[1]]
 
         similar_pairs = []
-        for i, node1 in enumerate(kg.nodes):
-            for j, node2 in enumerate(kg.nodes):
-                if i >= j:
-                    continue
-                items1 = node1.get_property(self.property_name)
-                items2 = node2.get_property(self.property_name)
-                if items1 is None or items2 is None:
-                    raise ValueError(
-                        f"Node {node1.id} or {node2.id} has no {self.property_name}"
-                    )
-                if self.key_name is not None:
-                    items1 = items1.get(self.key_name, [])
-                    items2 = items2.get(self.key_name, [])
-                similarity = self._jaccard_similarity(set(items1), set(items2))
+        if self.threshold <= 0:
+            # pairs without shared items qualify too, so every pair is scored
+            candidates = (
+                (i, j)
+                for i in range(len(item_sets))
+                for j in range(i + 1, len(item_sets))
+            )
+            for i, j in filter(touches_changed, candidates):
+                similarity = self._jaccard_similarity(item_sets[i], item_sets[j])
+                if similarity >= self.threshold:
+                    similar_pairs.append((i, j, similarity))
+        elif self.use_lsh:
+            lsh_candidates = filter(touches_changed, self._lsh_candidates(item_sets))
+            for i, j in sorted(lsh_candidates):
+                similarity = self._jaccard_similarity(item_sets[i], item_sets[j])
+                if similarity >= self.threshold:
+                    similar_pairs.append((i, j, similarity))
+        else:
+            shared_counts = self._shared_item_counts(item_sets, changed)
+            for (i, j), shared in sorted(shared_counts.items()):
+                similarity = shared / (len(item_sets[i]) + len(item_sets[j]) - shared)
                 if similarity >= self.threshold:
                     similar_pairs.append((i, j, similarity))
 
-        return [
-            Relationship(
-                source=kg.nodes[i],
-                target=kg.nodes[j],
-                type="jaccard_similarity",
-                properties={self.new_property_name: similarity_float},
-                bidirectional=True,
-            )
-            for i, j, similarity_float in similar_pairs
-        ]
+        return RelationshipBatch(
+            kg.nodes,
+            [i for i, _, _ in similar_pairs],
+            [j for _, j, _ in similar_pairs],
+            type="jaccard_similarity",
+            properties={
+                self.new_property_name: [
+                    similarity for _, _, similarity in similar_pairs
+                ]
+            },
+            bidirectional=True,
+        )
 
 
 @dataclass
 class OverlapScoreBuilder(RelationshipBuilder):
+    """
+    Builds relationships between nodes whose items (e.g. entities) overlap, where
+    two items overlap if their string similarity (one minus the distance, on
+    lowercased items) is at least `distance_threshold`. The overlap score of a
+    node pair is the fraction of item pairs that overlap, noisy items (the most
+    common ones across the graph) are left out.
+
+    Each node's items are lowercased once and all the distances between a node's
+    distinct items and the distinct items of the nodes after it are computed in a
+    single `rapidfuzz.process.cdist` call. Repeated items still count once per
+    occurrence in the score. `prune_candidates` only compares nodes whose items
+    share a word, which is faster on large graphs but misses pairs that only
+    overlap through fuzzy matches of different words (e.g. "colour" and "color").
+
+    When the builder is applied again, only the pairs involving new or changed
+    nodes are scored. The noisy items are recomputed over the whole graph, the
+    scores of unchanged pairs are kept as they were.
+
+    Attributes
+    ----------
+    property_name : str
+        The node property holding the items.
+    key_name : str, optional
+        If set, the items are read from this key of the property.
+    new_property_name : str
+        Suffix of the relationship property the overlap score is stored in.
+    distance_measure : DistanceMeasure
+        The string distance used to compare items.
+    distance_threshold : float
+        Minimum similarity for two items to overlap.
+    threshold : float
+        Minimum overlap score for two nodes to be related.
+    prune_candidates : bool
+        Only compare nodes whose items share at least one word, by default False.
+    workers : int
+        Number of threads rapidfuzz uses to compute the distances, -1 for all
+        cores.
+    """
+
     property_name: str = "entities"
     key_name: t.Optional[str] = None
     new_property_name: str = "overlap_score"
     distance_measure: DistanceMeasure = DistanceMeasure.JARO_WINKLER
     distance_threshold: float = 0.9
     threshold: float = 0.01
+    prune_candidates: bool = False
+    workers: int = -1
+
+    def input_properties(self) -> t.List[str]:
+        return [self.property_name]
+
+    def relationship_type(self) -> t.Optional[str]:
+        return f"{self.property_name}_overlap"
 
     def __post_init__(self):
         try:
-            from rapidfuzz import distance
+            from rapidfuzz import distance, process
         except ImportError:
             raise ImportError(
                 "rapidfuzz is required for string distance. Please install it using `pip install rapidfuzz`"
@@ -76,6 +258,7 @@ class OverlapScoreBuilder(RelationshipBuilder):
             DistanceMeasure.JARO: distance.Jaro,
             DistanceMeasure.JARO_WINKLER: distance.JaroWinkler,
         }
+        self._cdist = process.cdist
 
     def _overlap_score(self, overlaps: t.List[bool]) -> float:
 
@@ -103,53 +286,129 @@ class OverlapScoreBuilder(RelationshipBuilder):
         ]
         return noisy_list
 
-    async def transform(self, kg: KnowledgeGraph) -> t.List[Relationship]:
-        if self.property_name is None:
-            self.property_name
+    def _node_items(
+        self, nodes: t.List[Node], noisy_items: t.Set[str]
+    ) -> t.List[t.Tuple[t.List[str], t.List[str], np.ndarray]]:
+        """
+        The distinct lowercased non noisy items of every node, the items themselves
+        and the index of every item in the distinct ones.
+        """
+        node_items = []
+        for node in nodes:
+            items = node.get_property(self.property_name)
+            if items is None:
+                raise ValueError(f"Node {node.id} has no {self.property_name}")
+            if self.key_name is not None:
+                items = items.get(self.key_name, [])
+            items = [item for item in items if item not in noisy_items]
+            unique: t.Dict[str, int] = {}
+            inverse = [unique.setdefault(item.lower(), len(unique)) for item in items]
+            node_items.append((list(unique), items, np.array(inverse, dtype=np.intp)))
+        return node_items
 
+    def _candidates(
+        self,
+        node_items: t.List[t.Tuple[t.List[str], t.List[str], np.ndarray]],
+        changed: t.Optional[t.List[bool]] = None,
+    ) -> t.List[t.List[int]]:
+        """
+        For every node i, the nodes j > i it has to be compared with. If `changed`
+        is given, only the pairs with at least one changed node are kept.
+        """
+        candidates = self._all_candidates(node_items)
+        if changed is None:
+            return candidates
+        return [
+            c if changed[i] else [j for j in c if changed[j]]
+            for i, c in enumerate(candidates)
+        ]
+
+    def _all_candidates(
+        self, node_items: t.List[t.Tuple[t.List[str], t.List[str], np.ndarray]]
+    ) -> t.List[t.List[int]]:
+        n = len(node_items)
+        if not self.prune_candidates or self.threshold <= 0:
+            return [list(range(i + 1, n)) for i in range(n)]
+
+        inverted_index: t.Dict[str, t.List[int]] = defaultdict(list)
+        for i, (lowered, _, _) in enumerate(node_items):
+            for token in {token for item in lowered for token in _TOKEN.findall(item)}:
+                inverted_index[token].append(i)
+        candidates: t.List[t.Set[int]] = [set() for _ in range(n)]
+        for postings in inverted_index.values():
+            for a, i in enumerate(postings):
+                candidates[i].update(postings[a + 1 :])
+        return [sorted(c) for c in candidates]
+
+    async def transform(self, kg: KnowledgeGraph) -> RelationshipBatch:
+        return self._overlap_batch(kg)
+
+    async def transform_incremental(
+        self, kg: KnowledgeGraph, changed: t.Set[uuid.UUID]
+    ) -> t.Sequence[Relationship]:
+        return self._overlap_batch(kg, [node.id in changed for node in kg.nodes])
+
+    def _overlap_batch(
+        self, kg: KnowledgeGraph, changed: t.Optional[t.List[bool]] = None
+    ) -> RelationshipBatch:
         distance_measure = self.distance_measure_map[self.distance_measure]
-        noisy_items = self._get_noisy_items(kg.nodes, self.property_name)
-        relationships = []
-        for i, node_x in enumerate(kg.nodes):
-            for j, node_y in enumerate(kg.nodes):
-                if i >= j:
+        noisy_items = set(self._get_noisy_items(kg.nodes, self.property_name))
+        node_items = self._node_items(kg.nodes, noisy_items)
+
+        # distances above the cutoff are clipped by rapidfuzz, which is fine as
+        # they are too far apart to overlap either way
+        max_distance = 1 - self.distance_threshold
+        if max_distance < 0:
+            score_cutoff = None
+        elif self.distance_measure in (
+            DistanceMeasure.JARO,
+            DistanceMeasure.JARO_WINKLER,
+        ):
+            score_cutoff = max_distance + 1e-9
+        else:
+            score_cutoff = math.floor(max_distance)
+
+        sources, targets, similarities, overlapped = [], [], [], []
+        for i, candidates in enumerate(self._candidates(node_items, changed)):
+            x_lowered, x_items, x_inverse = node_items[i]
+            choices = [item for j in candidates for item in node_items[j][0]]
+            if x_lowered and choices:
+                distances = self._cdist(
+                    x_lowered,
+                    choices,
+                    scorer=distance_measure.distance,
+                    score_cutoff=score_cutoff,
+                    workers=self.workers,
+                )
+                verdicts = (1 - distances) >= self.distance_threshold
+            else:
+                verdicts = np.zeros((len(x_lowered), len(choices)), dtype=bool)
+
+            offset = 0
+            for j in candidates:
+                y_lowered, y_items, y_inverse = node_items[j]
+                # one row and column per item, repeated items included
+                block = verdicts[:, offset : offset + len(y_lowered)][
+                    np.ix_(x_inverse, y_inverse)
+                ]
+                offset += len(y_lowered)
+                similarity = float(block.sum()) / block.size if block.size else 0.0
+                if similarity < self.threshold:
                     continue
-                node_x_items = node_x.get_property(self.property_name)
-                node_y_items = node_y.get_property(self.property_name)
-                if node_x_items is None or node_y_items is None:
-                    raise ValueError(
-                        f"Node {node_x.id} or {node_y.id} has no {self.property_name}"
-                    )
-                if self.key_name is not None:
-                    node_x_items = node_x_items.get(self.key_name, [])
-                    node_y_items = node_y_items.get(self.key_name, [])
-
-                overlaps = []
-                overlapped_items = []
-                for x in node_x_items:
-                    if x not in noisy_items:
-                        for y in node_y_items:
-                            if y not in noisy_items:
-                                similarity = 1 - distance_measure.distance(
-                                    x.lower(), y.lower()
-                                )
-                                verdict = similarity >= self.distance_threshold
-                                overlaps.append(verdict)
-                                if verdict:
-                                    overlapped_items.append((x, y))
-
-                similarity = self._overlap_score(overlaps)
-                if similarity >= self.threshold:
-                    relationships.append(
-                        Relationship(
-                            source=node_x,
-                            target=node_y,
-                            type=f"{self.property_name}_overlap",
-                            properties={
-                                f"{self.property_name}_{self.new_property_name}": similarity,
-                                "overlapped_items": overlapped_items,
-                            },
-                        )
-                    )
-
-        return relationships
+                sources.append(i)
+                targets.append(j)
+                similarities.append(similarity)
+                overlapped.append(
+                    [(x_items[a], y_items[b]) for a, b in zip(*np.nonzero(block))]
+                )
+
+        return RelationshipBatch(
+            kg.nodes,
+            sources,
+            targets,
+            type=self.relationship_type(),
+            properties={
+                f"{self.property_name}_{self.new_property_name}": similarities,
+                "overlapped_items": overlapped,
+            },
+        )
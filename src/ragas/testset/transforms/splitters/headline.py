@@ -1,14 +1,31 @@
 import typing as t
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from ragas.testset.graph import Node, NodeType, Relationship
+import numpy as np
+
+from ragas.testset.graph import (
+    Node,
+    NodeType,
+    Relationship,
+    RelationshipBatch,
+    RelationshipStore,
+)
 from ragas.testset.transforms.base import Splitter
 
 
+def _is_document(node: Node) -> bool:
+    return node.type == NodeType.DOCUMENT
+
+
 @dataclass
 class HeadlineSplitter(Splitter):
     min_tokens: int = 300
     max_tokens: int = 1000
+    # the chunks are not split again when the transforms are applied again
+    filter_nodes: t.Callable[[Node], bool] = field(default_factory=lambda: _is_document)
+
+    def input_properties(self) -> t.List[str]:
+        return ["page_content", "headlines"]
 
     def adjust_chunks(self, chunks):
         adjusted_chunks = []
@@ -43,7 +60,9 @@ class HeadlineSplitter(Splitter):
 
         return adjusted_chunks
 
-    async def split(self, node: Node) -> t.Tuple[t.List[Node], t.List[Relationship]]:
+    async def split(
+        self, node: Node
+    ) -> t.Tuple[t.List[Node], t.Sequence[Relationship]]:
         text = node.get_property("page_content")
         if text is None:
             raise ValueError("'page_content' property not found in this node")
@@ -74,25 +93,17 @@ class HeadlineSplitter(Splitter):
             for chunk in chunks
         ]
 
-        # create the relationships for children
-        relationships = []
-        for child_node in nodes:
-            relationships.append(
-                Relationship(
-                    type="child",
-                    source=node,
-                    target=child_node,
-                )
+        # children of the original node (position 0) followed by links between
+        # consecutive chunks (positions 1..n)
+        batch_nodes = [node] + nodes
+        positions = np.arange(1, len(batch_nodes))
+        relationships = RelationshipStore()
+        relationships.extend(
+            RelationshipBatch(
+                batch_nodes, np.zeros_like(positions), positions, type="child"
             )
-
-        # create the relationships for the next nodes
-        for i, child_node in enumerate(nodes):
-            if i < len(nodes) - 1:
-                relationships.append(
-                    Relationship(
-                        type="next",
-                        source=child_node,
-                        target=nodes[i + 1],
-                    )
-                )
+        )
+        relationships.extend(
+            RelationshipBatch(batch_nodes, positions[:-1], positions[1:], type="next")
+        )
         return nodes, relationships
@@ -1,9 +1,19 @@
 import asyncio
+import threading
 
 import pytest
 
 from ragas import cacher
-from ragas.cache import DiskCacheBackend, _generate_cache_key, _make_hashable
+from ragas.cache import (
+    CACHE_MISS,
+    CacheInterface,
+    CacheKeyError,
+    DiskCacheBackend,
+    TieredCacheBackend,
+    _canonical_bytes,
+    _generate_cache_key,
+    fingerprint_model,
+)
 
 
 @pytest.fixture(scope="function")
@@ -18,12 +28,14 @@ def cache_backend(temp_cache_dir):
     return DiskCacheBackend(cache_dir=temp_cache_dir)
 
 
-def test_make_hashable():
-    """Test that _make_hashable converts various objects into a hashable structure."""
-    data = {"tuple": (1, 2), "list": [3, 4], "set": {5, 6}, "dict": {"a": 1, "b": 2}}
-    result = _make_hashable(data)
-    assert isinstance(result, tuple)
-    assert len(result) == len(data)
+def test_canonical_encoding_is_unambiguous():
+    """Test that different values never share an encoding."""
+    values = [None, 1, 1.0, "1", True, [1], (1,), {"1": 1}, {1}, ["a", "b"], ["ab"]]
+    encodings = [_canonical_bytes(v) for v in values]
+    # lists and tuples are deliberately encoded the same way
+    assert len(set(encodings)) == len(values) - 1
+    assert _canonical_bytes({"b": 1, "a": 2}) == _canonical_bytes({"a": 2, "b": 1})
+    assert _canonical_bytes({3, 1, 2}) == _canonical_bytes({2, 3, 1})
 
 
 def test_generate_cache_key():
@@ -40,6 +52,89 @@ def test_generate_cache_key():
     assert key1 != key3, "Cache keys should differ if kwargs differ"
 
 
+def test_generate_cache_key_is_canonical():
+    """Test that equivalent calls share a key and method arguments are not dropped."""
+
+    def generate(prompt, n=1, temperature=None, callbacks=None):
+        return prompt
+
+    key = _generate_cache_key(generate, ("hi",), {})
+    assert key == _generate_cache_key(generate, (), {"prompt": "hi", "n": 1})
+    assert key == _generate_cache_key(generate, ("hi",), {"callbacks": [object()]})
+    assert key != _generate_cache_key(generate, ("hi",), {"n": 2})
+
+    class Embedder:
+        def embed_documents(self, texts):
+            return texts
+
+    embedder = Embedder()
+    assert _generate_cache_key(
+        embedder.embed_documents, (["a"],), {}
+    ) != _generate_cache_key(embedder.embed_documents, (["b"],), {})
+
+
+def test_generate_cache_key_is_stable_across_processes():
+    """Test that keys of prompt values do not depend on the process."""
+    import subprocess
+    import sys
+
+    code = "\n".join(
+        [
+            "from langchain_core.prompt_values import StringPromptValue",
+            "from ragas.cache import _generate_cache_key",
+            "def agenerate_text(prompt, n=1, temperature=None, stop=None): pass",
+            "prompt = StringPromptValue(text='hi')",
+            # a plain object, its default repr holds its address
+            "stop = type('Stop', (), {})()",
+            "stop.words = ['end']",
+            "print(_generate_cache_key(agenerate_text, (prompt,), {'stop': stop}))",
+        ]
+    )
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        for _ in range(2)
+    }
+    assert len(keys) == 1
+
+
+def test_generate_cache_key_encodes_objects_by_their_attributes():
+    """Test that objects are encoded by their attributes, not their address."""
+
+    class Settings:
+        def __init__(self, model):
+            self.model = model
+
+    def generate(prompt, settings):
+        return prompt
+
+    key = _generate_cache_key(generate, ("hi", Settings("a")), {})
+    assert key == _generate_cache_key(generate, ("hi", Settings("a")), {})
+    assert key != _generate_cache_key(generate, ("hi", Settings("b")), {})
+
+    settings = Settings("a")
+    settings.parent = settings
+    with pytest.raises(CacheKeyError):
+        _generate_cache_key(generate, ("hi", settings), {})
+    with pytest.raises(CacheKeyError):
+        _generate_cache_key(generate, ("hi", object()), {})
+
+
+def test_calls_without_a_stable_key_are_not_cached(cache_backend):
+    """Test that calls with an opaque argument run every time."""
+    call_count = {"count": 0}
+
+    @cacher(cache_backend=cache_backend)
+    def with_lock(lock):
+        call_count["count"] += 1
+        return call_count["count"]
+
+    lock = threading.Lock()
+    assert with_lock(lock) == 1
+    assert with_lock(lock) == 2
+
+
 def test_no_cache_backend():
     """Test that if no cache backend is provided, results are not cached."""
     call_count = {"count": 0}
@@ -114,3 +209,290 @@ def test_caching_with_different_args(cache_backend):
     # Different arguments, cache miss
     assert multiply(3, 3) == 9
     assert call_count["count"] == 2
+
+
+def test_get_or_miss_distinguishes_cached_none(cache_backend):
+    """Test that a cached None is returned instead of being treated as a miss."""
+    assert cache_backend.get_or_miss("key") is CACHE_MISS
+    cache_backend.set("key", None)
+    assert cache_backend.get_or_miss("key") is None
+
+
+@pytest.mark.asyncio
+async def test_async_backend_does_not_block_event_loop(cache_backend):
+    """Test that async lookups and writes run off the event loop thread."""
+    import threading
+
+    loop_thread = threading.get_ident()
+    io_threads = set()
+    get_or_miss, set_ = cache_backend.get_or_miss, cache_backend.set
+
+    def recording_get_or_miss(key):
+        io_threads.add(threading.get_ident())
+        return get_or_miss(key)
+
+    def recording_set(key, value):
+        io_threads.add(threading.get_ident())
+        set_(key, value)
+
+    cache_backend.get_or_miss = recording_get_or_miss
+    cache_backend.set = recording_set
+
+    assert await cache_backend.aget_or_miss("key") is CACHE_MISS
+    await cache_backend.aset("key", "value")
+    assert await cache_backend.aget_or_miss("key") == "value"
+    assert io_threads and loop_thread not in io_threads
+
+
+@pytest.mark.asyncio
+async def test_async_cacher_uses_a_single_lookup():
+    """Test that a cache hit in the async wrapper costs one lookup and no has_key."""
+
+    class CountingBackend(CacheInterface):
+        def __init__(self):
+            self.store = {}
+            self.calls = []
+
+        def get(self, key):
+            self.calls.append("get")
+            return self.store[key]
+
+        def set(self, key, value):
+            self.calls.append("set")
+            self.store[key] = value
+
+        def has_key(self, key):
+            self.calls.append("has_key")
+            return key in self.store
+
+        async def aget_or_miss(self, key):
+            self.calls.append("aget_or_miss")
+            return self.store.get(key, CACHE_MISS)
+
+    backend = CountingBackend()
+
+    @cacher(cache_backend=backend)
+    async def double(x):
+        return x * 2
+
+    assert await double(2) == 4
+    backend.calls.clear()
+    assert await double(2) == 4
+    assert backend.calls == ["aget_or_miss"]
+
+
+@pytest.mark.asyncio
+async def test_async_cacher_coalesces_identical_in_flight_calls(cache_backend):
+    """Test that concurrent identical calls share a single execution."""
+    call_count = {"count": 0}
+
+    @cacher(cache_backend=cache_backend)
+    async def generate(prompt, n=1, temperature=None):
+        call_count["count"] += 1
+        await asyncio.sleep(0.05)
+        return prompt.upper()
+
+    results = await asyncio.gather(*[generate("hi") for _ in range(5)])
+    assert results == ["HI"] * 5
+    assert call_count["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_cacher_gives_coalesced_callers_their_own_copy(cache_backend):
+    """Test that a caller modifying its result does not affect the others."""
+
+    @cacher(cache_backend=cache_backend)
+    async def generate(prompt, n=1, temperature=None):
+        await asyncio.sleep(0.05)
+        return {"text": prompt, "seen_by": []}
+
+    async def generate_and_modify(caller):
+        result = await generate("hi")
+        result["seen_by"].append(caller)
+        return result
+
+    results = await asyncio.gather(*[generate_and_modify(i) for i in range(3)])
+    assert [result["seen_by"] for result in results] == [[0], [1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_async_cacher_does_not_coalesce_sampling_calls(cache_backend):
+    """Test that calls asking for diverse samples are not merged."""
+    call_count = {"count": 0}
+
+    @cacher(cache_backend=cache_backend)
+    async def generate(prompt, n=1, temperature=None):
+        call_count["count"] += 1
+        await asyncio.sleep(0.05)
+        return prompt
+
+    await asyncio.gather(*[generate("hi", temperature=0.7) for _ in range(3)])
+    assert call_count["count"] == 3
+
+    await asyncio.gather(*[generate("hey", n=3) for _ in range(3)])
+    assert call_count["count"] == 6
+
+
+@pytest.mark.asyncio
+async def test_async_cacher_coalesce_opt_out(cache_backend):
+    """Test that coalescing can be disabled on the decorator."""
+    call_count = {"count": 0}
+
+    @cacher(cache_backend=cache_backend, coalesce=False)
+    async def generate(prompt):
+        call_count["count"] += 1
+        await asyncio.sleep(0.05)
+        return prompt
+
+    await asyncio.gather(*[generate("hi") for _ in range(3)])
+    assert call_count["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_async_cacher_shares_errors_and_recovers_from_cancellation(
+    cache_backend,
+):
+    """Test that joined callers see the leader's error and retry if it is cancelled."""
+    call_count = {"count": 0}
+
+    @cacher(cache_backend=cache_backend)
+    async def failing(prompt):
+        call_count["count"] += 1
+        await asyncio.sleep(0.05)
+        raise ValueError(prompt)
+
+    results = await asyncio.gather(
+        *[failing("boom") for _ in range(3)], return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+    assert call_count["count"] == 1
+
+    @cacher(cache_backend=cache_backend)
+    async def slow(prompt):
+        await asyncio.sleep(0.05)
+        return prompt
+
+    leader = asyncio.create_task(slow("x"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(slow("x"))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "x"
+
+
+def test_tiered_cache_promotes_disk_hits_to_memory(temp_cache_dir):
+    """Test that values are served from memory and survive in the disk tier."""
+    backend = TieredCacheBackend(cache_dir=temp_cache_dir)
+    assert backend.get_or_miss("key") is CACHE_MISS
+    backend.set("key", "value")
+    assert backend.get_or_miss("key") == "value"
+
+    # a fresh backend over the same directory only has the disk tier populated
+    reopened = TieredCacheBackend(cache_dir=temp_cache_dir)
+    assert reopened.get("key") == "value"
+    assert reopened.get("key") == "value"
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 0
+    assert backend.stats()["misses"] == 1
+
+
+def test_tiered_cache_evicts_least_recently_used(temp_cache_dir):
+    """Test that the memory tier is bounded by entry count and by bytes."""
+    backend = TieredCacheBackend(cache_dir=temp_cache_dir, max_memory_items=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+    assert set(backend._memory) == {"a", "c"}
+    assert backend.stats()["evictions"] == 1
+    # evicted entries are still served by the disk tier
+    assert backend.get("b") == 2
+
+    small = TieredCacheBackend(cache_dir=temp_cache_dir, max_memory_bytes=1000)
+    small.set("x", "x" * 600)
+    small.set("y", "y" * 600)
+    assert list(small._memory) == ["y"]
+    assert small.stats()["memory_bytes"] <= 1000
+
+
+def test_tiered_cache_memory_tier_expires_and_returns_copies(
+    temp_cache_dir, monkeypatch
+):
+    """Test that the memory tier honours the ttl and never shares its values."""
+    now = {"time": 1000.0}
+    monkeypatch.setattr("ragas.cache.time.time", lambda: now["time"])
+    backend = TieredCacheBackend(cache_dir=temp_cache_dir, ttl=60)
+    backend.set("key", {"answer": [1]})
+
+    value = backend.get("key")
+    value["answer"].append(2)
+    assert backend.get("key") == {"answer": [1]}
+    assert backend.stats()["memory_hits"] == 2
+
+    now["time"] += 61
+    assert backend._memory_get("key") is CACHE_MISS
+    assert not backend.has_key("key")
+    assert backend.stats()["memory_items"] == 0
+
+    # entries promoted from disk keep the expiry of the disk entry
+    backend.disk.cache.set("promoted", "value", expire=10)
+    assert backend.get("promoted") == "value"
+    assert backend._memory["promoted"][1] is not None
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_with_async_cacher(temp_cache_dir):
+    """Test that the tiered backend works with the async cacher."""
+    backend = TieredCacheBackend(cache_dir=temp_cache_dir, ttl=60)
+    call_count = {"count": 0}
+
+    @cacher(cache_backend=backend)
+    async def double(x):
+        call_count["count"] += 1
+        return x * 2
+
+    assert await double(4) == 8
+    assert await double(4) == 8
+    assert call_count["count"] == 1
+    assert backend.stats()["memory_hits"] == 1
+
+
+def test_fingerprint_model_ignores_credentials_and_operational_settings():
+    """Test that only settings that change the model output are fingerprinted."""
+    from langchain_openai import ChatOpenAI
+
+    gpt4o = ChatOpenAI(model="gpt-4o", api_key="key-1", max_retries=1)
+    assert fingerprint_model(gpt4o) == fingerprint_model(
+        ChatOpenAI(model="gpt-4o", api_key="key-2", max_retries=5)
+    )
+    assert fingerprint_model(gpt4o) != fingerprint_model(
+        ChatOpenAI(model="gpt-4o-mini", api_key="key-1")
+    )
+    assert fingerprint_model(gpt4o) != fingerprint_model(
+        ChatOpenAI(model="gpt-4o", api_key="key-1", temperature=0.5)
+    )
+
+
+def test_wrappers_of_different_models_share_a_backend_safely(cache_backend):
+    """Test that cache entries are namespaced by the wrapped model."""
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from ragas.embeddings import LangchainEmbeddingsWrapper
+
+    small = LangchainEmbeddingsWrapper(
+        DeterministicFakeEmbedding(size=4), cache=cache_backend
+    )
+    large = LangchainEmbeddingsWrapper(
+        DeterministicFakeEmbedding(size=8), cache=cache_backend
+    )
+    assert len(small.embed_query("hello")) == 4
+    assert len(large.embed_query("hello")) == 8
+
+    same = LangchainEmbeddingsWrapper(
+        DeterministicFakeEmbedding(size=4), cache=cache_backend
+    )
+    assert same.embed_query("hello") == small.embed_query("hello")
+    # one entry per model configuration, reused by equally configured wrappers
+    assert len(cache_backend.cache) == 2
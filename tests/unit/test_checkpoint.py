@@ -0,0 +1,95 @@
+import typing as t
+from dataclasses import dataclass, field
+
+from langchain_core.callbacks import Callbacks
+
+from ragas import EvaluationCheckpoint, EvaluationDataset, SingleTurnSample, evaluate
+from ragas.checkpoint import dataset_fingerprint
+from ragas.metrics.base import MetricType, SingleTurnMetric
+from ragas.run_config import RunConfig
+
+
+@dataclass
+class CountingMatch(SingleTurnMetric):
+    name: str = "counting_match"
+    _required_columns: t.Dict[MetricType, t.Set[str]] = field(
+        default_factory=lambda: {MetricType.SINGLE_TURN: {"reference", "response"}}
+    )
+    calls: int = 0
+    fail_on: t.Optional[str] = None
+
+    def init(self, run_config: RunConfig):
+        pass
+
+    async def _single_turn_ascore(
+        self, sample: SingleTurnSample, callbacks: Callbacks
+    ) -> float:
+        self.calls += 1
+        if sample.response == self.fail_on:
+            raise ValueError("boom")
+        return float(sample.reference == sample.response)
+
+    async def _ascore(self, row: t.Dict, callbacks: Callbacks) -> float:
+        return await self._single_turn_ascore(SingleTurnSample(**row), callbacks)
+
+
+def _dataset(*responses: str) -> EvaluationDataset:
+    return EvaluationDataset(
+        samples=[SingleTurnSample(response=r, reference="foo") for r in responses]
+    )
+
+
+def test_dataset_fingerprint():
+    assert dataset_fingerprint(_dataset("foo", "bar")) == dataset_fingerprint(
+        _dataset("foo", "bar")
+    )
+    assert dataset_fingerprint(_dataset("foo", "bar")) != dataset_fingerprint(
+        _dataset("bar", "foo")
+    )
+
+
+def test_evaluate_resumes_from_checkpoint(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    dataset = _dataset("foo", "bar", "baz")
+
+    metric = CountingMatch(fail_on="baz")
+    first = evaluate(
+        dataset,
+        metrics=[metric],
+        checkpoint=EvaluationCheckpoint(path),
+        show_progress=False,
+    )
+    assert metric.calls == 3
+    assert first["counting_match"][:2] == [1.0, 0.0]
+
+    # only the failed job is run again
+    metric = CountingMatch()
+    second = evaluate(
+        dataset,
+        metrics=[metric],
+        checkpoint=EvaluationCheckpoint(path),
+        show_progress=False,
+    )
+    assert metric.calls == 1
+    assert second["counting_match"] == [1.0, 0.0, 0.0]
+
+    # everything is restored now
+    metric = CountingMatch()
+    third = evaluate(
+        dataset,
+        metrics=[metric],
+        checkpoint=EvaluationCheckpoint(path),
+        show_progress=False,
+    )
+    assert metric.calls == 0
+    assert third["counting_match"] == [1.0, 0.0, 0.0]
+
+    # a different dataset does not reuse the stored scores
+    metric = CountingMatch()
+    evaluate(
+        _dataset("foo"),
+        metrics=[metric],
+        checkpoint=EvaluationCheckpoint(path),
+        show_progress=False,
+    )
+    assert metric.calls == 1
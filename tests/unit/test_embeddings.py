@@ -1 +1,316 @@
 from __future__ import annotations
+
+import asyncio
+import sys
+import types
+import typing as t
+
+import numpy as np
+import pytest
+
+from ragas.embeddings.base import BaseRagasEmbeddings
+from ragas.run_config import RunConfig
+
+
+class LengthEmbedding(BaseRagasEmbeddings):
+    """Embeds a text as its length and records the batches it receives."""
+
+    def __init__(self, run_config: RunConfig):
+        super().__init__()
+        self.set_run_config(run_config)
+        self.batches: t.List[t.List[str]] = []
+
+    async def aembed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        self.batches.append(texts)
+        if "fail" in texts:
+            raise ValueError("cannot embed")
+        return [[float(len(text))] for text in texts]
+
+    async def aembed_query(self, text: str) -> t.List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    def embed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text: str) -> t.List[float]:
+        return [float(len(text))]
+
+
+@pytest.mark.asyncio
+async def test_embed_text_batches_concurrent_calls():
+    embeddings = LengthEmbedding(RunConfig(embedding_batch_size=4, max_retries=1))
+    texts = ["a", "bb", "ccc", "bb", "ddddd", "e"]
+
+    results = await asyncio.gather(*[embeddings.embed_text(text) for text in texts])
+
+    assert results == [[float(len(text))] for text in texts]
+    # a full batch of 4 is sent right away, the rest after the wait
+    assert embeddings.batches == [["a", "bb", "ccc"], ["ddddd", "e"]]
+
+
+@pytest.mark.asyncio
+async def test_embed_text_batch_errors_reach_every_caller():
+    embeddings = LengthEmbedding(RunConfig(embedding_batch_size=8, max_retries=1))
+
+    results = await asyncio.gather(
+        embeddings.embed_text("ok"),
+        embeddings.embed_text("fail"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(embeddings.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_embed_text_without_batching():
+    embeddings = LengthEmbedding(RunConfig(max_retries=1))
+
+    await asyncio.gather(*[embeddings.embed_text(text) for text in ["a", "b"]])
+
+    assert embeddings.batches == [["a"], ["b"]]
+
+
+class AsyncOnlyEmbedding(LengthEmbedding):
+    """Fails if anything calls the blocking embedding methods."""
+
+    def embed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        raise AssertionError("blocking embed_documents called")
+
+    def embed_query(self, text: str) -> t.List[float]:
+        raise AssertionError("blocking embed_query called")
+
+
+@pytest.mark.asyncio
+async def test_response_relevancy_embeds_asynchronously():
+    from ragas.metrics import ResponseRelevancy
+
+    embeddings = AsyncOnlyEmbedding(RunConfig(max_retries=1))
+    metric = ResponseRelevancy(embeddings=embeddings)
+
+    similarity = await metric.acalculate_similarity("abc", ["abcd", "ab"])
+
+    assert similarity.tolist() == pytest.approx([1.0, 1.0])
+
+
+class QueryPrefixEmbedding(LengthEmbedding):
+    """Embeds queries differently from documents, like asymmetric models."""
+
+    async def aembed_query(self, text: str) -> t.List[float]:
+        return [float(len(text)), 1.0]
+
+    async def aembed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        return [[float(len(text)), 0.0] for text in texts]
+
+    def embed_query(self, text: str) -> t.List[float]:
+        return [float(len(text)), 1.0]
+
+    def embed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        return [[float(len(text)), 0.0] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_response_relevancy_embeds_the_question_as_a_query():
+    from ragas.metrics import ResponseRelevancy
+
+    metric = ResponseRelevancy(
+        embeddings=QueryPrefixEmbedding(RunConfig(max_retries=1))
+    )
+    expected = [1 / np.sqrt(2)]
+
+    similarity = await metric.acalculate_similarity("a", ["b"])
+    np.testing.assert_allclose(similarity, expected, rtol=1e-6)
+    # the sync method is kept for existing callers
+    np.testing.assert_allclose(
+        metric.calculate_similarity("a", ["b"]), expected, rtol=1e-6
+    )
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_array_returns_float32_matrix():
+    embeddings = LengthEmbedding(RunConfig(max_retries=1))
+
+    array = await embeddings.embed_texts_array(["a", "bbb"])
+    assert array.dtype == np.float32
+    assert array.flags["C_CONTIGUOUS"]
+    assert array.tolist() == [[1.0], [3.0]]
+
+    await embeddings.precompute(["a", "cc"])
+    embeddings.batches.clear()
+    array = await embeddings.embed_texts_array(["cc", "dddd", "a"])
+    assert array.tolist() == [[2.0], [4.0], [1.0]]
+    # only the text that was not precomputed is embedded
+    assert embeddings.batches == [["dddd"]]
+    assert await embeddings.embed_texts(["cc"]) == [[2.0]]
+
+
+class StubEncoding:
+    def __init__(self, ids: t.List[int], length: int):
+        self.ids = ids + [0] * (length - len(ids))
+        self.attention_mask = [1] * len(ids) + [0] * (length - len(ids))
+
+
+class StubTokenizer:
+    """Tokenizes a text into the lengths of its words, padded to the batch."""
+
+    @classmethod
+    def from_file(cls, path: str) -> "StubTokenizer":
+        return cls()
+
+    def enable_truncation(self, max_length: int):
+        self.max_length = max_length
+
+    def enable_padding(self):
+        pass
+
+    def encode_batch(self, texts: t.List[str]) -> t.List[StubEncoding]:
+        ids = [
+            [len(word) for word in text.split()][: self.max_length] for text in texts
+        ]
+        length = max(len(i) for i in ids)
+        return [StubEncoding(i, length) for i in ids]
+
+
+class StubSession:
+    """Returns token embeddings [id, 1] and records the batch sizes it runs."""
+
+    batch_sizes: t.List[int] = []
+
+    def __init__(self, path, sess_options=None, providers=None):
+        StubSession.batch_sizes = []
+
+    def get_inputs(self):
+        return [
+            type("Input", (), {"name": name})
+            for name in ("input_ids", "attention_mask")
+        ]
+
+    def run(self, output_names, inputs):
+        assert set(inputs) == {"input_ids", "attention_mask"}
+        ids = inputs["input_ids"].astype(np.float64)
+        StubSession.batch_sizes.append(len(ids))
+        return [np.stack([ids, np.ones_like(ids)], axis=-1)]
+
+
+@pytest.fixture
+def onnx_embeddings(monkeypatch):
+    onnxruntime = types.ModuleType("onnxruntime")
+    onnxruntime.SessionOptions = type("SessionOptions", (), {})
+    onnxruntime.InferenceSession = StubSession
+    tokenizers = types.ModuleType("tokenizers")
+    tokenizers.Tokenizer = StubTokenizer
+    monkeypatch.setitem(sys.modules, "onnxruntime", onnxruntime)
+    monkeypatch.setitem(sys.modules, "tokenizers", tokenizers)
+
+    from ragas.embeddings.onnx_embeddings import OnnxEmbeddings
+
+    return lambda **kwargs: OnnxEmbeddings(model_path="model", **kwargs)
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_onnx_embeddings_pooling_and_normalization(onnx_embeddings):
+    texts = ["aaa b", "cc dddd ee"]
+
+    cls = onnx_embeddings(pooling="cls").encode(texts)
+    assert cls.dtype == np.float32
+    np.testing.assert_allclose(cls, [_unit([3, 1]), _unit([2, 1])], rtol=1e-6)
+
+    # padding tokens are left out of the mean
+    mean = onnx_embeddings(pooling="mean").encode(texts)
+    np.testing.assert_allclose(mean, [_unit([2, 1]), _unit([8 / 3, 1])], rtol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(mean, axis=1), 1.0, rtol=1e-6)
+
+    with pytest.raises(ValueError):
+        onnx_embeddings(pooling="max")
+
+
+@pytest.mark.asyncio
+async def test_onnx_embeddings_batches_keep_the_input_order(onnx_embeddings):
+    embeddings = onnx_embeddings(batch_size=2)
+    # the texts are sorted by length into batches, the first word identifies them
+    lengths = [5, 1, 4, 2, 3]
+    texts = [" ".join(["a" * n] + ["b"] * (n - 1)) for n in lengths]
+    expected = [_unit([n, 1]) for n in lengths]
+
+    np.testing.assert_allclose(embeddings.encode(texts), expected, rtol=1e-6)
+    assert sorted(StubSession.batch_sizes) == [1, 2, 2]
+
+    vectors = await embeddings.aembed_documents(["aa b", "c"])
+    np.testing.assert_allclose(vectors, [_unit([2, 1]), _unit([1, 1])], rtol=1e-6)
+    assert isinstance(vectors[0][0], float)
+    assert embeddings.encode([]).shape == (0, 0)
+
+
+def test_onnx_embeddings_model_fingerprint(onnx_embeddings):
+    fingerprint = onnx_embeddings().model_fingerprint()
+
+    assert fingerprint == onnx_embeddings().model_fingerprint()
+    assert fingerprint != onnx_embeddings(pooling="mean").model_fingerprint()
+    assert (
+        fingerprint
+        != onnx_embeddings(file_name="onnx/model_quantized.onnx").model_fingerprint()
+    )
+
+
+class PreciseEmbedding(LengthEmbedding):
+    """Embeds a text into values that float32 cannot represent exactly."""
+
+    async def aembed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        self.batches.append(texts)
+        return [[len(text) / 10, 1 / 3] for text in texts]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_size", [1, 4])
+async def test_list_embedding_apis_are_lossless(batch_size):
+    embeddings = PreciseEmbedding(
+        RunConfig(embedding_batch_size=batch_size, max_retries=1)
+    )
+    expected = [[0.1, 1 / 3], [0.2, 1 / 3]]
+
+    assert await embeddings.embed_text("a") == expected[0]
+    assert await embeddings.embed_texts(["a", "bb"]) == expected
+    await embeddings.precompute(["a"])
+    assert await embeddings.embed_text("a") == expected[0]
+    assert await embeddings.embed_texts(["a", "bb"]) == expected
+
+    array = await embeddings.embed_texts_array(["a", "bb"])
+    assert array.dtype == np.float32
+    np.testing.assert_array_equal(array, np.asarray(expected, dtype=np.float32))
+    assert (await embeddings.embed_text_array("bb")).dtype == np.float32
+
+
+def test_huggingface_encode_merges_encode_kwargs(monkeypatch):
+    from ragas.embeddings.base import HuggingfaceEmbeddings
+
+    class StubSentenceTransformer:
+        def encode(self, texts, **kwargs):
+            self.kwargs = kwargs
+            return np.ones((len(texts), 2), dtype=np.float64)
+
+    module = types.ModuleType("sentence_transformers.SentenceTransformer")
+    module.SentenceTransformer = StubSentenceTransformer
+    monkeypatch.setitem(
+        sys.modules, "sentence_transformers", types.ModuleType("sentence_transformers")
+    )
+    monkeypatch.setitem(
+        sys.modules, "sentence_transformers.SentenceTransformer", module
+    )
+
+    embeddings = types.SimpleNamespace(
+        model=StubSentenceTransformer(),
+        encode_kwargs={"convert_to_numpy": True, "convert_to_tensor": True},
+    )
+
+    array = HuggingfaceEmbeddings.encode(embeddings, ["a", "b"])
+
+    assert array.dtype == np.float32 and array.shape == (2, 2)
+    assert embeddings.model.kwargs == {
+        "normalize_embeddings": True,
+        "convert_to_tensor": False,
+        "convert_to_numpy": True,
+    }
@@ -0,0 +1,193 @@
+import asyncio
+import subprocess
+import sys
+import typing as t
+from dataclasses import dataclass, field
+
+import pytest
+
+from ragas import (
+    EvaluationDataset,
+    SingleTurnSample,
+    aevaluate,
+    aevaluate_iter,
+    evaluate,
+)
+from ragas.embeddings.base import BaseRagasEmbeddings
+from ragas.metrics import ExactMatch, SemanticSimilarity, StringPresence
+
+
+def _dataset():
+    return EvaluationDataset(
+        samples=[
+            SingleTurnSample(response="foo", reference="foo"),
+            SingleTurnSample(response="foo bar", reference="bar"),
+            SingleTurnSample(response="baz", reference="qux"),
+        ]
+    )
+
+
+def test_evaluate_scores_by_row():
+    result = evaluate(
+        _dataset(), metrics=[ExactMatch(), StringPresence()], show_progress=False
+    )
+    assert result.scores == [
+        {"exact_match": 1.0, "string_present": 1.0},
+        {"exact_match": 0.0, "string_present": 1.0},
+        {"exact_match": 0.0, "string_present": 0.0},
+    ]
+
+
+def test_aevaluate_iter_yields_completed_rows():
+    async def _run():
+        return [
+            row
+            async for row in aevaluate_iter(
+                _dataset(),
+                metrics=[ExactMatch(), StringPresence()],
+                show_progress=False,
+            )
+        ]
+
+    rows = asyncio.run(_run())
+    assert sorted(rows, key=lambda r: r[0]) == [
+        (0, {"exact_match": 1.0, "string_present": 1.0}),
+        (1, {"exact_match": 0.0, "string_present": 1.0}),
+        (2, {"exact_match": 0.0, "string_present": 0.0}),
+    ]
+
+
+@dataclass
+class StallingMatch(ExactMatch):
+    """Scores "foo" right away and waits forever on every other response."""
+
+    name: str = "stalling_match"
+
+    async def _single_turn_ascore(self, sample, callbacks) -> float:
+        if sample.response != "foo":
+            await asyncio.Event().wait()
+        return await super()._single_turn_ascore(sample, callbacks)
+
+
+@pytest.mark.parametrize("close", [True, False], ids=["aclose", "dropped"])
+def test_aevaluate_iter_cancels_jobs_when_stopped_early(close):
+    async def _run():
+        rows = aevaluate_iter(
+            _dataset(), metrics=[StallingMatch()], show_progress=False
+        )
+        async for row in rows:
+            break
+        if close:
+            await rows.aclose()
+        else:
+            # the event loop closes a dropped generator in a task of its own
+            del rows
+            for _ in range(10):
+                await asyncio.sleep(0)
+        others = asyncio.all_tasks() - {asyncio.current_task()}
+        return row, others
+
+    row, others = asyncio.run(_run())
+    assert row == (0, {"stalling_match": 1.0})
+    assert not others
+
+
+def test_sync_score_after_evaluate():
+    evaluate(_dataset(), metrics=[ExactMatch()], show_progress=False)
+    # evaluate closes its event loop, sync scoring must not depend on it
+    sample = SingleTurnSample(response="foo", reference="foo")
+    assert ExactMatch().single_turn_score(sample) == 1.0
+
+
+@pytest.mark.asyncio
+async def test_aevaluate_runs_on_running_loop():
+    result = await aevaluate(
+        _dataset(), metrics=[ExactMatch(), StringPresence()], show_progress=False
+    )
+    assert result["exact_match"] == [1.0, 0.0, 0.0]
+    assert result["string_present"] == [1.0, 1.0, 0.0]
+
+
+def test_import_does_not_patch_asyncio():
+    # nest_asyncio replaces asyncio.run when applied
+    code = "import asyncio, ragas; print(asyncio.run.__module__)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "asyncio.runners"
+
+
+class CountingEmbedding(BaseRagasEmbeddings):
+    def __init__(self):
+        super().__init__()
+        self.batches: t.List[t.List[str]] = []
+
+    async def aembed_documents(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0)
+        return [[1.0, float(len(text))] for text in texts]
+
+    async def aembed_query(self, text):
+        return (await self.aembed_documents([text]))[0]
+
+    def embed_documents(self, texts):
+        raise NotImplementedError
+
+    def embed_query(self, text):
+        raise NotImplementedError
+
+
+def test_evaluate_precomputes_embeddings_once_per_unique_text():
+    embeddings = CountingEmbedding()
+    result = evaluate(
+        _dataset(),
+        metrics=[SemanticSimilarity(embeddings=embeddings)],
+        show_progress=False,
+        precompute_embeddings=True,
+    )
+
+    assert embeddings.batches == [["foo", "bar", "foo bar", "qux", "baz"]]
+    assert result.scores[0]["semantic_similarity"] == pytest.approx(1.0)
+    assert embeddings._precomputed == {}
+
+
+@dataclass
+class GatedSimilarity(SemanticSimilarity):
+    """Waits for `gate` before scoring."""
+
+    gate: asyncio.Event = field(default_factory=asyncio.Event)
+
+    async def _ascore(self, row, callbacks) -> float:
+        await self.gate.wait()
+        return await super()._ascore(row, callbacks)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_keep_each_others_precomputed_embeddings():
+    embeddings = CountingEmbedding()
+    gated = GatedSimilarity(embeddings=embeddings)
+    waiting = asyncio.create_task(
+        aevaluate(
+            _dataset(),
+            metrics=[gated],
+            show_progress=False,
+            precompute_embeddings=True,
+        )
+    )
+    while not getattr(embeddings, "_precomputed", None):
+        await asyncio.sleep(0)
+
+    # a second run on the same embeddings finishes while the first one waits
+    await aevaluate(
+        EvaluationDataset(samples=_dataset().samples[:1]),
+        metrics=[SemanticSimilarity(embeddings=embeddings)],
+        show_progress=False,
+        precompute_embeddings=True,
+    )
+    gated.gate.set()
+    result = await waiting
+
+    # the first run still finds its texts precomputed
+    assert embeddings.batches == [["foo", "bar", "foo bar", "qux", "baz"]]
+    assert result["semantic_similarity"][0] == pytest.approx(1.0)
+    assert embeddings._precomputed == {}
@@ -111,3 +111,85 @@ def test_executor_timings():
     assert len(results) == n_tasks
     assert all(r == 1 for r in results)
     assert end_time - start_time < 0.2
+
+
+def test_as_completed_stream_is_lazy_and_bounded():
+    from ragas.executor import as_completed_stream
+
+    created = 0
+    finished = 0
+    max_in_flight = 0
+
+    async def echo(index: int):
+        nonlocal finished
+        await asyncio.sleep(0.01 * (index % 3))
+        finished += 1
+        return index
+
+    def coroutines():
+        nonlocal created, max_in_flight
+        for i in range(20):
+            created += 1
+            max_in_flight = max(max_in_flight, created - finished)
+            yield echo(i)
+
+    async def _run():
+        return [r async for r in as_completed_stream(coroutines(), 4)]
+
+    results = asyncio.run(_run())
+    assert sorted(results) == list(range(20))
+    # coroutines are only created once a worker slot is free
+    assert max_in_flight <= 4
+
+
+@pytest.mark.parametrize("batch_size", [None, 3])
+def test_executor_astream_completion_order(batch_size):
+    async def echo_order(index: int):
+        await asyncio.sleep(0.02 * (3 - index))
+        return index
+
+    executor = Executor(batch_size=batch_size)
+    for i in range(3):
+        executor.submit(echo_order, i, name=f"echo_order_{i}")
+
+    async def _run():
+        return [r async for r in executor.astream()]
+
+    streamed = asyncio.run(_run())
+    assert streamed == [(2, 2), (1, 1), (0, 0)]
+    assert executor.order_results(streamed) == [0, 1, 2]
+
+
+def test_executor_batches_use_sliding_window():
+    # job 0 keeps its slot until every other job has started; stop-the-world
+    # batches of 2 would only start job 2 once job 0 is done
+    started = []
+    finished = []
+    running = 0
+    max_running = 0
+
+    async def job(index: int):
+        nonlocal running, max_running
+        started.append(index)
+        running += 1
+        max_running = max(max_running, running)
+        # bounded, so that stop-the-world batches fail instead of hanging
+        for _ in range(100):
+            if index != 0 or len(started) == 6:
+                break
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        running -= 1
+        finished.append(index)
+        return index
+
+    executor = Executor(batch_size=2, show_progress=False)
+    for i in range(6):
+        executor.submit(job, i, name=f"job_{i}")
+
+    results = executor.results()
+    assert results == list(range(6))
+    assert started == list(range(6))
+    assert max_running == 2
+    # the other jobs went through the second slot while job 0 held the first
+    assert finished == [1, 2, 3, 4, 5, 0]
@@ -0,0 +1,331 @@
+import numpy as np
+import pytest
+
+from ragas.testset.graph import (
+    KnowledgeGraph,
+    Node,
+    NodeType,
+    Relationship,
+    RelationshipBatch,
+    RelationshipStore,
+)
+from ragas.testset.graph_queries import get_child_nodes, get_parent_nodes
+
+
+def _chain(n):
+    nodes = [Node(type=NodeType.CHUNK) for _ in range(n)]
+    relationships = [
+        Relationship(source=nodes[i], target=nodes[i + 1], type="child")
+        for i in range(n - 1)
+    ]
+    return nodes, relationships
+
+
+def test_knowledge_graph_index_tracks_add_and_remove():
+    nodes, relationships = _chain(3)
+    kg = KnowledgeGraph()
+    for node in nodes:
+        kg.add(node)
+    for relationship in relationships:
+        kg.add(relationship)
+
+    assert kg.get_node_by_id(nodes[1].id) is nodes[1]
+    assert kg.get_node_by_id(str(nodes[1].id)) is nodes[1]
+    assert kg.get_out_relationships(nodes[0]) == [relationships[0]]
+    assert kg.get_in_relationships(nodes[2], "child") == [relationships[1]]
+    assert kg.get_out_relationships(nodes[0], "other") == []
+
+    kg.remove_node(nodes[1])
+
+    assert not kg.has_node(nodes[1])
+    assert kg.nodes == [nodes[0], nodes[2]]
+    assert kg.relationships == []
+    assert kg.get_out_relationships(nodes[0]) == []
+
+
+def test_knowledge_graph_index_sees_direct_list_changes():
+    nodes, relationships = _chain(3)
+    kg = KnowledgeGraph(nodes=nodes[:2], relationships=relationships[:1])
+    assert not kg.has_node(nodes[2])
+
+    kg.nodes.extend(nodes[2:])
+    kg.relationships.extend(relationships[1:])
+
+    assert kg.has_node(nodes[2])
+    assert get_child_nodes(nodes[0], kg, level=2) == nodes[1:]
+    assert get_parent_nodes(nodes[2], kg, level=2) == [nodes[1], nodes[0]]
+
+
+def test_knowledge_graph_index_sees_same_length_changes():
+    nodes, relationships = _chain(3)
+    other = Node(type=NodeType.CHUNK)
+    kg = KnowledgeGraph(nodes=list(nodes), relationships=list(relationships))
+    assert kg.get_out_relationships(nodes[0]) == [relationships[0]]
+
+    kg.nodes[2] = other
+    assert kg.has_node(other) and not kg.has_node(nodes[2])
+
+    # a removal and an append leave the lengths unchanged
+    kg.nodes.remove(other)
+    kg.nodes.append(nodes[2])
+    assert kg.has_node(nodes[2]) and not kg.has_node(other)
+
+    replacement = Relationship(source=nodes[0], target=nodes[2], type="child")
+    kg.relationships[0] = replacement
+    assert kg.get_out_relationships(nodes[0]) == [replacement]
+    del kg.relationships[0]
+    kg.relationships.append(relationships[0])
+    assert kg.get_in_relationships(nodes[2]) == [relationships[1]]
+
+    kg.nodes = [nodes[0]]
+    kg.nodes.append(other)
+    assert kg.has_node(other) and not kg.has_node(nodes[1])
+
+
+def test_remove_node_copy_leaves_graph_untouched():
+    nodes, relationships = _chain(3)
+    kg = KnowledgeGraph(nodes=list(nodes), relationships=list(relationships))
+
+    new_kg = kg.remove_node(nodes[2], inplace=False)
+
+    assert new_kg is not None
+    assert len(new_kg.nodes) == 2 and len(new_kg.relationships) == 1
+    assert len(kg.nodes) == 3 and len(kg.relationships) == 2
+    assert kg.get_in_relationships(nodes[2]) == [relationships[1]]
+
+
+def test_find_indirect_clusters_follows_relationship_direction():
+    a, b, c, d = [Node(type=NodeType.CHUNK) for _ in range(4)]
+    kg = KnowledgeGraph(
+        nodes=[a, b, c, d],
+        relationships=[
+            Relationship(source=a, target=b, type="next"),
+            Relationship(source=b, target=c, type="next"),
+            Relationship(source=d, target=c, type="similar", bidirectional=True),
+        ],
+    )
+
+    clusters = kg.find_indirect_clusters(lambda rel: rel.type == "next")
+    assert {frozenset(cluster) for cluster in clusters} == {
+        frozenset({a, b}),
+        frozenset({b, c}),
+        frozenset({a, b, c}),
+    }
+
+    clusters = kg.find_indirect_clusters(depth_limit=2)
+    assert {frozenset(cluster) for cluster in clusters} == {
+        frozenset({a, b}),
+        frozenset({b, c}),
+        frozenset({c, d}),
+    }
+
+
+def _path_clusters(kg, depth_limit):
+    # every simple path of 2 to depth_limit nodes, following relationship direction
+    clusters = set()
+
+    def extend(path):
+        if len(path) > 1:
+            clusters.add(frozenset(path))
+        if len(path) == depth_limit:
+            return
+        for rel in kg.relationships:
+            if rel.source == path[-1] and rel.target not in path:
+                extend(path + [rel.target])
+            elif (
+                rel.bidirectional and rel.target == path[-1] and rel.source not in path
+            ):
+                extend(path + [rel.source])
+
+    for node in kg.nodes:
+        extend([node])
+    return clusters
+
+
+@pytest.mark.parametrize("depth_limit", [2, 3, 4])
+def test_find_indirect_clusters_finds_every_path_cluster(depth_limit):
+    rng = np.random.default_rng(3)
+    nodes = [Node(type=NodeType.CHUNK) for _ in range(12)]
+    kg = KnowledgeGraph(nodes=list(nodes))
+    for _ in range(20):
+        source, target = rng.choice(len(nodes), size=2, replace=False)
+        kg.add(
+            Relationship(
+                source=nodes[source],
+                target=nodes[target],
+                type="similar",
+                bidirectional=bool(rng.integers(2)),
+            )
+        )
+
+    clusters = kg.find_indirect_clusters(depth_limit=depth_limit)
+    assert len(clusters) == len({frozenset(cluster) for cluster in clusters})
+    assert {frozenset(cluster) for cluster in clusters} == _path_clusters(
+        kg, depth_limit
+    )
+
+
+def test_find_indirect_clusters_limits_the_clusters_of_each_node():
+    center, *leaves = [Node(type=NodeType.CHUNK) for _ in range(6)]
+    kg = KnowledgeGraph(
+        nodes=[center, *leaves],
+        relationships=[
+            Relationship(source=center, target=leaf, type="similar", bidirectional=True)
+            for leaf in leaves
+        ],
+    )
+
+    clusters = {frozenset(cluster) for cluster in kg.find_indirect_clusters()}
+    assert clusters == {frozenset({center, leaf}) for leaf in leaves} | {
+        frozenset({first, center, second})
+        for i, first in enumerate(leaves)
+        for second in leaves[i + 1 :]
+    }
+
+    # the leaves are paired with the first two other leaves through the center
+    clusters = kg.find_indirect_clusters(max_clusters_per_node=2)
+    assert {frozenset(cluster) for cluster in clusters} == {
+        frozenset({center, leaf}) for leaf in leaves
+    } | {
+        frozenset({first, center, second})
+        for first in leaves[:2]
+        for second in leaves
+        if second != first
+    }
+
+
+def test_find_indirect_clusters_is_memoized_until_the_graph_changes():
+    nodes = [Node(type=NodeType.DOCUMENT) for _ in range(200)]
+    kg = KnowledgeGraph(nodes=list(nodes))
+    # a dense graph, enumerating every path here would take forever
+    for i, source in enumerate(nodes):
+        for target in nodes[i + 1 :]:
+            kg.add(
+                Relationship(
+                    source=source,
+                    target=target,
+                    type="summary_similarity",
+                    bidirectional=True,
+                    properties={"summary_similarity": 0.9},
+                )
+            )
+
+    def find_clusters():
+        return kg.find_indirect_clusters(
+            lambda rel: bool(rel.get_property("summary_similarity"))
+        )
+
+    clusters = find_clusters()
+    assert 0 < len(clusters) <= 2 * 100 * len(nodes)
+    assert {len(cluster) for cluster in clusters} == {2, 3}
+    # every node is in one of the first clusters
+    assert set().union(*clusters[: len(nodes)]) == set(nodes)
+    assert kg._graph_index().clusters
+    assert find_clusters() == clusters
+
+    kg.add(Node(type=NodeType.DOCUMENT))
+    assert not kg._graph_index().clusters
+
+
+def test_relationship_batch_materializes_relationships_on_access():
+    nodes = [Node(type=NodeType.CHUNK) for _ in range(3)]
+    batch = RelationshipBatch(
+        nodes,
+        source=[0, 1],
+        target=[1, 2],
+        type="cosine_similarity",
+        properties={
+            "cosine_similarity": np.array([0.5, 0.75], dtype=np.float32),
+            "items": [["a"], ["b"]],
+        },
+        bidirectional=True,
+    )
+
+    assert len(batch) == 2
+    relationship = batch[1]
+    assert (relationship.source, relationship.target) == (nodes[1], nodes[2])
+    assert relationship.properties == {"cosine_similarity": 0.75, "items": ["b"]}
+    assert isinstance(relationship.properties["cosine_similarity"], float)
+    assert relationship.bidirectional
+    # the same relationship always gets the same id
+    assert batch[1].id == relationship.id == list(batch)[1].id
+    assert batch[0].id != relationship.id
+
+
+def test_relationship_store_keeps_batches_and_filters_them():
+    nodes, relationships = _chain(4)
+    batch = RelationshipBatch(nodes, [0, 0, 2], [2, 3, 3], type="similar")
+    kg = KnowledgeGraph(nodes=list(nodes), relationships=relationships)
+
+    kg.relationships.extend(batch)
+
+    assert isinstance(kg.relationships, RelationshipStore)
+    assert len(kg.relationships) == 6
+    assert kg.relationships.batches()[-1] is batch
+    assert kg.relationships[-1].id == batch[2].id
+    assert [rel.type for rel in kg.get_out_relationships(nodes[0])] == [
+        "child",
+        "similar",
+        "similar",
+    ]
+
+    kept = kg.relationships.where_nodes(lambda node: node != nodes[3])
+    assert [rel.id for rel in kept] == [
+        relationships[0].id,
+        relationships[1].id,
+        batch[0].id,
+    ]
+
+    kg.remove_node(nodes[2])
+    assert [rel.id for rel in kg.relationships] == [relationships[0].id, batch[1].id]
+    assert kg.get_in_relationships(nodes[3]) == [batch[1]]
+
+
+def test_content_hash_depends_on_the_given_properties_only():
+    node = Node(
+        type=NodeType.CHUNK,
+        properties={"page_content": "text", "embedding": [0.5, 0.25], "other": 1},
+    )
+    same = Node(
+        type=NodeType.CHUNK,
+        properties={"page_content": "text", "embedding": np.array([0.5, 0.25])},
+    )
+    keys = ["page_content", "embedding"]
+
+    assert node.content_hash(keys) == same.content_hash(keys)
+    same.properties["page_content"] = "changed"
+    assert node.content_hash(keys) != same.content_hash(keys)
+    assert node.content_hash(["page_content"]) != node.content_hash(["embedding"])
+
+
+def test_relationship_store_without_drops_relationships_of_a_type():
+    nodes, relationships = _chain(4)
+    store = RelationshipStore(relationships)
+    store.extend(RelationshipBatch(nodes, [0, 0, 2], [2, 3, 3], type="similar"))
+
+    kept = store.without("similar", lambda node: node == nodes[3])
+
+    assert [rel.type for rel in kept] == ["child"] * 3 + ["similar"]
+    assert (kept[-1].source, kept[-1].target) == (nodes[0], nodes[2])
+    assert len(store) == 6
+
+
+def test_relationship_batch_keeps_edits_of_its_relationships():
+    nodes = [Node(type=NodeType.CHUNK) for _ in range(4)]
+    kg = KnowledgeGraph(nodes=list(nodes))
+    kg.relationships.extend(
+        RelationshipBatch(
+            nodes, [0, 1, 2], [1, 2, 3], type="similar", properties={"s": [0.5] * 3}
+        )
+    )
+
+    assert kg.relationships[1] is kg.relationships[1]
+    kg.relationships[1].properties["s"] = 0.9
+    assert kg.relationships[1].properties["s"] == 0.9
+    assert [rel.properties["s"] for rel in kg.relationships] == [0.5, 0.9, 0.5]
+    assert kg.get_out_relationships(nodes[1])[0] is kg.relationships[1]
+
+    edited = kg.relationships[1]
+    kg.remove_node(nodes[0])
+    assert kg.relationships[0] is edited
+    assert kg.relationships[0].properties["s"] == 0.9
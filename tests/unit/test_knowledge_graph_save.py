@@ -1,4 +1,10 @@
-from ragas.testset.graph import KnowledgeGraph, Node, NodeType, Relationship
+from ragas.testset.graph import (
+    KnowledgeGraph,
+    Node,
+    NodeType,
+    Relationship,
+    RelationshipBatch,
+)
 
 
 def test_knowledge_graph_save_with_problematic_chars(tmp_path):
@@ -60,3 +66,111 @@ def test_knowledge_graph_save_with_problematic_chars(tmp_path):
 
     # Verify the special characters were preserved in the first node
     assert loaded_kg.nodes[0].properties["text"] == nodes[0].properties["text"]
+
+
+def test_knowledge_graph_binary_roundtrip(tmp_path):
+    import numpy as np
+
+    kg = KnowledgeGraph()
+    for i in range(5):
+        properties = {"page_content": f"Text {i} → ♥", "entities": [f"e{i}"]}
+        if i != 2:
+            properties["embedding"] = [float(i), 0.5, -1.0]
+        kg.add(Node(type=NodeType.CHUNK, properties=properties))
+    kg.nodes[3].properties["summary_embedding"] = np.arange(4, dtype=np.float64)
+    for i in range(4):
+        kg.add(
+            Relationship(
+                source=kg.nodes[i],
+                target=kg.nodes[i + 1],
+                type="next",
+                bidirectional=i % 2 == 0,
+                properties={"cosine_similarity": 0.25 * i},
+            )
+        )
+
+    kg.relationships.extend(
+        RelationshipBatch(
+            kg.nodes,
+            [0, 1],
+            [4, 3],
+            type="jaccard_similarity",
+            properties={"jaccard_similarity": [0.5, 1.0]},
+            bidirectional=True,
+        )
+    )
+
+    kg.save(tmp_path / "kg", format="binary")
+    loaded_kg = KnowledgeGraph.load(tmp_path / "kg")
+
+    assert [node.id for node in loaded_kg.nodes] == [node.id for node in kg.nodes]
+    for node, loaded in zip(kg.nodes, loaded_kg.nodes):
+        assert loaded.type == node.type
+        assert loaded.properties.keys() == node.properties.keys()
+        assert loaded.properties["page_content"] == node.properties["page_content"]
+        assert loaded.properties["entities"] == node.properties["entities"]
+    embedding = loaded_kg.nodes[1].get_property("embedding")
+    assert isinstance(embedding, np.memmap) and embedding.dtype == np.float32
+    np.testing.assert_allclose(embedding, [1.0, 0.5, -1.0])
+    assert loaded_kg.nodes[2].get_property("embedding") is None
+    np.testing.assert_allclose(
+        loaded_kg.nodes[3].get_property("summary_embedding"), np.arange(4)
+    )
+
+    assert [rel.id for rel in loaded_kg.relationships] == [
+        rel.id for rel in kg.relationships
+    ]
+    for rel, loaded in zip(kg.relationships, loaded_kg.relationships):
+        assert loaded.source is loaded_kg.nodes[kg.nodes.index(rel.source)]
+        assert loaded.target == rel.target
+        assert loaded.bidirectional == rel.bidirectional
+        assert loaded.properties == rel.properties
+
+    # a graph loaded from the binary format can still be saved as JSON
+    loaded_kg.save(tmp_path / "kg.json")
+    assert len(KnowledgeGraph.load(tmp_path / "kg.json").nodes) == 5
+
+
+def test_knowledge_graph_binary_keeps_integer_lists(tmp_path):
+    import numpy as np
+
+    kg = KnowledgeGraph()
+    for i in range(3):
+        kg.add(
+            Node(
+                type=NodeType.DOCUMENT,
+                properties={
+                    "page_numbers": [3, 16777217 + i],
+                    "scores": [0.5, i],
+                    "embedding": [0.5, i],
+                },
+            )
+        )
+
+    kg.save(tmp_path / "kg", format="binary")
+    loaded_kg = KnowledgeGraph.load(tmp_path / "kg")
+
+    for i, node in enumerate(loaded_kg.nodes):
+        assert node.get_property("page_numbers") == [3, 16777217 + i]
+    # lists mixing ints and floats are only embeddings if named like one
+    assert loaded_kg.nodes[1].get_property("scores") == [0.5, 1]
+    embedding = loaded_kg.nodes[1].get_property("embedding")
+    assert embedding.dtype == np.float32 and embedding.tolist() == [0.5, 1.0]
+
+
+def test_knowledge_graph_binary_format_requires_pyarrow(tmp_path, monkeypatch):
+    import sys
+
+    import pytest
+
+    kg = KnowledgeGraph(nodes=[Node(type=NodeType.DOCUMENT)])
+    kg.save(tmp_path / "kg", format="binary")
+    # a None entry makes `import pyarrow` fail
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        kg.save(tmp_path / "other", format="binary")
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        KnowledgeGraph.load(tmp_path / "kg")
+    # the JSON format does not need it
+    kg.save(tmp_path / "kg.json")
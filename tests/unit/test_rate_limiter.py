@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from ragas.rate_limiter import RateLimiter, estimate_tokens, is_rate_limit_error
+from ragas.run_config import RunConfig
+
+
+class RateLimitError(Exception):
+    pass
+
+
+def test_is_rate_limit_error():
+    class HTTPError(Exception):
+        status_code = 429
+
+    assert is_rate_limit_error(RateLimitError())
+    assert is_rate_limit_error(HTTPError())
+    assert not is_rate_limit_error(ValueError())
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("a" * 40) == 11
+    assert estimate_tokens("a" * 20, "b" * 20) == 11
+
+
+def test_aimd_concurrency():
+    limiter = RateLimiter(max_concurrency=8)
+    limiter.on_rate_limit()
+    assert limiter.concurrency == 4
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.concurrency == pytest.approx(5, abs=0.2)
+
+    for _ in range(10):
+        limiter.on_rate_limit()
+    assert limiter.concurrency == limiter.min_concurrency
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_concurrency():
+    limiter = RateLimiter(max_concurrency=3)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def call():
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    await asyncio.gather(*[limiter.wrap(call)() for _ in range(10)])
+    assert max_in_flight == 3
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_shrinks_on_rate_limit_error():
+    limiter = RateLimiter(max_concurrency=8)
+
+    async def call():
+        raise RateLimitError()
+
+    with pytest.raises(RateLimitError):
+        await limiter.wrap(call)()
+    assert limiter.concurrency == 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_requests_per_minute():
+    # 10 requests per second, so an empty bucket refills one request in 0.1s
+    limiter = RateLimiter(requests_per_minute=600)
+    limiter._request_bucket.available = 0
+
+    async def call():
+        return 1
+
+    start = time.monotonic()
+    assert await limiter.wrap(call)() == 1
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_llm_generate_uses_rate_limiter(fake_llm):
+    from langchain_core.prompt_values import StringPromptValue
+
+    limiter = RateLimiter(max_concurrency=4, tokens_per_minute=1000)
+    fake_llm.set_run_config(RunConfig(rate_limiter=limiter))
+    await fake_llm.generate(StringPromptValue(text="a" * 400))
+    # 101 estimated tokens were taken from the token bucket
+    assert limiter._token_bucket.available < 1000 - 100
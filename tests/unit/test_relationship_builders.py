@@ -0,0 +1,181 @@
+import numpy as np
+import pytest
+
+from ragas.testset.graph import KnowledgeGraph, Node, NodeType
+from ragas.testset.transforms.relationship_builders import (
+    CosineSimilarityBuilder,
+    JaccardSimilarityBuilder,
+    OverlapScoreBuilder,
+)
+
+
+def _brute_force_pairs(embeddings, threshold):
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    similarity = normalized @ normalized.T
+    return {
+        (i, j): similarity[i, j]
+        for i in range(len(embeddings))
+        for j in range(i + 1, len(embeddings))
+        if similarity[i, j] >= threshold
+    }
+
+
+def test_blocked_cosine_pairs_match_brute_force():
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(50, 8))
+    expected = _brute_force_pairs(embeddings, 0.3)
+
+    builder = CosineSimilarityBuilder(threshold=0.3, block_size=7)
+    pairs = builder._find_similar_embedding_pairs(embeddings, builder.threshold)
+
+    assert {(i, j) for i, j, _ in pairs} == set(expected)
+    for i, j, score in pairs:
+        assert score == pytest.approx(expected[(i, j)], abs=1e-5)
+
+
+def test_cosine_top_k_keeps_the_most_similar_neighbours():
+    rng = np.random.default_rng(1)
+    embeddings = rng.normal(size=(30, 4))
+    expected = _brute_force_pairs(embeddings, -1.0)
+
+    builder = CosineSimilarityBuilder(threshold=-1.0, block_size=8, top_k=2)
+    pairs = builder._find_similar_embedding_pairs(embeddings, builder.threshold)
+
+    neighbours = {i: [] for i in range(len(embeddings))}
+    for (i, j), score in expected.items():
+        neighbours[i].append((score, j))
+        neighbours[j].append((score, i))
+    top = set()
+    for i, scored in neighbours.items():
+        for _, j in sorted(scored, reverse=True)[:2]:
+            top.add((min(i, j), max(i, j)))
+    assert {(i, j) for i, j, _ in pairs} == top
+
+
+@pytest.mark.asyncio
+async def test_cosine_builder_transform():
+    nodes = [
+        Node(type=NodeType.CHUNK, properties={"embedding": embedding})
+        for embedding in [[1.0, 0.0], [0.99, 0.1], [0.0, 1.0]]
+    ]
+    kg = KnowledgeGraph(nodes=nodes)
+
+    relationships = await CosineSimilarityBuilder(threshold=0.9).transform(kg)
+
+    assert len(relationships) == 1
+    assert {relationships[0].source.id, relationships[0].target.id} == {
+        nodes[0].id,
+        nodes[1].id,
+    }
+
+
+def test_hnsw_cosine_pairs_match_exact_pairs():
+    pytest.importorskip("hnswlib")
+    rng = np.random.default_rng(2)
+    embeddings = rng.normal(size=(60, 8))
+    expected = _brute_force_pairs(embeddings, 0.3)
+
+    builder = CosineSimilarityBuilder(
+        threshold=0.3, index="hnsw", ann_num_candidates=59, block_size=16
+    )
+    pairs = builder._find_similar_embedding_pairs(embeddings, builder.threshold)
+
+    assert {(i, j) for i, j, _ in pairs} == set(expected)
+    for i, j, score in pairs:
+        assert score == pytest.approx(expected[(i, j)], abs=1e-5)
+
+
+def _entity_graph(entity_lists):
+    return KnowledgeGraph(
+        nodes=[
+            Node(type=NodeType.CHUNK, properties={"entities": entities})
+            for entities in entity_lists
+        ]
+    )
+
+
+def _brute_force_jaccard(entity_lists, threshold):
+    pairs = {}
+    for i, items1 in enumerate(entity_lists):
+        for j in range(i + 1, len(entity_lists)):
+            items2 = set(entity_lists[j])
+            union = len(set(items1) | items2)
+            similarity = len(set(items1) & items2) / union if union else 0.0
+            if similarity >= threshold:
+                pairs[(i, j)] = similarity
+    return pairs
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_lsh", [False, True])
+async def test_jaccard_builder_matches_brute_force(use_lsh):
+    rng = np.random.default_rng(3)
+    vocabulary = [f"entity-{i}" for i in range(40)]
+    entity_lists = [
+        list(rng.choice(vocabulary, size=rng.integers(0, 6))) for _ in range(60)
+    ]
+    # a few near duplicates so that LSH has something to find
+    entity_lists += [entities + ["extra"] for entities in entity_lists[:5]]
+    kg = _entity_graph(entity_lists)
+
+    builder = JaccardSimilarityBuilder(threshold=0.5, use_lsh=use_lsh)
+    relationships = await builder.transform(kg)
+
+    index = {node.id: i for i, node in enumerate(kg.nodes)}
+    found = {
+        (index[r.source.id], index[r.target.id]): r.properties["jaccard_similarity"]
+        for r in relationships
+    }
+    expected = _brute_force_jaccard(entity_lists, 0.5)
+    if use_lsh:
+        # LSH may miss pairs but never reports a wrong one
+        assert set(found) <= set(expected)
+        assert all(
+            (i, i + 60) in found for i in range(5) if len(set(entity_lists[i])) >= 3
+        )
+    else:
+        assert set(found) == set(expected)
+    for pair, similarity in found.items():
+        assert similarity == pytest.approx(expected[pair])
+
+
+@pytest.mark.asyncio
+async def test_overlap_score_builder():
+    pytest.importorskip("rapidfuzz")
+    kg = _entity_graph(
+        [
+            ["Paris", "Eiffel Tower", "Paris", "noise"],
+            ["paris", "Louvre", "noise"],
+            ["Berlin", "noise"],
+            ["noise"],
+        ]
+    )
+
+    relationships = await OverlapScoreBuilder(threshold=0.01).transform(kg)
+
+    assert len(relationships) == 1
+    relationship = relationships[0]
+    assert (relationship.source, relationship.target) == (kg.nodes[0], kg.nodes[1])
+    # "noise" is the most common item and ignored, "Paris" counts twice
+    assert relationship.properties["entities_overlap_score"] == pytest.approx(2 / 6)
+    assert relationship.properties["overlapped_items"] == [
+        ("Paris", "paris"),
+        ("Paris", "paris"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_overlap_score_builder_finds_fuzzy_matches_of_different_words():
+    pytest.importorskip("rapidfuzz")
+    kg = _entity_graph(
+        [["colour", "noise"], ["color", "noise"], ["models", "noise"], ["noise"]]
+    )
+
+    relationships = await OverlapScoreBuilder().transform(kg)
+    assert [(rel.source, rel.target) for rel in relationships] == [
+        (kg.nodes[0], kg.nodes[1])
+    ]
+
+    # pruning only compares nodes sharing a word
+    relationships = await OverlapScoreBuilder(prune_candidates=True).transform(kg)
+    assert len(relationships) == 0
@@ -0,0 +1,266 @@
+import copy
+import typing as t
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+from pydantic import BaseModel
+
+from ragas.prompt import StringIO
+from ragas.testset.graph import KnowledgeGraph, Node, NodeType
+from ragas.testset.transforms.base import Extractor, NodeFilter
+from ragas.testset.transforms.extractors import SummaryExtractor
+from ragas.testset.transforms.relationship_builders import (
+    CosineSimilarityBuilder,
+    JaccardSimilarityBuilder,
+)
+from ragas.testset.transforms.splitters import HeadlineSplitter
+
+
+@dataclass
+class WordCountExtractor(Extractor):
+    property_name: str = "word_count"
+
+    def __post_init__(self):
+        super().__post_init__()
+        # private attributes are not part of the transformation fingerprint
+        self._calls: t.List[str] = []
+
+    async def extract(self, node: Node) -> t.Tuple[str, t.Any]:
+        text = node.get_property("page_content")
+        self._calls.append(text)
+        return self.property_name, len(text.split())
+
+
+@dataclass
+class DropFilter(NodeFilter):
+    def __post_init__(self):
+        super().__post_init__()
+        self._calls: t.List[str] = []
+
+    async def custom_filter(self, node: Node, kg: KnowledgeGraph) -> bool:
+        text = node.get_property("page_content")
+        self._calls.append(text)
+        return text == "drop"
+
+
+async def _apply(transform, kg):
+    for coroutine in transform.generate_execution_plan(kg):
+        await coroutine
+
+
+def _pairs(kg, rel_type):
+    return {
+        frozenset((rel.source.id, rel.target.id)): rel.properties
+        for rel in kg.relationships
+        if rel.type == rel_type
+    }
+
+
+@pytest.mark.asyncio
+async def test_extractor_only_processes_new_and_changed_nodes():
+    kg = KnowledgeGraph(
+        nodes=[
+            Node(type=NodeType.CHUNK, properties={"page_content": text})
+            for text in ["one two", "three"]
+        ]
+    )
+    extractor = WordCountExtractor()
+    await _apply(extractor, kg)
+    assert extractor._calls == ["one two", "three"]
+
+    await _apply(extractor, kg)
+    assert extractor._calls == ["one two", "three"]
+
+    kg.nodes[1].properties["page_content"] = "three four five"
+    kg.add(Node(type=NodeType.CHUNK, properties={"page_content": "six"}))
+    await _apply(extractor, kg)
+
+    assert extractor._calls == ["one two", "three", "three four five", "six"]
+    assert [node.get_property("word_count") for node in kg.nodes] == [2, 3, 1]
+
+    # a different configuration is a different transformation
+    other = WordCountExtractor(property_name="words")
+    await _apply(other, kg)
+    assert len(other._calls) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "builder",
+    [
+        CosineSimilarityBuilder(threshold=0.2, block_size=7),
+        CosineSimilarityBuilder(threshold=0.2, top_k=3),
+        JaccardSimilarityBuilder(property_name="entities", threshold=0.3),
+    ],
+    ids=["cosine", "cosine-top-k", "jaccard"],
+)
+async def test_incremental_relationships_match_a_full_rebuild(builder):
+    rng = np.random.default_rng(5)
+    vocabulary = [f"entity-{i}" for i in range(12)]
+
+    def new_node():
+        return Node(
+            type=NodeType.CHUNK,
+            properties={
+                "embedding": rng.normal(size=8).tolist(),
+                "entities": list(rng.choice(vocabulary, size=3)),
+            },
+        )
+
+    kg = KnowledgeGraph(nodes=[new_node() for _ in range(30)])
+    await _apply(builder, kg)
+    rel_type = builder.relationship_type()
+    before = _pairs(kg, rel_type)
+    assert before
+
+    # applying again without changes builds nothing
+    await _apply(builder, kg)
+    assert len(kg.relationships) == len(before)
+
+    changed = new_node()
+    kg.nodes[3].properties.update(changed.properties)
+    for _ in range(5):
+        kg.add(new_node())
+    await _apply(builder, kg)
+
+    full = KnowledgeGraph(nodes=kg.nodes)
+    full.relationships.extend(await builder.transform(full))
+    expected = _pairs(full, rel_type)
+    assert set(_pairs(kg, rel_type)) == set(expected)
+    assert len(kg.relationships) == len(expected)
+    for pair, properties in _pairs(kg, rel_type).items():
+        assert properties == pytest.approx(expected[pair])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("format", ["json", "binary"])
+async def test_fingerprints_survive_saving_the_graph(tmp_path, format):
+    kg = KnowledgeGraph(
+        nodes=[
+            Node(type=NodeType.CHUNK, properties={"page_content": text})
+            for text in ["one two", "three"]
+        ]
+    )
+    await _apply(WordCountExtractor(), kg)
+
+    path = tmp_path / ("kg.json" if format == "json" else "kg")
+    kg.save(path, format=format)
+    loaded = KnowledgeGraph.load(path)
+
+    assert [node.transform_fingerprints for node in loaded.nodes] == [
+        node.transform_fingerprints for node in kg.nodes
+    ]
+    extractor = WordCountExtractor()
+    await _apply(extractor, loaded)
+    assert extractor._calls == []
+
+
+@pytest.mark.asyncio
+async def test_splitter_replaces_the_chunks_of_changed_documents():
+    document = Node(
+        type=NodeType.DOCUMENT,
+        properties={
+            "page_content": "A intro text\nB more text here",
+            "headlines": ["A", "B"],
+        },
+    )
+    kg = KnowledgeGraph(nodes=[document])
+    splitter = HeadlineSplitter(min_tokens=1)
+
+    await _apply(splitter, kg)
+    chunks = [node for node in kg.nodes if node.type == NodeType.CHUNK]
+    assert [chunk.get_property("page_content") for chunk in chunks] == [
+        "A intro text",
+        "B more text here",
+    ]
+
+    # the chunks are not split again and unchanged documents are skipped
+    await _apply(splitter, kg)
+    assert kg.nodes == [document] + chunks
+
+    document.properties["page_content"] = "A changed\nB changed too"
+    await _apply(splitter, kg)
+    new_chunks = kg.nodes[1:]
+    assert [chunk.get_property("page_content") for chunk in new_chunks] == [
+        "A changed",
+        "B changed too",
+    ]
+    assert not any(kg.has_node(chunk) for chunk in chunks)
+    assert len(kg.relationships) == 3
+    assert all(
+        rel.source in kg.nodes and rel.target in kg.nodes for rel in kg.relationships
+    )
+
+
+@pytest.mark.asyncio
+async def test_node_filter_only_checks_new_and_changed_nodes():
+    kg = KnowledgeGraph(
+        nodes=[
+            Node(type=NodeType.CHUNK, properties={"page_content": text})
+            for text in ["keep", "drop", "also keep"]
+        ]
+    )
+    node_filter = DropFilter()
+
+    await _apply(node_filter, kg)
+    assert node_filter._calls == ["keep", "drop", "also keep"]
+    assert [node.get_property("page_content") for node in kg.nodes] == [
+        "keep",
+        "also keep",
+    ]
+
+    kg.nodes[1].properties["page_content"] = "drop"
+    kg.add(Node(type=NodeType.CHUNK, properties={"page_content": "new"}))
+    await _apply(node_filter, kg)
+
+    assert node_filter._calls[3:] == ["drop", "new"]
+    assert [node.get_property("page_content") for node in kg.nodes] == [
+        "keep",
+        "new",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_builder_replaces_relationships_built_without_fingerprints():
+    rng = np.random.default_rng(7)
+    kg = KnowledgeGraph(
+        nodes=[
+            Node(
+                type=NodeType.CHUNK,
+                properties={"embedding": rng.normal(size=4).tolist()},
+            )
+            for _ in range(20)
+        ]
+    )
+    builder = CosineSimilarityBuilder(threshold=0.3)
+    # a graph built before fingerprints were recorded
+    kg.relationships.extend(await builder.transform(kg))
+    count = len(kg.relationships)
+    assert count
+
+    await _apply(builder, kg)
+    assert len(kg.relationships) == count
+    await _apply(builder, kg)
+    assert len(kg.relationships) == count
+
+
+class Summary(BaseModel):
+    summary: str
+
+
+def test_transform_fingerprint_follows_the_prompt_content(fake_llm):
+    def fingerprint(**changes):
+        extractor = SummaryExtractor(llm=fake_llm)
+        # the default prompt is shared by every extractor, change a copy of it
+        extractor.prompt = copy.copy(extractor.prompt)
+        for name, value in changes.items():
+            setattr(extractor.prompt, name, value)
+        return extractor.transform_fingerprint()
+
+    base = fingerprint()
+    assert fingerprint() == base
+    assert fingerprint(instruction="Summarize the text in French.") != base
+    example = (StringIO(text="A long text."), StringIO(text="A summary."))
+    assert fingerprint(examples=[example]) != base
+    assert fingerprint(output_model=Summary) != base